@@ -1,18 +1,31 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Optional
-from ..services.mod_generator import ModGenerator
+from typing import List, Optional
+from ..services.mod_generator import ModGenerator, SCHEDULES, SCHEDULE_LONGEST_FIRST
 from ..services.mod_scanner import ModScanner
 from ..services import task_manager
+from ..services.translation_cache import get_translation_cache
+from ..services import translation_journal, task_trace
+from ..services.job_scheduler import get_job_scheduler
+from ..services.translation_estimator import estimate_translation
 from ..database import get_db
 from .. import models
+import asyncio
+import json
 import os
+import time
 
 router = APIRouter()
+
+# Snapshots per second pushed by /events (override with PROGRESS_STREAM_HZ)
+PROGRESS_STREAM_HZ = float(os.environ.get("PROGRESS_STREAM_HZ", 4))
+# Comment line sent when nothing changed, keeps proxies from closing the stream
+STREAM_KEEPALIVE_SECONDS = 15
 generator = ModGenerator()
 scanner = ModScanner()
+scheduler = get_job_scheduler()
 
 
 class ServiceSettings(BaseModel):
@@ -24,6 +37,16 @@ class ServiceSettings(BaseModel):
     gemini_model: Optional[str] = "gemini-1.5-flash"
     ollama_url: Optional[str] = "http://localhost:11434"
     ollama_model: Optional[str] = "gemma2"
+    # API base URL overrides (e.g. the mock provider server), None: the real API
+    openai_url: Optional[str] = None
+    claude_url: Optional[str] = None
+    gemini_url: Optional[str] = None
+    # Per provider budgets, e.g. {"gemini": {"rpm": 15, "tpm": 1000000}}
+    rate_limits: Optional[dict] = None
+    # Per provider batch token budgets, e.g. {"openai": {"input_tokens": 4000, "output_tokens": 4000}}
+    batch_budgets: Optional[dict] = None
+    # Record/replay of the provider traffic, e.g. {"mode": "record", "path": "run.jsonl.gz"}
+    cassette: Optional[dict] = None
 
 
 class TranslateRequest(BaseModel):
@@ -33,10 +56,46 @@ class TranslateRequest(BaseModel):
     output_path: str
     service: str = "google"
     target_lang: str = "ko"
+    # Several languages in one run: the mod is parsed once, one mod folder per language
+    target_langs: Optional[List[str]] = None
     vanilla_path: Optional[str] = None
     settings: Optional[ServiceSettings] = None
     glossary: Optional[dict] = None  # Added Glossary
     shutdown_when_complete: Optional[bool] = None  # Shutdown feature
+    use_cache: bool = True  # Reuse translations from the persistent cache
+    previous_output_path: Optional[str] = None  # Update mode: previously generated mod
+    priority: int = 0  # Higher runs first when jobs are queued
+    # Work order inside the job: longest_first (short tail), shortest_first (fast preview
+    # of short UI strings) or fifo
+    schedule: str = SCHEDULE_LONGEST_FIRST
+
+
+class CollectionRequest(BaseModel):
+    workshop_path: str
+    # Mods to translate, by workshop ID. Without IDs every mod matching name_filter
+    mod_ids: Optional[List[str]] = None
+    name_filter: Optional[str] = None  # Case-insensitive part of the mod name or a tag
+    output_path: str
+    service: str = "google"
+    target_lang: str = "ko"
+    vanilla_path: Optional[str] = None
+    settings: Optional[ServiceSettings] = None
+    glossary: Optional[dict] = None
+    shutdown_when_complete: Optional[bool] = None
+    use_cache: bool = True
+    priority: int = 0
+    schedule: str = SCHEDULE_LONGEST_FIRST
+    parallel_mods: int = 1  # Mods translated at the same time within the job
+
+
+def resolve_shutdown(requested: Optional[bool], db: Session) -> bool:
+    """Shutdown preference of the request, falling back to the DB setting."""
+    if requested is not None:
+        return requested
+    db_settings = db.query(models.Settings).first()
+    if db_settings:
+        return db_settings.auto_shutdown or False
+    return False
 
 
 @router.get("/ollama/models")
@@ -73,21 +132,18 @@ async def get_gemini_models(
 @router.post("/run")
 async def run_translation(
     request: TranslateRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
-    Starts the translation process in the background.
+    Queues the translation job. It starts as soon as a worker slot is free.
     """
-    # Resolve shutdown preference
-    should_shutdown = False
-    if request.shutdown_when_complete is not None:
-        should_shutdown = request.shutdown_when_complete
-    else:
-        # Fallback to DB setting
-        db_settings = db.query(models.Settings).first()
-        if db_settings:
-            should_shutdown = db_settings.auto_shutdown or False
+    if request.schedule not in SCHEDULES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown schedule, expected one of {', '.join(SCHEDULES)}",
+        )
+
+    should_shutdown = resolve_shutdown(request.shutdown_when_complete, db)
 
     mod_info = {
         "path": request.mod_path,
@@ -101,30 +157,220 @@ async def run_translation(
     if request.settings:
         service_config = request.settings.model_dump()
 
+    options = {
+        "service": request.service,
+        "service_config": service_config,
+        "vanilla_path": request.vanilla_path,
+        "glossary": request.glossary,
+        "use_cache": request.use_cache,
+        "previous_output_path": request.previous_output_path,
+        "schedule": request.schedule,
+    }
+
     # Create Task
     task_id = task_manager.create_task()
 
-    # Add to background tasks
-    background_tasks.add_task(
-        generator.generate_translation_mod,
-        source_mod=mod_info,
-        output_root=request.output_path,
-        task_id=task_id,
-        target_lang=request.target_lang,
-        service=request.service,
-        service_config=service_config,
-        vanilla_path=request.vanilla_path,
-        glossary=request.glossary,
-        shutdown_when_complete=should_shutdown,
-    )
+    target_langs = list(dict.fromkeys(request.target_langs or []))
+    if len(target_langs) > 1:
+        factory = lambda: generator.generate_translation_mods(
+            source_mod=mod_info,
+            output_root=request.output_path,
+            task_id=task_id,
+            target_langs=target_langs,
+            shutdown_when_complete=should_shutdown,
+            **options,
+        )
+    else:
+        factory = lambda: generator.generate_translation_mod(
+            source_mod=mod_info,
+            output_root=request.output_path,
+            task_id=task_id,
+            target_lang=target_langs[0] if target_langs else request.target_lang,
+            shutdown_when_complete=should_shutdown,
+            **options,
+        )
+
+    position = scheduler.submit(task_id, factory, priority=request.priority)
 
     return {
-        "status": "started",
+        "status": "queued" if position else "started",
         "message": "Translation started in background",
         "task_id": task_id,
+        "queue_position": position,
+    }
+
+
+@router.post("/collection")
+async def run_collection(
+    request: CollectionRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Queues one job translating several workshop mods, selected by ID or by a
+    name/tag filter. The mods share the dedup table, cache and vanilla memory.
+    """
+    if request.schedule not in SCHEDULES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown schedule, expected one of {', '.join(SCHEDULES)}",
+        )
+
+    scan = await asyncio.to_thread(scanner.scan_workshop, request.workshop_path)
+    if scan.get("error"):
+        raise HTTPException(status_code=404, detail=scan["error"])
+
+    mods = scan["mods"]
+    if request.mod_ids:
+        wanted = set(request.mod_ids)
+        mods = [mod for mod in mods if mod["id"] in wanted]
+    if request.name_filter:
+        needle = request.name_filter.lower()
+        mods = [
+            mod
+            for mod in mods
+            if needle in mod.get("name", "").lower()
+            or any(needle in tag.lower() for tag in mod.get("tags") or [])
+        ]
+    if not mods:
+        raise HTTPException(status_code=404, detail="No mods matched the selection")
+
+    service_config = request.settings.model_dump() if request.settings else {}
+    should_shutdown = resolve_shutdown(request.shutdown_when_complete, db)
+    task_id = task_manager.create_task()
+    position = scheduler.submit(
+        task_id,
+        lambda: generator.generate_collection(
+            mods,
+            request.output_path,
+            task_id,
+            parallel_mods=max(1, request.parallel_mods),
+            shutdown_when_complete=should_shutdown,
+            target_lang=request.target_lang,
+            service=request.service,
+            service_config=service_config,
+            vanilla_path=request.vanilla_path,
+            glossary=request.glossary,
+            use_cache=request.use_cache,
+            schedule=request.schedule,
+        ),
+        priority=request.priority,
+    )
+
+    return {
+        "status": "queued" if position else "started",
+        "message": f"Translation of {len(mods)} mods started in background",
+        "task_id": task_id,
+        "queue_position": position,
+        "mods": [{"id": mod["id"], "name": mod.get("name")} for mod in mods],
+    }
+
+
+@router.post("/estimate")
+async def estimate_translation_job(request: TranslateRequest):
+    """
+    Dry run: parses the mod and estimates entries, memory/cache hits, tokens
+    and wall time per provider. Nothing is written and no API is called.
+    """
+    if not os.path.isdir(request.mod_path):
+        raise HTTPException(status_code=404, detail="Mod folder not found")
+
+    service_config = request.settings.model_dump() if request.settings else {}
+    try:
+        return await estimate_translation(
+            request.mod_path,
+            target_lang=request.target_lang,
+            service=request.service,
+            service_config=service_config,
+            vanilla_path=request.vanilla_path,
+            glossary=request.glossary,
+            use_cache=request.use_cache,
+            previous_output_path=request.previous_output_path,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/resume/{task_id}")
+async def resume_translation(task_id: str, priority: int = 0):
+    """
+    Resumes a paused task, or restarts an interrupted/cancelled one from its
+    on-disk journal. Entries that were already translated are not sent to the
+    provider again.
+    """
+    if scheduler.resume(task_id):
+        return {
+            "status": "running",
+            "message": "Translation resumed",
+            "task_id": task_id,
+        }
+
+    task = task_manager.get_task(task_id)
+    if task and task.get("status") in ("queued", "pending", "running", "paused"):
+        raise HTTPException(status_code=409, detail="Task is still running")
+
+    if not translation_journal.load_journal(task_id):
+        raise HTTPException(status_code=404, detail="No journal found for this task")
+
+    task_manager.create_task(task_id)
+    position = scheduler.submit(
+        task_id, lambda: generator.resume_translation_mod(task_id), priority=priority
+    )
+
+    return {
+        "status": "queued" if position else "started",
+        "message": "Translation resumed in background",
+        "task_id": task_id,
+        "queue_position": position,
     }
 
 
+@router.post("/pause/{task_id}")
+async def pause_translation(task_id: str):
+    """
+    Stops dispatching new batches for a task. Batches already sent still finish.
+    Use /resume/{task_id} to continue.
+    """
+    if not scheduler.pause(task_id):
+        raise HTTPException(status_code=404, detail="Task is not queued or running")
+    return {"status": "paused", "task_id": task_id}
+
+
+@router.post("/cancel/{task_id}")
+async def cancel_translation(task_id: str):
+    """
+    Cancels a queued or running task. A started task keeps its journal,
+    so it can be resumed later.
+    """
+    if not scheduler.cancel(task_id):
+        raise HTTPException(status_code=404, detail="Task is not queued or running")
+    return {"status": "cancelled", "task_id": task_id}
+
+
+@router.get("/jobs")
+def get_jobs():
+    """
+    Returns the scheduler state: worker slots, running and queued jobs.
+    """
+    return scheduler.state()
+
+
+@router.put("/jobs/workers")
+def set_job_workers(count: int):
+    """
+    Changes the number of jobs that may run at the same time.
+    """
+    scheduler.set_max_workers(count)
+    return scheduler.state()
+
+
+@router.get("/journals")
+def list_resumable_tasks():
+    """
+    Lists interrupted tasks that can be resumed.
+    """
+    return {"tasks": translation_journal.list_journals()}
+
+
 @router.get("/download/{mod_id}")
 def download_mod(mod_id: str, zip_path: str):
     """
@@ -158,7 +404,7 @@ def get_translation_status(task_id: str = None):
     if not task_id:
         return {"status": "idle", "percent": 0, "processed_files": 0, "total_files": 0}
 
-    task = task_manager.get_task(task_id)
+    task = get_task_snapshot(task_id)
     if not task:
         # Instead of 404 (which spams logs), return a special status
         # This tells frontend "this task is gone", stop polling.
@@ -169,3 +415,120 @@ def get_translation_status(task_id: str = None):
         }
 
     return task
+
+
+def get_task_snapshot(task_id: str) -> dict:
+    """Task status plus its position in the job queue (None once started)."""
+    task = task_manager.get_task(task_id)
+    if task is not None and task.get("status") == "queued":
+        task["queue_position"] = scheduler.queue_position(task_id)
+    return task
+
+
+@router.get("/trace/{task_id}")
+def get_translation_trace(task_id: str, format: str = "json"):
+    """
+    Timing spans of a task (discovery, vanilla load, parse, provider calls,
+    validation, write) as JSON, or format=chrome for chrome://tracing / Perfetto.
+    Multi-language and collection jobs include the traces of their sub tasks.
+    """
+    task = task_manager.get_task(task_id) or {}
+    sub_task_ids = [
+        sub_task["task_id"]
+        for field in ("languages", "mods")
+        for sub_task in (task.get(field) or {}).values()
+    ]
+    traces = [
+        trace
+        for trace in map(task_trace.get_trace, [task_id] + sub_task_ids)
+        if trace is not None
+    ]
+    if not traces:
+        raise HTTPException(status_code=404, detail="No trace for this task")
+
+    if format == "chrome":
+        origin = min(trace.started_at for trace in traces)
+        events = []
+        for pid, trace in enumerate(traces, start=1):
+            events.extend(trace.to_chrome_events(pid, trace.started_at - origin))
+        content = {"traceEvents": events, "displayTimeUnit": "ms"}
+    elif format == "json":
+        content = traces[0].to_json()
+        if len(traces) > 1 or traces[0].task_id != task_id:
+            content = {"task_id": task_id, "sub_tasks": [t.to_json() for t in traces]}
+    else:
+        raise HTTPException(status_code=400, detail="format must be json or chrome")
+
+    return JSONResponse(
+        content,
+        headers={"Content-Disposition": f'attachment; filename="trace_{task_id}.json"'},
+    )
+
+
+@router.get("/events/{task_id}")
+async def stream_translation_status(task_id: str, hz: float = None):
+    """
+    Server-Sent Events stream of the task status.
+    Pushes a coalesced snapshot at most `hz` times per second, only when it changed,
+    and closes after the task completed or failed.
+    """
+    interval = 1.0 / min(max(hz or PROGRESS_STREAM_HZ, 0.2), 20)
+
+    async def event_stream():
+        last_payload = None
+        last_sent = time.monotonic()
+        while True:
+            task = get_task_snapshot(task_id)
+            if task is None:
+                payload = json.dumps(
+                    {
+                        "status": "not_found",
+                        "percent": 0,
+                        "error": "Task not found or expired",
+                    }
+                )
+                yield f"data: {payload}\n\n"
+                return
+
+            payload = json.dumps(task, ensure_ascii=False, default=str)
+            now = time.monotonic()
+            if payload != last_payload:
+                yield f"data: {payload}\n\n"
+                last_payload = payload
+                last_sent = now
+            elif now - last_sent >= STREAM_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = now
+
+            if task.get("status") in task_manager.TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/cache")
+def get_cache_stats():
+    """
+    Returns the number of cached translations per service/model.
+    """
+    try:
+        return get_translation_cache().stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/cache")
+def purge_cache(service: Optional[str] = None, model: Optional[str] = None):
+    """
+    Deletes cached translations. Filter by service and/or model; no filter clears everything.
+    """
+    try:
+        deleted = get_translation_cache().purge(service=service, model=model)
+        return {"status": "success", "deleted": deleted}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -37,6 +37,24 @@ def startup_event():
     migrate_db()
 
 
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus metrics of the translation engine."""
+    from fastapi.responses import PlainTextResponse
+    from backend.app.services import metrics
+
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    from backend.app.services.cpu_pool import shutdown_cpu_pool
+
+    shutdown_cpu_pool()
+
+
 # CORS setup for frontend dev
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,161 @@
+from .rate_limiter import estimate_tokens
+
+# Upper bound of entries per request, the token budgets below usually close a batch first
+BATCH_SIZES = {
+    # Local models: several entries per request
+    "ollama": 20,
+    "google": 20,
+    # Gemini has a strict Rate Limit (10-15 RPM for free tier)
+    # Strategy: Send FEWER requests with MORE content
+    "gemini": 100,
+}
+DEFAULT_BATCH_SIZE = 50
+
+# (input, output) token budget of the texts in one batch request, system prompt excluded.
+# Output budgets stay well below the max_tokens/num_predict used for batches (8192,
+# 4096 for the Claude 3 models), so a dense batch is not cut off mid-array. None: no budget (google, per-item requests).
+BATCH_TOKEN_BUDGETS = {
+    "openai": (4000, 4000),
+    "claude": (4000, 5000),
+    "gemini": (8000, 5000),
+    # Ollama's default context is small (num_ctx 2048 on many models)
+    "ollama": (800, 1000),
+    "google": (None, None),
+}
+DEFAULT_TOKEN_BUDGET = (4000, 4000)
+
+# Per-model overrides, matched by prefix: { model_prefix: (input, output) }
+MODEL_TOKEN_BUDGETS = {
+    "gpt-3.5": (2000, 2000),
+    "claude-3-haiku": (4000, 3000),
+    "claude-3-opus": (4000, 3000),
+    "claude-3-sonnet": (4000, 3000),
+}
+
+# Output tokens per input text token, by target language
+OUTPUT_TOKEN_RATIO = {"ko": 1.4, "ja": 1.4, "zh": 1.1}
+DEFAULT_OUTPUT_TOKEN_RATIO = 1.2
+
+# JSON wrapping of one batch item ({"id": 0, "text": "..."}), in the prompt and the answer
+BATCH_ITEM_OVERHEAD_TOKENS = 8
+
+
+def get_token_budget(service: str, model: str = "", overrides: dict = None) -> tuple:
+    """
+    Returns the (input, output) budget for a service/model.
+    overrides: { service: {"input_tokens": n, "output_tokens": n} } from the request settings.
+    """
+    budget = BATCH_TOKEN_BUDGETS.get(service, DEFAULT_TOKEN_BUDGET)
+    for prefix, model_budget in MODEL_TOKEN_BUDGETS.items():
+        if model and model.startswith(prefix):
+            budget = model_budget
+            break
+
+    custom = (overrides or {}).get(service) or {}
+    return (
+        custom.get("input_tokens", budget[0]),
+        custom.get("output_tokens", budget[1]),
+    )
+
+
+def estimate_output_tokens(text: str, target_lang: str) -> int:
+    ratio = OUTPUT_TOKEN_RATIO.get(target_lang, DEFAULT_OUTPUT_TOKEN_RATIO)
+    return int(estimate_tokens(text) * ratio) + BATCH_ITEM_OVERHEAD_TOKENS
+
+
+class BatchPacker:
+    """
+    Packs prepared texts into batches by estimated tokens instead of a fixed count.
+    A batch is closed when the next text would exceed the input or output budget
+    or max_items is reached. A text that alone exceeds a budget gets its own request.
+    """
+
+    def __init__(
+        self,
+        max_items: int,
+        input_budget: int = None,
+        output_budget: int = None,
+        target_lang: str = "ko",
+    ):
+        self.max_items = max_items
+        self.input_budget = input_budget
+        self.output_budget = output_budget
+        self.target_lang = target_lang
+
+        self.current = []
+        self.current_input = 0
+        self.current_output = 0
+
+        self.batches = 0
+        self.entries = 0
+        self.isolated = 0
+        self.total_input = 0
+        self.max_input = 0
+
+    def _over_budget(self, input_tokens: int, output_tokens: int) -> bool:
+        return (self.input_budget and input_tokens > self.input_budget) or (
+            self.output_budget and output_tokens > self.output_budget
+        )
+
+    def add(self, text: str) -> list:
+        """Adds a text. Returns the batches that are complete now (usually none)."""
+        input_tokens = estimate_tokens(text) + BATCH_ITEM_OVERHEAD_TOKENS
+        output_tokens = estimate_output_tokens(text, self.target_lang)
+        ready = []
+
+        if self._over_budget(input_tokens, output_tokens):
+            # Oversized entry: never let it take a whole batch down with it
+            self.isolated += 1
+            self._record([text], input_tokens)
+            ready.append([text])
+            return ready
+
+        if self.current and (
+            len(self.current) >= self.max_items
+            or self._over_budget(
+                self.current_input + input_tokens, self.current_output + output_tokens
+            )
+        ):
+            ready.append(self.flush())
+
+        self.current.append(text)
+        self.current_input += input_tokens
+        self.current_output += output_tokens
+
+        if len(self.current) >= self.max_items:
+            ready.append(self.flush())
+        return ready
+
+    def flush(self) -> list:
+        """Closes the current (partial) batch. Returns it, or None if empty."""
+        if not self.current:
+            return None
+        batch = self.current
+        self._record(batch, self.current_input)
+        self.current = []
+        self.current_input = 0
+        self.current_output = 0
+        return batch
+
+    def _record(self, batch: list, input_tokens: int):
+        self.batches += 1
+        self.entries += len(batch)
+        self.total_input += input_tokens
+        self.max_input = max(self.max_input, input_tokens)
+
+    def __len__(self):
+        return len(self.current)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "entries": self.entries,
+            "isolated": self.isolated,
+            "avg_entries": round(self.entries / self.batches, 1) if self.batches else 0,
+            "avg_input_tokens": (
+                round(self.total_input / self.batches) if self.batches else 0
+            ),
+            "max_input_tokens": self.max_input,
+            "input_budget": self.input_budget,
+            "output_budget": self.output_budget,
+        }
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import time
+from collections import deque
+
+# (initial, minimum, maximum) concurrent requests per provider.
+# The initial values are the old fixed CONCURRENT_BATCHES settings.
+PROVIDER_LIMITS = {
+    "ollama": (1, 1, 4),
+    "google": (5, 1, 20),
+    "gemini": (1, 1, 16),
+}
+DEFAULT_LIMITS = (5, 1, 32)
+
+# Statuses that mean "slow down": rate limits, overload and server errors.
+# 0 is used for connection errors/timeouts.
+BACKOFF_STATUSES = {0, 429, 500, 502, 503, 504, 529}
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limit for one provider.
+
+    - Every full window of successful responses (window = current limit) raises the limit
+      by 1, as long as latency is not trending up.
+    - A 429/5xx/connection error halves the limit (at most once per cooldown).
+    - Retry-After pauses all dispatching until it has passed.
+    """
+
+    HISTORY_SIZE = 50
+    LATENCY_TOLERANCE = 1.5  # short-term latency may be this much above long-term
+
+    def __init__(self, name: str, initial: int, min_limit: int, max_limit: int):
+        self.name = name
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+
+        self.in_flight = 0
+        self.successes_in_window = 0
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.short_latency = None  # fast EWMA
+        self.long_latency = None  # slow EWMA
+        self.history = deque(maxlen=self.HISTORY_SIZE)
+        self._record("init")
+
+        self._waiters = deque()
+
+    # --- Slots -------------------------------------------------------------
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pause = self.blocked_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                return
+
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake()
+
+    def _wake(self):
+        # Waiters re-check the limit themselves, so waking all of them is safe
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    # --- Feedback ----------------------------------------------------------
+
+    def record_response(self, status: int, latency: float, retry_after: float = None):
+        """Called for every provider response (see BaseTranslator.response_listener)."""
+        now = time.monotonic()
+
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+        if status in BACKOFF_STATUSES:
+            self._decrease(now, f"status {status}")
+            return
+
+        if status != 200:
+            return  # 4xx like 401/404 are not a capacity problem
+
+        if latency is not None:
+            if self.short_latency is None:
+                self.short_latency = self.long_latency = latency
+            else:
+                self.short_latency = 0.3 * latency + 0.7 * self.short_latency
+                self.long_latency = 0.05 * latency + 0.95 * self.long_latency
+
+        self.successes_in_window += 1
+        if self.successes_in_window >= self.limit:
+            self.successes_in_window = 0
+            if self._latency_healthy() and self.limit < self.max_limit:
+                self.limit += 1
+                self._record("increase")
+                self._wake()
+
+    def _latency_healthy(self) -> bool:
+        if self.short_latency is None or self.long_latency is None:
+            return True
+        return self.short_latency <= self.long_latency * self.LATENCY_TOLERANCE
+
+    def _decrease(self, now: float, reason: str):
+        self.successes_in_window = 0
+        # Requests sent before the last decrease will fail too, don't count them twice
+        cooldown = max(1.0, self.short_latency or 0)
+        if now - self.last_decrease < cooldown:
+            return
+        self.last_decrease = now
+
+        new_limit = max(self.min_limit, self.limit // 2)
+        if new_limit != self.limit:
+            self.limit = new_limit
+            self._record(f"decrease ({reason})")
+
+    def _record(self, reason: str):
+        self.history.append(
+            {"time": round(time.time(), 2), "limit": self.limit, "reason": reason}
+        )
+
+    def state(self) -> dict:
+        return {
+            "provider": self.name,
+            "limit": self.limit,
+            "min": self.min_limit,
+            "max": self.max_limit,
+            "in_flight": self.in_flight,
+            "latency_short": (
+                round(self.short_latency, 3) if self.short_latency is not None else None
+            ),
+            "latency_long": (
+                round(self.long_latency, 3) if self.long_latency is not None else None
+            ),
+            "paused_for": round(max(0.0, self.blocked_until - time.monotonic()), 2),
+            "history": list(self.history),
+        }
+
+
+# Process-wide: { "provider:account_hash:model": AdaptiveConcurrencyController }.
+# Concurrent tasks with the same account and model share one limit.
+_controllers = {}
+
+
+def _controller_key(provider: str, account: str, model: str) -> str:
+    account_hash = hashlib.sha256((account or "").encode("utf-8")).hexdigest()[:12]
+    return f"{provider}:{account_hash}:{model or ''}"
+
+
+def get_concurrency_controller(
+    provider: str, account: str = "", model: str = ""
+) -> AdaptiveConcurrencyController:
+    """
+    Returns the shared controller for provider + account + model.
+    account: the credential the capacity belongs to (API key, or the Ollama URL)
+    """
+    key = _controller_key(provider, account, model)
+    if key not in _controllers:
+        initial, min_limit, max_limit = PROVIDER_LIMITS.get(provider, DEFAULT_LIMITS)
+        _controllers[key] = AdaptiveConcurrencyController(
+            provider, initial, min_limit, max_limit
+        )
+    return _controllers[key]
+
+
+def peek_concurrency_controller(
+    provider: str, account: str = "", model: str = ""
+) -> AdaptiveConcurrencyController:
+    """Returns the controller if a task already created it, else None."""
+    return _controllers.get(_controller_key(provider, account, model))
@@ -0,0 +1,99 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Worker processes for CPU-bound parsing and pre/post-processing
+# (override with TRANSLATION_CPU_WORKERS, 0 runs everything in a thread instead).
+DEFAULT_CPU_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+
+# Texts per prepare_texts call, large lookups are split so several workers share them
+PREPARE_CHUNK_SIZE = 500
+
+_pool = None
+_pool_disabled = False
+
+
+def worker_count() -> int:
+    return int(os.environ.get("TRANSLATION_CPU_WORKERS", DEFAULT_CPU_WORKERS))
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Returns the process-wide pool, created on first use. None if disabled."""
+    global _pool
+    if _pool_disabled or worker_count() <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=worker_count())
+    return _pool
+
+
+def shutdown_cpu_pool(wait: bool = False):
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+
+
+async def run_cpu(func, *args):
+    """
+    Runs func(*args) in a worker process and awaits the result.
+    func and its arguments must be picklable (module level functions, plain data).
+    Falls back to a thread if the pool is disabled or broke (e.g. a worker was killed).
+    """
+    global _pool, _pool_disabled
+    pool = get_cpu_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool as e:
+        print(f"CPU pool broken, continuing in threads: {e}")
+        _pool = None
+        _pool_disabled = True
+        return await asyncio.to_thread(func, *args)
+
+
+# --- Worker functions --------------------------------------------------------
+# Module level so they can be sent to worker processes. Each worker keeps its own
+# ModGenerator (and YmlManager with the compiled entry pattern).
+
+_worker_generator = None
+
+
+def _generator():
+    global _worker_generator
+    if _worker_generator is None:
+        # Imported here, mod_generator imports this module
+        from .mod_generator import ModGenerator
+
+        _worker_generator = ModGenerator()
+    return _worker_generator
+
+
+def parse_localisation_file(source_path: str, header: str):
+    """
+    Parses one source file.
+    Returns (entries, original_lines) or None if it could not be read.
+    """
+    result = _generator().yml_manager.process_file(source_path, None, None, header)
+    if result is None:
+        return None
+    to_translate, translated_lines_ref, original_lines = result
+    return to_translate, original_lines
+
+
+def prepare_texts(translator_cls, texts: list, glossary: dict = None) -> list:
+    """
+    Runs translator_cls.prepare_text over many texts.
+    prepare_text only uses class attributes (PRESERVE_PATTERNS, SUPPORTS_NATIVE_GLOSSARY),
+    so no configured instance (API keys, sessions) is needed in the worker.
+    """
+    preparer = translator_cls.__new__(translator_cls)
+    return [preparer.prepare_text(text, glossary) for text in texts]
+
+
+def write_localisation_file(job: dict, paradox_lang: str) -> tuple:
+    """Rebuilds and writes one finished file. Returns (error or None, manifest entries)."""
+    return _generator()._write_localisation_file(job, paradox_lang)
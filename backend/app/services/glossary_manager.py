@@ -1,6 +1,8 @@
 import os
 import json
 
+from .glossary_matcher import get_glossary_matcher
+
 
 class GlossaryManager:
     """
@@ -11,6 +13,7 @@ class GlossaryManager:
     def __init__(self, glossary_path: str = "glossary.json"):
         self.glossary_path = glossary_path
         self.terms = self._load_glossary()
+        self._replacements = None  # non-empty terms, built by apply_glossary
 
     def _load_glossary(self) -> dict:
         if not os.path.exists(self.glossary_path):
@@ -27,6 +30,7 @@ class GlossaryManager:
             with open(self.glossary_path, "w", encoding="utf-8") as f:
                 json.dump(terms, f, ensure_ascii=False, indent=2)
             self.terms = terms
+            self._replacements = None
             return True
         except Exception as e:
             print(f"Error saving glossary: {e}")
@@ -38,10 +42,20 @@ class GlossaryManager:
     def apply_glossary(self, text: str) -> str:
         """
         Applies glossary replacements to text.
-        Simple string replacement (case-sensitive for now).
+        Whole words, case-insensitive, longest term first (see GlossaryMatcher).
         """
-        result = text
-        for term, replacement in self.terms.items():
-            if term and replacement:
-                result = result.replace(term, replacement)
-        return result
+        if self._replacements is None:
+            self._replacements = {
+                term: value for term, value in self.terms.items() if term and value
+            }
+        terms = self._replacements
+        if not terms:
+            return text
+        parts = []
+        position = 0
+        for start, end, term in get_glossary_matcher(terms).find(text):
+            parts.append(text[position:start])
+            parts.append(terms[term])
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
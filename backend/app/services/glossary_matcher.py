@@ -0,0 +1,204 @@
+from collections import OrderedDict, deque
+
+from .translation_cache import glossary_hash
+from .translator.markup import PLACEHOLDER_PATTERN
+
+# Compiled glossaries kept per process, least recently used are dropped first
+MAX_MATCHERS = 8
+
+# Endings an inflected match may add to a term: Division(s), Tank(s), Bus(es)
+PLURAL_SUFFIXES = ("", "s", "es")
+# Terms ending in consonant + y: Factory -> Factories
+Y_PLURAL_SUFFIXES = ("y", "ies")
+
+_matchers = OrderedDict()  # (glossary hash, inflected) -> GlossaryMatcher
+# A copy of the glossary of the previous call per mode, so repeated calls with the
+# same terms skip the hashing. A glossary edited in place no longer equals its copy.
+_last_used = {}  # inflected -> (copy of the glossary, matcher)
+
+
+def _is_word_char(ch: str) -> bool:
+    """
+    Letters and digits of space separated scripts. CJK text has no spaces
+    between words, so a term may start or end anywhere in it.
+    """
+    return ch.isalnum() and ch < "\u2e80"
+
+
+class GlossaryMatcher:
+    """
+    Aho-Corasick automaton over the (lower-cased) glossary terms: one scan of the
+    text finds every term, however large the glossary is.
+    Matching is case-insensitive, leftmost-longest and on word boundaries:
+    "Army" matches in "the Army." but not in "Armyworks". The texts are expected
+    after extract_markup, so "§YArmy§!" arrives as "__VAR0__Army__VAR1__", where
+    "Army" matches; placeholders (__VAR0__) themselves are never matched into.
+
+    inflected: a term also matches with an English plural ending ("Divisions",
+    "Factories"). Good enough to pick the terms a prompt needs, too loose for
+    substituting the text.
+    """
+
+    def __init__(self, glossary: dict, inflected: bool = False):
+        self.glossary = dict(glossary)
+        self.inflected = inflected
+        self._order = {term: idx for idx, term in enumerate(glossary)}
+        self._suffixes = {}  # term -> endings it may take, inflected only
+        self._goto = [{}]  # state -> { char: state }
+        self._fail = [0]
+        self._out = [()]  # state -> ((length, term), ...) of the terms ending there
+
+        for term in glossary:
+            if not term or not term.strip():
+                continue
+            pattern = term.lower()
+            if inflected:
+                if (
+                    len(pattern) > 2
+                    and pattern[-1] == "y"
+                    and pattern[-2] not in "aeiou"
+                    and pattern[-2].isalpha()
+                ):
+                    pattern = pattern[:-1]
+                    self._suffixes[term] = Y_PLURAL_SUFFIXES
+                else:
+                    self._suffixes[term] = PLURAL_SUFFIXES
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            # Terms that differ only in case: the first one wins
+            if not any(other.lower() == term.lower() for _, other in self._out[state]):
+                # Inflected: "Factor" and "Factory" share a stem, both stay
+                self._out[state] += ((len(pattern), term),)
+
+        # Failure links, breadth first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    @property
+    def size(self) -> int:
+        return len(self.glossary)
+
+    def find(self, text: str) -> list:
+        """
+        Glossary terms in text, left to right without overlaps.
+        Returns [(start, end, term), ...], term being the glossary key.
+        """
+        if not text or len(self._goto) == 1:
+            return []
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lower-case to two (İ), keep the offsets aligned
+            lowered = "".join(
+                low if len(low) == 1 else ch
+                for ch, low in zip(text, map(str.lower, text))
+            )
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        candidates = []
+        state = 0
+        for end, ch in enumerate(lowered, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for length, term in out[state]:
+                    candidates.append((end - length, -end, term))
+        if not candidates:
+            return []
+
+        blocked = []
+        if "__" in text:
+            blocked = [match.span() for match in PLACEHOLDER_PATTERN.finditer(text)]
+
+        # Leftmost first, the longest of the terms starting at the same place first
+        candidates.sort()
+        matches = []
+        last_end = 0
+        for start, end, term in candidates:
+            end = -end
+            if start < last_end:
+                continue
+            if self.inflected:
+                end = self._inflected_end(text, lowered, start, end, term)
+                if end is None:
+                    continue
+            elif not self._on_boundaries(text, start, end):
+                continue
+            if any(start < b_end and b_start < end for b_start, b_end in blocked):
+                continue
+            matches.append((start, end, term))
+            last_end = end
+        return matches
+
+    def subset(self, texts: list) -> dict:
+        """The part of the glossary whose terms occur in any of texts, in glossary order."""
+        found = set()
+        for text in texts:
+            found.update(term for _, _, term in self.find(text))
+        return {
+            term: self.glossary[term] for term in sorted(found, key=self._order.get)
+        }
+
+    def _inflected_end(self, text: str, lowered: str, start: int, end: int, term):
+        """End of the inflected word starting at start, None if it is another word."""
+        if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+            return None
+        word_end = end
+        if _is_word_char(text[end - 1]):
+            while word_end < len(text) and _is_word_char(text[word_end]):
+                word_end += 1
+        if lowered[end:word_end] not in self._suffixes[term]:
+            return None
+        return word_end
+
+    @staticmethod
+    def _on_boundaries(text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+            return False
+        if (
+            end < len(text)
+            and _is_word_char(text[end - 1])
+            and _is_word_char(text[end])
+        ):
+            return False
+        return True
+
+
+def get_glossary_matcher(glossary: dict, inflected: bool = False) -> GlossaryMatcher:
+    """
+    The compiled matcher of a glossary, built once per distinct glossary (by content
+    hash), mode and process.
+    """
+    last_glossary, last_matcher = _last_used.get(inflected, (None, None))
+    if last_matcher is not None and glossary == last_glossary:
+        return last_matcher
+
+    key = (glossary_hash(glossary), inflected)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = _matchers[key] = GlossaryMatcher(glossary, inflected)
+        while len(_matchers) > MAX_MATCHERS:
+            _matchers.popitem(last=False)
+    else:
+        _matchers.move_to_end(key)
+    _last_used[inflected] = (dict(glossary), matcher)
+    return matcher
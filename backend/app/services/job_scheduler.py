@@ -0,0 +1,188 @@
+import asyncio
+import heapq
+import itertools
+import os
+
+from . import metrics, task_manager
+
+# Number of translation jobs running at the same time (override with TRANSLATION_WORKERS).
+# Jobs on the same provider still share its concurrency/rate limits.
+DEFAULT_WORKERS = 2
+
+
+class JobScheduler:
+    """
+    Priority queue of translation jobs with a fixed number of worker slots.
+    Higher priority runs first, equal priorities run in submission order.
+
+    Jobs are coroutine factories, started on the event loop of the API.
+    Pausing a job closes its gate: batches already sent finish normally, no new
+    batch is dispatched until the job is resumed (see wait_until_resumed).
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max(
+            1,
+            max_workers or int(os.environ.get("TRANSLATION_WORKERS", DEFAULT_WORKERS)),
+        )
+        self._queue = []  # heap of (-priority, seq, task_id)
+        self._factories = {}  # task_id -> (coroutine factory, priority)
+        self._running = {}  # task_id -> asyncio.Task
+        self._gates = {}  # task_id -> asyncio.Event, cleared while paused
+        self._seq = itertools.count()
+
+    # --- Submission ----------------------------------------------------------
+
+    def submit(self, task_id: str, factory, priority: int = 0) -> int:
+        """
+        Queues a job. factory() must return the coroutine to run.
+        Returns the queue position (0 when it started right away).
+        """
+        self._factories[task_id] = (factory, priority)
+        heapq.heappush(self._queue, (-priority, next(self._seq), task_id))
+        task_manager.update_task(task_id, {"status": "queued", "priority": priority})
+        self._dispatch()
+        return self.queue_position(task_id) or 0
+
+    def set_max_workers(self, count: int):
+        self.max_workers = max(1, count)
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._queue and len(self._running) < self.max_workers:
+            _, _, task_id = heapq.heappop(self._queue)
+            entry = self._factories.pop(task_id, None)
+            if entry is None:
+                continue  # cancelled while queued
+
+            factory, priority = entry
+            task_manager.update_task(task_id, {"status": "pending"})
+            self._running[task_id] = asyncio.create_task(self._run(task_id, factory))
+
+    async def _run(self, task_id: str, factory):
+        try:
+            await factory()
+        except asyncio.CancelledError:
+            print(f"[Scheduler] Task {task_id} cancelled")
+            task_manager.update_task(
+                task_id, {"status": "cancelled", "error": "Cancelled by user"}
+            )
+        except Exception as e:
+            print(f"[Scheduler] Task {task_id} failed: {e}")
+            task_manager.update_task(task_id, {"status": "error", "error": str(e)})
+        finally:
+            self._running.pop(task_id, None)
+            self._gates.pop(task_id, None)
+            self._dispatch()
+
+    # --- Control -------------------------------------------------------------
+
+    def cancel(self, task_id: str) -> bool:
+        """Removes a queued job or cancels a running one. Returns False if unknown."""
+        if task_id in self._factories:
+            del self._factories[task_id]
+            self._queue = [item for item in self._queue if item[2] != task_id]
+            heapq.heapify(self._queue)
+            task_manager.update_task(
+                task_id, {"status": "cancelled", "error": "Cancelled by user"}
+            )
+            return True
+
+        running = self._running.get(task_id)
+        if running is None:
+            return False
+        running.cancel()
+        return True
+
+    def _gate(self, task_id: str) -> asyncio.Event:
+        gate = self._gates.get(task_id)
+        if gate is None:
+            gate = asyncio.Event()
+            gate.set()
+            self._gates[task_id] = gate
+        return gate
+
+    def pause(self, task_id: str) -> bool:
+        if task_id not in self._running and task_id not in self._factories:
+            return False
+        self._gate(task_id).clear()
+        task_manager.update_task(task_id, {"paused": True})
+        if task_id in self._running:
+            task_manager.update_task(task_id, {"status": "paused"})
+        return True
+
+    def resume(self, task_id: str) -> bool:
+        if not self.is_paused(task_id):
+            return False
+        self._gate(task_id).set()
+        task_manager.update_task(task_id, {"paused": False})
+        if task_id in self._running:
+            task_manager.update_task(task_id, {"status": "running"})
+        return True
+
+    def is_paused(self, task_id: str) -> bool:
+        gate = self._gates.get(task_id)
+        return gate is not None and not gate.is_set()
+
+    async def wait_until_resumed(self, task_id: str):
+        """Called by the job before dispatching more work. Returns at once unless paused."""
+        gate = self._gates.get(task_id)
+        if gate is not None:
+            await gate.wait()
+
+    # --- State ---------------------------------------------------------------
+
+    def queue_position(self, task_id: str) -> int:
+        """1-based position among queued jobs, None if not queued."""
+        if task_id not in self._factories:
+            return None
+        for position, item in enumerate(sorted(self._queue), start=1):
+            if item[2] == task_id:
+                return position
+        return None
+
+    def state(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "running": [
+                {"task_id": task_id, "paused": self.is_paused(task_id)}
+                for task_id in self._running
+            ],
+            "queued": [
+                {"task_id": task_id, "priority": -neg_priority, "position": position}
+                for position, (neg_priority, _, task_id) in enumerate(
+                    sorted(self._queue), start=1
+                )
+                if task_id in self._factories
+            ],
+        }
+
+
+_scheduler = None
+
+
+def _job_counts() -> dict:
+    if _scheduler is None:
+        return {}
+    state = _scheduler.state()
+    return {
+        ("running",): len(state["running"]),
+        ("queued",): len(state["queued"]),
+        ("slots",): state["max_workers"],
+    }
+
+
+metrics.Gauge(
+    "translation_jobs",
+    "Running and queued translation jobs, and the number of worker slots.",
+    _job_counts,
+    ("state",),
+)
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Returns the process-wide scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
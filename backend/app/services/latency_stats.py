@@ -0,0 +1,47 @@
+import time
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class BatchLatencyTracker:
+    """
+    Batch latencies of one task and the length of its tail: the time between the
+    last batch being dispatched and the last batch finishing, when slots go idle.
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.started = time.monotonic()
+        self.drained_at = None  # every batch dispatched
+        self.finished_at = None  # every batch finished
+
+    def record(self, latency: float):
+        self.latencies.append(latency)
+
+    def mark_drained(self):
+        self.drained_at = time.monotonic()
+
+    def mark_finished(self):
+        self.finished_at = time.monotonic()
+
+    def stats(self) -> dict:
+        values = sorted(self.latencies)
+        tail = None
+        if self.drained_at is not None:
+            end = self.finished_at or time.monotonic()
+            tail = round(end - self.drained_at, 2)
+        return {
+            "batches": len(values),
+            "p50": round(percentile(values, 0.5), 2),
+            "p90": round(percentile(values, 0.9), 2),
+            "p99": round(percentile(values, 0.99), 2),
+            "max": round(values[-1], 2) if values else 0.0,
+            # Seconds at the end of the job with fewer batches than slots in flight
+            "tail_seconds": tail,
+        }
@@ -0,0 +1,236 @@
+import bisect
+import math
+
+# Prometheus text exposition (format 0.0.4) for the translation engine, served by
+# GET /metrics. Updates are plain dict/list operations on the event loop: no locks,
+# no label objects, so instrumenting the hot path costs next to nothing.
+
+# Request/batch latencies in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+# File parse/write times in seconds
+FILE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+_registry = []
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter. inc() takes the label values positionally."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}  # label values -> count
+        _registry.append(self)
+
+    def inc(self, *label_values, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def get(self, *label_values) -> float:
+        return self.values.get(label_values, 0)
+
+    def samples(self):
+        for label_values, value in self.values.items():
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, per label values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.values = {}  # label values -> [bucket counts..., +Inf count, sum]
+        _registry.append(self)
+
+    def observe(self, value: float, *label_values):
+        entry = self.values.get(label_values)
+        if entry is None:
+            entry = self.values[label_values] = [0] * (len(self.buckets) + 2)
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def samples(self):
+        for label_values, entry in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), entry):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(self.labels, label_values, le),
+                    cumulative,
+                )
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum", labels, entry[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Gauge:
+    """
+    Value computed when /metrics is read.
+    func() returns a number, or { label values tuple: number } when there are labels.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, func, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.func = func
+        _registry.append(self)
+
+    def samples(self):
+        try:
+            values = self.func()
+        except Exception as e:
+            print(f"Metric {self.name} failed: {e}")
+            return
+        if not self.labels:
+            values = {(): values}
+        for label_values, value in values.items():
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text format."""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Provider calls (BaseTranslator.report_response and the retry loops) -----
+
+PROVIDER_REQUESTS = Counter(
+    "translator_requests_total",
+    "Provider calls by HTTP status (0: connection error or timeout).",
+    ("provider", "status"),
+)
+PROVIDER_LATENCY = Histogram(
+    "translator_request_seconds",
+    "Latency of provider calls.",
+    ("provider",),
+)
+PROVIDER_RATE_LIMITED = Counter(
+    "translator_rate_limited_total",
+    "Provider calls answered with 429.",
+    ("provider",),
+)
+PROVIDER_RETRIES = Counter(
+    "translator_retries_total",
+    "Provider calls repeated after a failure.",
+    ("provider",),
+)
+
+GLOSSARY_PROMPT_TOKENS = Counter(
+    "translator_glossary_prompt_tokens_total",
+    "Estimated glossary tokens in LLM prompts: sent, or saved by sending only the "
+    "terms found in the request.",
+    ("provider", "kind"),
+)
+
+# --- ModGenerator pipeline ---------------------------------------------------
+
+ENTRIES = Counter(
+    "translation_entries_total",
+    "Localisation entries resolved (translated, reused or carried forward).",
+)
+LOOKUPS = Counter(
+    "translation_lookups_total",
+    "Unique source strings by where their translation came from "
+    "(journal, empty, vanilla, cache, provider).",
+    ("source",),
+)
+BATCH_LATENCY = Histogram(
+    "translation_batch_seconds",
+    "Time to translate one batch, retries and fallbacks included.",
+    ("service",),
+)
+FILE_PARSE_SECONDS = Histogram(
+    "translation_file_parse_seconds",
+    "Time to parse one source localisation file.",
+    buckets=FILE_BUCKETS,
+)
+FILE_WRITE_SECONDS = Histogram(
+    "translation_file_write_seconds",
+    "Time to rebuild and write one translated localisation file.",
+    buckets=FILE_BUCKETS,
+)
+
+# Queue depth probes of running pipelines: { task_id: { queue name: qsize callable } }
+_queue_probes = {}
+
+
+def track_queues(task_id: str, queues: dict):
+    _queue_probes[task_id] = queues
+
+
+def untrack_queues(task_id: str):
+    _queue_probes.pop(task_id, None)
+
+
+def _queue_depths() -> dict:
+    depths = {}
+    for queues in list(_queue_probes.values()):
+        for name, qsize in queues.items():
+            depths[(name,)] = depths.get((name,), 0) + qsize()
+    return depths
+
+
+def _hit_ratio(hits: str, *sources) -> float:
+    total = sum(LOOKUPS.get(source) for source in sources)
+    return LOOKUPS.get(hits) / total if total else 0.0
+
+
+QUEUE_DEPTH = Gauge(
+    "translation_queue_depth",
+    "Items waiting between pipeline stages, summed over running tasks.",
+    _queue_depths,
+    ("queue",),
+)
+VANILLA_HIT_RATIO = Gauge(
+    "translation_vanilla_hit_ratio",
+    "Share of looked up strings found in the vanilla memory.",
+    lambda: _hit_ratio("vanilla", "vanilla", "cache", "provider"),
+)
+CACHE_HIT_RATIO = Gauge(
+    "translation_cache_hit_ratio",
+    "Share of strings that reached the cache and were found there.",
+    lambda: _hit_ratio("cache", "cache", "provider"),
+)
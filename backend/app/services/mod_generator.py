@@ -5,16 +5,55 @@ import re
 import subprocess
 import time
 import asyncio
+import itertools
+import math
 import ctypes  # For Windows Sleep Prevention
 from .yml_manager import YmlManager
-from .vanilla_manager import VanillaManager
+from .vanilla_manager import get_vanilla_manager
 from .translator.google import GoogleTranslatorService
 from .translator.ollama import OllamaTranslatorService
 from .translator.openai_service import OpenAITranslatorService
 from .translator.claude import ClaudeTranslatorService
 from .translator.gemini import GeminiTranslatorService
+from .translator.base import LANGUAGE_NAMES
+from .translator.cassette import MODE_REPLAY, close_cassette, open_cassette
+from .translation_cache import get_translation_cache
+from . import translation_lookup, translation_manifest
+from .translation_journal import TranslationJournal, load_journal
+from .concurrency import get_concurrency_controller
+from .rate_limiter import get_rate_limiter
+from .job_scheduler import get_job_scheduler
+from . import cpu_pool, metrics, task_trace
+from .batch_packer import BatchPacker, BATCH_SIZES, DEFAULT_BATCH_SIZE, get_token_budget
+from .latency_stats import BatchLatencyTracker
+from .shared_source import SharedSource
+from .rate_limiter import estimate_tokens
 from . import task_manager
 
+# Parsed files buffered between pipeline stages. Files waiting for translations
+# are held in memory until written, so this bounds memory on huge mods.
+PIPELINE_FILE_BUFFER = 4
+
+# Work ordering of a job (TranslateRequest.schedule)
+SCHEDULE_LONGEST_FIRST = "longest_first"  # biggest files/entries first: short tail
+SCHEDULE_SHORTEST_FIRST = "shortest_first"  # short UI strings first: fast preview
+SCHEDULE_FIFO = "fifo"  # files in the order they are found
+SCHEDULES = (SCHEDULE_LONGEST_FIRST, SCHEDULE_SHORTEST_FIRST, SCHEDULE_FIFO)
+
+# Map language codes to HoI4 folder names
+LANG_FOLDER_MAP = {
+    "ko": "korean",
+    "en": "english",
+    "fr": "french",
+    "de": "german",
+    "es": "spanish",
+    "pt": "braz_por",
+    "pl": "polish",
+    "ru": "russian",
+    "ja": "japanese",
+    "zh": "simp_chinese",
+}
+
 
 def write_file_via_cmd(filepath: str, content: str) -> bool:
     """
@@ -124,6 +163,13 @@ class ModGenerator:
         vanilla_path: str = None,
         glossary: dict = None,
         shutdown_when_complete: bool = False,
+        use_cache: bool = True,
+        previous_output_path: str = None,
+        schedule: str = SCHEDULE_LONGEST_FIRST,
+        resume_state: dict = None,
+        shared_source: SharedSource = None,
+        dedup_table: dict = None,
+        control_task_id: str = None,
     ) -> dict:
         """
         Generates the translation mod.
@@ -134,7 +180,40 @@ class ModGenerator:
         vanilla_path: Optional path to HoI4 installation for translation memory
         glossary: Optional dict { "Original": "Target" }
         shutdown_when_complete: If True, shutdowns the PC after completion
+        use_cache: If True, reuses translations from the persistent TranslationCache
+        previous_output_path: Optional previously generated mod folder (update mode).
+            Only keys that are new or changed since that run are translated and the
+            folder is updated in place.
+        schedule: Work order, one of SCHEDULES. longest_first keeps every slot busy until
+            the end, shortest_first translates short UI strings first for a quick preview.
+        resume_state: Internal, state loaded from the task journal by resume_translation_mod
+        shared_source: Internal, parsed source shared with the other languages of the run
+        dedup_table: Internal, { cleaned text: translation } shared with the other mods
+            of a collection job (same language, service and glossary)
+        control_task_id: Internal, scheduler job whose pause gate applies (default task_id)
         """
+        # Parameters recorded in the journal so the job can be restarted after a crash
+        job_params = {
+            "source_mod": source_mod,
+            "output_root": output_root,
+            "target_lang": target_lang,
+            "service": service,
+            "service_config": service_config,
+            "vanilla_path": vanilla_path,
+            "glossary": glossary,
+            "shutdown_when_complete": shutdown_when_complete,
+            "use_cache": use_cache,
+            "previous_output_path": previous_output_path,
+            "schedule": schedule,
+        }
+        journal = TranslationJournal(task_id)
+        journaled = resume_state["translations"] if resume_state else {}
+        scheduler = get_job_scheduler()
+        control_task_id = control_task_id or task_id
+        source = shared_source or SharedSource()
+        # Timing spans, served by /api/translate/trace/{task_id}
+        trace = task_trace.start_trace(task_id)
+        cassette = None
 
         # Enable Keep-Awake
         self.set_keep_awake(True)
@@ -146,51 +225,83 @@ class ModGenerator:
             # Initialize Vanilla Manager if path provided
             vanilla_db = None
             if vanilla_path:
+                span_start = trace.now()
                 try:
-                    vm = VanillaManager(vanilla_path, target_lang)
-                    vm.load_database()
-                    vanilla_db = vm
+                    vanilla_db = await asyncio.to_thread(
+                        get_vanilla_manager,
+                        vanilla_path,
+                        LANG_FOLDER_MAP.get(target_lang, target_lang),
+                    )
                 except Exception as e:
                     print(f"Failed to initialize VanillaManager: {e}")
+                trace.add("vanilla_load", "setup", span_start, trace.now())
 
-            # Service Selection with config
-            if service == "google":
-                translator = GoogleTranslatorService()
-            elif service == "ollama":
-                translator = OllamaTranslatorService(
-                    model=service_config.get("ollama_model", "gemma2"),
-                    base_url=service_config.get("ollama_url", "http://localhost:11434"),
-                )
-            elif service == "openai":
-                translator = OpenAITranslatorService(
-                    model=service_config.get("openai_model", "gpt-4o-mini"),
-                    api_key=service_config.get("openai_key", ""),
-                    glossary=glossary,
-                )
-            elif service == "claude":
-                translator = ClaudeTranslatorService(
-                    model=service_config.get(
-                        "claude_model", "claude-3-5-sonnet-20241022"
-                    ),
-                    api_key=service_config.get("claude_key", ""),
-                    glossary=glossary,
+            translator = self._create_translator(service, service_config, glossary)
+
+            # Shared RPM/TPM budget for this provider + API key (across all running tasks)
+            limits = (service_config.get("rate_limits") or {}).get(service) or {}
+            translator.rate_limiter = get_rate_limiter(
+                service,
+                self._rate_limit_key(service, service_config),
+                rpm=limits.get("rpm"),
+                tpm=limits.get("tpm"),
+            )
+
+            # Record the provider traffic to a file, or replay it without network,
+            # e.g. {"mode": "replay", "path": "run.jsonl.gz", "timing": false}
+            cassette_config = service_config.get("cassette")
+            if cassette_config:
+                cassette = open_cassette(
+                    cassette_config["path"],
+                    cassette_config.get("mode", MODE_REPLAY),
+                    timing=cassette_config.get("timing", False),
                 )
-            elif service == "gemini":
-                translator = GeminiTranslatorService(
-                    model=service_config.get("gemini_model", "gemini-1.5-flash"),
-                    api_key=service_config.get("gemini_key", ""),
-                    glossary=glossary,
+                translator.cassette = cassette
+
+            # Persistent translation cache (keyed by source, language, service, model, glossary)
+            cache = None
+            cache_model = getattr(translator, "model", "")
+            if use_cache:
+                try:
+                    cache = get_translation_cache()
+                except Exception as e:
+                    print(f"Failed to open translation cache: {e}")
+
+            # Update mode: reuse a previous output folder and its manifest
+            previous_manifest = None
+            if previous_output_path:
+                previous_output_path = os.path.normpath(previous_output_path)
+                previous_manifest = translation_manifest.load_manifest(
+                    previous_output_path
                 )
-            else:
-                translator = GoogleTranslatorService()
+                if (
+                    previous_manifest
+                    and previous_manifest.get("target_lang") != target_lang
+                ):
+                    print(
+                        "Previous output was translated to a different language, ignoring it."
+                    )
+                    previous_manifest = None
 
             # 1. Define new mod metadata
             display_name = source_mod["name"]
 
             mod_id = source_mod.get("id", "local")
             safe_name = f"translate_mod_{mod_id}_{int(time.time())}"
-
             new_mod_name = f"[Translate] {display_name}"
+            if shared_source is not None and shared_source.consumers > 1:
+                # Multi-language run: one folder per language, created in the same second
+                safe_name = f"{safe_name}_{target_lang}"
+                new_mod_name = f"{new_mod_name} ({target_lang})"
+            if previous_manifest:
+                # Update in place so the launcher keeps pointing at the same mod
+                output_root = os.path.dirname(previous_output_path)
+                safe_name = os.path.basename(previous_output_path)
+            if resume_state:
+                # Continue writing into the folder of the interrupted run
+                output_root = resume_state["output_root"]
+                safe_name = resume_state["dir_name"]
+
             new_dir_name = safe_name
             target_dir = os.path.join(output_root, new_dir_name)
 
@@ -245,6 +356,8 @@ class ModGenerator:
 
             # 4. Create directory structure
             target_dir = os.path.join(output_root, new_dir_name)
+            if not resume_state:
+                journal.write_header(job_params, output_root, new_dir_name)
             subprocess.run(
                 f'mkdir "{os.path.join(target_dir, "localisation", "replace")}"',
                 shell=True,
@@ -268,27 +381,28 @@ class ModGenerator:
             # Process Thumbnail
             from .thumbnail_processor import process_thumbnail
 
-            process_thumbnail(source_mod["path"], target_dir, text="Korean Translation")
+            language = LANGUAGE_NAMES.get(target_lang, target_lang)
+            process_thumbnail(
+                source_mod["path"], target_dir, text=f"{language} Translation"
+            )
 
-            # 5. Process Localisation Files
+            # 5. Process Localisation Files as a pipeline:
+            # discover -> parse -> lookup (journal, vanilla, cache) -> translate -> validate -> write
+            # Stages are connected by bounded queues, so files stream through, provider slots
+            # stay busy across file boundaries and only a few files are held in memory.
             source_loc_path = os.path.join(source_mod["path"], "localisation")
+            paradox_lang = LANG_FOLDER_MAP.get(target_lang, target_lang)
             files_processed = 0
             error_log = []  # List to store error details (file, key, message)
 
-            # Count total files first for progress
-            total_files = 0
-            if os.path.exists(source_loc_path):
-                for root, dirs, files in os.walk(source_loc_path):
-                    for file in files:
-                        if file.endswith("l_english.yml"):
-                            total_files += 1
-
             # Update initial task status
             task_manager.update_task(
                 task_id,
                 {
-                    "status": "running",
-                    "total_files": total_files,
+                    "status": (
+                        "paused" if scheduler.is_paused(control_task_id) else "running"
+                    ),
+                    "total_files": 0,
                     "processed_files": 0,
                     "percent": 0,
                     "start_time": time.time(),
@@ -296,300 +410,594 @@ class ModGenerator:
                 },
             )
 
-            if os.path.exists(source_loc_path):
-                print(f"DEBUG: Found source localisation at: {source_loc_path}")
-                for root, dirs, files in os.walk(source_loc_path):
-                    for file in files:
-                        print(f"DEBUG: Checking file: {file}")
-                        if file.endswith("l_english.yml"):
-                            print(f"DEBUG: Processing English file: {file}")
-
-                            task_manager.update_task(task_id, {"current_file": file})
-
-                            # Map language codes to HoI4 folder names
-                            lang_folder_map = {
-                                "ko": "korean",
-                                "en": "english",
-                                "fr": "french",
-                                "de": "german",
-                                "es": "spanish",
-                                "pt": "braz_por",
-                                "pl": "polish",
-                                "ru": "russian",
-                                "ja": "japanese",
-                                "zh": "simp_chinese",
-                            }
-                            paradox_lang = lang_folder_map.get(target_lang, target_lang)
-
-                            # Handle subdirectory structure
-                            rel_path = os.path.relpath(root, source_loc_path)
-                            if rel_path == ".":
-                                target_subdir = os.path.join(
-                                    target_dir, "localisation", paradox_lang
-                                )
-                            else:
-                                rel_path_parts = rel_path.split(os.sep)
-                                new_rel_path_parts = []
-                                for part in rel_path_parts:
-                                    if part.lower() == "english":
-                                        new_rel_path_parts.append(paradox_lang)
-                                    else:
-                                        new_rel_path_parts.append(part)
-                                rel_path_target = os.path.join(*new_rel_path_parts)
-                                target_subdir = os.path.join(
-                                    target_dir, "localisation", rel_path_target
-                                )
-
-                            os.makedirs(target_subdir, exist_ok=True)
+            # Update mode: carry forward keys whose source value did not change
+            previous_index = {}
+            if previous_manifest:
+                previous_index = translation_manifest.build_previous_index(
+                    previous_output_path,
+                    previous_manifest,
+                    self.yml_manager.entry_pattern,
+                )
 
-                            source_file_path = os.path.join(root, file)
-                            new_filename = file.replace(
-                                "l_english.yml", f"l_{paradox_lang}.yml"
-                            )
-                            target_file_path = os.path.join(target_subdir, new_filename)
-
-                            # Read and Prepare
-                            try:
-                                result = self.yml_manager.process_file(
-                                    source_file_path,
-                                    target_file_path,
-                                    None,
-                                    f"l_{paradox_lang}",
-                                )
-                            except Exception as e:
-                                print(f"Error parsing file {file}: {e}")
-                                error_log.append(f"FILE_PARSE_ERROR: {file} - {str(e)}")
-                                continue
+            # Cheap counters for the hot loop, status readers derive the rest
+            progress = task_manager.start_counters(
+                task_id, 0, task_manager.get_task(task_id).get("start_time")
+            )
+            progress.probes["rate_limit"] = translator.rate_limiter.state
+            if cassette is not None:
+                progress.probes["cassette"] = cassette.state
 
-                            if result is None:
-                                continue
+            # Shared with any other task using the same provider account and model
+            controller = get_concurrency_controller(
+                service, self._rate_limit_key(service, service_config), cache_model
+            )
+            translator.response_listener = controller.record_response
+            translator.trace = trace
+            progress.probes["concurrency"] = controller.state
+            if glossary:
+                # Glossary tokens the LLM prompts carried vs. the whole glossary
+                progress.probes["glossary_prompt"] = lambda: translator.glossary_usage
+
+            # Concurrency is adaptive (see concurrency.PROVIDER_LIMITS), batches are packed
+            # by estimated tokens toward the provider/model budget
+            input_budget, output_budget = get_token_budget(
+                service, cache_model, service_config.get("batch_budgets")
+            )
+            packer = BatchPacker(
+                BATCH_SIZES.get(service, DEFAULT_BATCH_SIZE),
+                input_budget,
+                output_budget,
+                target_lang,
+            )
+            progress.probes["packing"] = packer.stats
+            latency_tracker = BatchLatencyTracker()
+            progress.probes["batch_latency"] = latency_tracker.stats
+
+            stats = {
+                "total_files": 0,
+                "carried_forward": 0,
+                "cache_hits": 0,
+                "cache_misses": 0,
+                "unique_entries": 0,  # strings actually sent to the provider
+                "entries_to_translate": 0,  # entries that needed the provider
+            }
+            parsed_files = []
+            # Entries still waiting, grouped by source value: { value: [(job, line_idx, key), ...] }
+            value_refs = {}
+            # Finished translations, reused when a later file has the same value
+            known = {}
+            # Values that went to the provider (for the dedup stats)
+            provider_values = set()
+            # Dedup by preserved form: "Hello $A$" and "Hello $B$" share "Hello __VAR0__"
+            # { cleaned_text: [(value, var_extractions, glossary_extractions), ...] }
+            preserved_groups = {}
+            # { cleaned_text: translated cleaned text }, failures are not kept
+            translated_cleaned = dedup_table if dedup_table is not None else {}
+
+            parse_queue = asyncio.Queue(maxsize=PIPELINE_FILE_BUFFER)
+            lookup_queue = asyncio.Queue(maxsize=PIPELINE_FILE_BUFFER)
+            # (priority, seq, batch), see queue_batch
+            translate_queue = asyncio.PriorityQueue(maxsize=controller.max_limit)
+            batch_seq = itertools.count()
+            result_queue = asyncio.Queue(maxsize=controller.max_limit)
+            # Filled from resolve(), holds only files that are complete
+            write_queue = asyncio.Queue()
+            metrics.track_queues(
+                task_id,
+                {
+                    "parse": parse_queue.qsize,
+                    "lookup": lookup_queue.qsize,
+                    "translate": translate_queue.qsize,
+                    "result": result_queue.qsize,
+                    "write": write_queue.qsize,
+                },
+            )
 
-                            to_translate, translated_lines_ref, original_lines = result
+            def resolve(value, translation):
+                """Fans a finished translation out to every entry with this source value."""
+                refs = value_refs.pop(value)
+                known[value] = translation
+                for job, idx, key in refs:
+                    job["translate_map"][idx] = translation
+                    job["pending"] -= 1
+                    if job["pending"] == 0:
+                        write_queue.put_nowait(job)
+                progress.done += len(refs)
+                metrics.ENTRIES.inc(amount=len(refs))
+
+            async def queue_batch(batch_texts):
+                """Queues a batch for translation, ordered by the job's schedule."""
+                seq = next(batch_seq)
+                if batch_texts is None:
+                    # End marker, sorts after every batch
+                    await translate_queue.put((math.inf, seq, None))
+                    return
+                cost = sum(estimate_tokens(text) for text in batch_texts)
+                if schedule == SCHEDULE_LONGEST_FIRST:
+                    priority = -cost
+                elif schedule == SCHEDULE_SHORTEST_FIRST:
+                    priority = cost
+                else:
+                    priority = seq
+                await translate_queue.put((priority, seq, batch_texts))
+
+            def register(job):
+                """Adds the entries of a parsed file. Returns the values seen for the first time."""
+                job["pending"] = 0  # entries still waiting for a translation
+                new_values = []
+                for idx, key, ver, value, suffix in job["entries"]:
+                    carried = translation_manifest.carried_translation(
+                        previous_index, key, value
+                    )
+                    if carried is not None:
+                        job["translate_map"][idx] = carried
+                        stats["carried_forward"] += 1
+                        progress.done += 1
+                        metrics.ENTRIES.inc()
+                    elif value in known:
+                        job["translate_map"][idx] = known[value]
+                        if value in provider_values:
+                            stats["entries_to_translate"] += 1
+                        progress.done += 1
+                        metrics.ENTRIES.inc()
+                    elif value in value_refs:
+                        value_refs[value].append((job, idx, key))
+                        job["pending"] += 1
+                    else:
+                        value_refs[value] = [(job, idx, key)]
+                        job["pending"] += 1
+                        new_values.append(value)
+
+                # Nothing to translate (update mode, repeated strings): write right away
+                if job["pending"] == 0:
+                    write_queue.put_nowait(job)
+                return new_values
+
+            def finalize_group(cleaned, translated_text):
+                """Resolves every value of a preserved group. Returns (value, translation) pairs."""
+                done = []
+                for value, var_ext, gls_ext in preserved_groups.pop(cleaned):
+                    stats["entries_to_translate"] += len(value_refs[value])
+                    if translated_text is None:
+                        # Use original value on failure
+                        resolve(value, value)
+                        continue
+                    trans_val = translator.finalize_text(
+                        translated_text, var_ext, gls_ext
+                    )
+                    resolve(value, trans_val)
+                    done.append((value, trans_val))
+                return done
+
+            async def discover_stage():
+                # FIFO streams the files into the pipeline as the walk finds them
+                jobs = self._iter_localisation_files(
+                    source_loc_path, target_dir, paradox_lang
+                )
+                if schedule != SCHEDULE_FIFO:
+                    # Biggest (or smallest) files go into the pipeline first, which
+                    # needs the whole list (paths only) before the first file
+                    span_start = trace.now()
+                    jobs = sorted(
+                        jobs,
+                        key=lambda job: os.path.getsize(job["source_path"]),
+                        reverse=schedule == SCHEDULE_LONGEST_FIRST,
+                    )
+                    trace.add(
+                        "discover", "setup", span_start, trace.now(), files=len(jobs)
+                    )
+                for job in jobs:
+                    stats["total_files"] += 1
+                    task_manager.update_task(
+                        task_id, {"total_files": stats["total_files"]}
+                    )
+                    await parse_queue.put(job)
+                await parse_queue.put(None)
+
+            async def parse_worker():
+                while True:
+                    job = await parse_queue.get()
+                    if job is None:
+                        # Let the other parse workers see the end too
+                        await parse_queue.put(None)
+                        break
+                    print(f"DEBUG: Parsing English file: {job['file']}")
+                    span_start = trace.now()
+                    try:
+                        result = await source.parse(job["source_path"])
+                    except Exception as e:
+                        print(f"Error parsing file {job['file']}: {e}")
+                        error_log.append(f"FILE_PARSE_ERROR: {job['file']} - {str(e)}")
+                        continue
+                    finally:
+                        trace.add(
+                            "parse", "parse", span_start, trace.now(), file=job["file"]
+                        )
+
+                    if result is None:
+                        continue
+
+                    to_translate, original_lines = result
+                    job["entries"] = to_translate
+                    job["original_lines"] = original_lines
+                    job["translate_map"] = {}  # line idx -> translated value
+                    parsed_files.append(job)
+                    progress.total += len(to_translate)
+
+                    new_values = register(job)
+                    if new_values:
+                        await lookup_queue.put(new_values)
+
+            async def parse_stage():
+                # One parse worker per CPU worker process
+                await asyncio.gather(
+                    *[parse_worker() for _ in range(max(1, cpu_pool.worker_count()))]
+                )
+                await lookup_queue.put(None)
 
-                            final_lines = []
-                            final_lines.append(f"l_{paradox_lang}:\n")
+            async def lookup_stage():
+                if journaled:
+                    print(
+                        f"  [Task {task_id}] Resuming: {len(journaled)} translations restored from journal"
+                    )
+                while True:
+                    values = await lookup_queue.get()
+                    if values is None:
+                        break
+
+                    # Journaled (resumed job), empty values and vanilla memory
+                    found, remaining = translation_lookup.local_lookup(
+                        values, journaled, vanilla_db
+                    )
+                    for source_name, hits in found.items():
+                        for value, translation in hits.items():
+                            if source_name == "vanilla":
+                                print(
+                                    f"  [Task {task_id}] [Vanilla Match] {value[:50]}"
+                                )
+                            resolve(value, translation)
+                        if hits:
+                            metrics.LOOKUPS.inc(source_name, amount=len(hits))
+
+                    # Persistent cache
+                    if remaining and cache:
+                        span_start = trace.now()
+                        cached = await translation_lookup.cache_lookup(
+                            cache,
+                            remaining,
+                            target_lang,
+                            service,
+                            cache_model,
+                            glossary,
+                        )
+                        trace.add(
+                            "cache_lookup",
+                            "lookup",
+                            span_start,
+                            trace.now(),
+                            values=len(remaining),
+                            hits=len(cached),
+                        )
+
+                        for value, translation in cached.items():
+                            resolve(value, translation)
+                        remaining = [
+                            value for value in remaining if value not in cached
+                        ]
+                        stats["cache_hits"] += len(cached)
+                        metrics.LOOKUPS.inc("cache", amount=len(cached))
+                        stats["cache_misses"] += len(remaining)
+                        task_manager.update_task(
+                            task_id,
+                            {
+                                "cache_hits": stats["cache_hits"],
+                                "cache_misses": stats["cache_misses"],
+                            },
+                        )
+
+                    # Placeholder and glossary extraction, in chunks across the CPU pool
+                    span_start = trace.now()
+                    prepared = await source.prepare(
+                        type(translator), remaining, glossary
+                    )
+                    trace.add(
+                        "prepare",
+                        "lookup",
+                        span_start,
+                        trace.now(),
+                        values=len(remaining),
+                    )
+                    prepared = list(zip(remaining, prepared))
+                    metrics.LOOKUPS.inc("provider", amount=len(prepared))
+                    if schedule != SCHEDULE_FIFO:
+                        prepared.sort(
+                            key=lambda pair: len(pair[1][0]),
+                            reverse=schedule == SCHEDULE_LONGEST_FIRST,
+                        )
+
+                    for value, (cleaned, var_ext, gls_ext) in prepared:
+                        provider_values.add(value)
+                        if cleaned in preserved_groups:
+                            # Already waiting in a batch of this job. Checked first: in a
+                            # collection another mod may fill the shared table meanwhile
+                            preserved_groups[cleaned].append((value, var_ext, gls_ext))
+                        elif cleaned in translated_cleaned:
+                            # Same preserved form was already translated
+                            preserved_groups[cleaned] = [(value, var_ext, gls_ext)]
+                            finalize_group(cleaned, translated_cleaned[cleaned])
+                        else:
+                            preserved_groups[cleaned] = [(value, var_ext, gls_ext)]
+                            stats["unique_entries"] += 1
+                            for batch in packer.add(cleaned):
+                                await queue_batch(batch)
+
+                    # Don't hold back a partial batch while provider slots are idle
+                    if (
+                        len(packer)
+                        and translate_queue.empty()
+                        and controller.in_flight < controller.limit
+                    ):
+                        await queue_batch(packer.flush())
+
+                if len(packer):
+                    await queue_batch(packer.flush())
+                await queue_batch(None)
+
+            async def translate_batch(batch_texts):
+                span_start = trace.now()
+                try:
+                    first_ref = value_refs[preserved_groups[batch_texts[0]][0][0]][0]
+                    progress.current_file = first_ref[0]["file"]
+                    started = time.monotonic()
+                    translated = await translator.translate_preserved_batch(
+                        list(enumerate(batch_texts)), target_lang
+                    )
+                    latency_tracker.record(time.monotonic() - started)
+                    metrics.BATCH_LATENCY.observe(time.monotonic() - started, service)
+                    error = None
+                except Exception as e:
+                    print(f"  [Task {task_id}] Batch error: {e}")
+                    translated = {}
+                    error = e
+                finally:
+                    controller.release()
+                    trace.add(
+                        "batch",
+                        "translate",
+                        span_start,
+                        trace.now(),
+                        entries=len(batch_texts),
+                    )
+                await result_queue.put((batch_texts, translated, error))
 
-                            translate_map = {}
-                            total_entries = len(to_translate)
+            async def translate_stage():
+                in_flight = set()
+                try:
+                    while True:
+                        _, _, batch_texts = await translate_queue.get()
+                        if batch_texts is None:
+                            latency_tracker.mark_drained()
+                            break
+                        while True:
+                            # Paused jobs keep their in-flight batches but send nothing new
+                            await scheduler.wait_until_resumed(control_task_id)
+                            await controller.acquire()
+                            if not scheduler.is_paused(control_task_id):
+                                break
+                            controller.release()
+                        worker = asyncio.create_task(translate_batch(batch_texts))
+                        in_flight.add(worker)
+                        worker.add_done_callback(in_flight.discard)
+                    if in_flight:
+                        await asyncio.gather(*in_flight)
+                    latency_tracker.mark_finished()
+                finally:
+                    for worker in in_flight:
+                        worker.cancel()
+                await result_queue.put(None)
+
+            def store_results(results):
+                # Journal first: a resumed job must never re-send these
+                try:
+                    journal.record(results)
+                except Exception as e:
+                    print(f"  [Task {task_id}] Journal write failed: {e}")
+
+                # Write back to the persistent cache
+                if cache and results:
+                    try:
+                        cache.put_many(
+                            results, target_lang, service, cache_model, glossary
+                        )
+                    except Exception as e:
+                        print(f"  [Task {task_id}] Cache write failed: {e}")
+
+            async def validate_stage():
+                while True:
+                    item = await result_queue.get()
+                    if item is None:
+                        break
+                    batch_texts, translated, error = item
+                    span_start = trace.now()
+
+                    finished = []
+                    for i, cleaned in enumerate(batch_texts):
+                        if error is not None:
+                            for value, _, _ in preserved_groups[cleaned]:
+                                for job, idx, key in value_refs[value]:
+                                    # Log specific translation error
+                                    error_log.append(
+                                        f"TRANSLATION_ERROR: File: {job['file']} | Key: {key} | Error: {str(error)}"
+                                    )
+                        result = translated.get(i)
+                        # Only real translations are reused, an echoed source is a
+                        # silent failure (same filter as the journal and cache)
+                        if (
+                            result is not None
+                            and result != cleaned
+                            and translator.is_valid_translation(cleaned, result)
+                        ):
+                            translated_cleaned[cleaned] = result
+                        finished.extend(finalize_group(cleaned, result))
+
+                    # Unchanged text is usually a silent API failure (the services
+                    # return the source on errors): neither journal nor cache it,
+                    # so a resumed job or the next run retries it
+                    results = [
+                        (value, trans) for value, trans in finished if trans != value
+                    ]
+                    print(
+                        f"  [Task {task_id}] Translated {len(batch_texts)} unique strings"
+                    )
+                    await asyncio.to_thread(store_results, results)
+                    trace.add(
+                        "validate",
+                        "validate",
+                        span_start,
+                        trace.now(),
+                        entries=len(batch_texts),
+                        failed=error is not None,
+                    )
 
-                            # Update task with entry counts
-                            task = task_manager.get_task(task_id)
-                            current_total_entries = (
-                                task.get("total_entries", 0) + total_entries
-                            )
-                            task_manager.update_task(
-                                task_id,
-                                {
-                                    "total_entries": current_total_entries,
-                                    "current_entry": 0,
-                                },
+                # Every value is resolved now, so every file has been queued
+                write_queue.put_nowait(None)
+
+            async def write_worker():
+                nonlocal files_processed
+                while True:
+                    job = await write_queue.get()
+                    if job is None:
+                        await write_queue.put(None)
+                        break
+                    # Rebuild and write in a worker process, only the needed fields are sent
+                    started = time.monotonic()
+                    span_start = trace.now()
+                    error, manifest_entries = await cpu_pool.run_cpu(
+                        cpu_pool.write_localisation_file,
+                        {
+                            key: job[key]
+                            for key in (
+                                "entries",
+                                "original_lines",
+                                "translate_map",
+                                "target_path",
                             )
+                        },
+                        paradox_lang,
+                    )
+                    metrics.FILE_WRITE_SECONDS.observe(time.monotonic() - started)
+                    trace.add(
+                        "write", "write", span_start, trace.now(), file=job["file"]
+                    )
+                    # Keep only what the manifest needs
+                    job["manifest_entries"] = manifest_entries
+                    job["original_lines"] = None
+                    job["translate_map"] = None
+                    job["entries"] = None
+
+                    if error:
+                        error_log.append(error)
+                    else:
+                        files_processed += 1
+                    task_manager.update_task(
+                        task_id, {"processed_files": files_processed}
+                    )
 
-                            # Batch translation logic
-                            if service == "ollama":
-                                BATCH_SIZE = 1
-                                CONCURRENT_BATCHES = 1
-                            elif service == "google":
-                                BATCH_SIZE = 20
-                                CONCURRENT_BATCHES = 5
-                            elif service == "gemini":
-                                # Gemini has a strict Rate Limit (10-15 RPM for free tier)
-                                # Strategy: Send FEWER requests with MORE content
-                                BATCH_SIZE = 50
-                                CONCURRENT_BATCHES = 1
-                            else:
-                                BATCH_SIZE = 10
-                                CONCURRENT_BATCHES = 5
-
-                            enriched_items = [
-                                (i, item) for i, item in enumerate(to_translate)
-                            ]
-                            batches = []
-                            for i in range(0, total_entries, BATCH_SIZE):
-                                batches.append(enriched_items[i : i + BATCH_SIZE])
-
-                            async def process_batch(batch_items):
-                                results = []
-                                batch_errors = []
-                                for seq_idx, item in batch_items:
-                                    idx, key, ver, value, suffix = item
-
-                                    # Speed Calculation
-                                    task = task_manager.get_task(task_id)
-                                    current_time = time.time()
-                                    elapsed = current_time - task.get(
-                                        "start_time", current_time
-                                    )
-                                    avg_speed = 0
-                                    if elapsed > 0:
-                                        avg_speed = round(
-                                            task.get("entries_translated", 0) / elapsed,
-                                            2,
-                                        )
-
-                                    task_manager.update_task(
-                                        task_id, {"avg_speed": avg_speed}
-                                    )
+            async def write_stage():
+                await asyncio.gather(
+                    *[write_worker() for _ in range(max(1, cpu_pool.worker_count()))]
+                )
 
-                                    # 1. Check Vanilla First
-                                    if vanilla_db:
-                                        vanilla_trans = vanilla_db.get_translation(
-                                            value
-                                        )
-                                        if vanilla_trans:
-                                            # Update progress
-                                            task = task_manager.get_task(task_id)
-                                            new_translated = (
-                                                task.get("entries_translated", 0) + 1
-                                            )
-                                            new_current = (
-                                                task.get("current_entry", 0) + 1
-                                            )
-
-                                            task_manager.update_task(
-                                                task_id,
-                                                {
-                                                    "entries_translated": new_translated,
-                                                    "current_entry": new_current,
-                                                },
-                                            )
-
-                                            print(
-                                                f"  [Task {task_id}] [Vanilla Match] {key}"
-                                            )
-                                            results.append((idx, vanilla_trans))
-                                            continue
-
-                                    # 2. Check & Translate with Glossary
-                                    try:
-                                        # BaseTranslator.translate_with_preservation now handles glossary replacement if needed
-                                        trans_val = await translator.translate_with_preservation(
-                                            value, target_lang, glossary=glossary
-                                        )
-
-                                        task = task_manager.get_task(task_id)
-                                        new_translated = (
-                                            task.get("entries_translated", 0) + 1
-                                        )
-                                        new_current = task.get("current_entry", 0) + 1
-
-                                        task_manager.update_task(
-                                            task_id,
-                                            {
-                                                "entries_translated": new_translated,
-                                                "current_entry": new_current,
-                                            },
-                                        )
-
-                                        print(f"  [Task {task_id}] Translated: {key}")
-                                        results.append((idx, trans_val))
-                                    except Exception as e:
-                                        # Even on error, count as processed
-                                        task = task_manager.get_task(task_id)
-                                        new_translated = (
-                                            task.get("entries_translated", 0) + 1
-                                        )
-                                        new_current = task.get("current_entry", 0) + 1
-
-                                        task_manager.update_task(
-                                            task_id,
-                                            {
-                                                "entries_translated": new_translated,
-                                                "current_entry": new_current,
-                                            },
-                                        )
-
-                                        print(f"  [Task {task_id}] Error {key}: {e}")
-                                        # Log specific translation error
-                                        error_entry = f"TRANSLATION_ERROR: File: {file} | Key: {key} | Error: {str(e)}"
-                                        results.append(
-                                            (idx, value)
-                                        )  # Use original value
-                                        batch_errors.append(error_entry)
-
-                                return results, batch_errors
-
-                            semaphore = asyncio.Semaphore(CONCURRENT_BATCHES)
-
-                            async def sem_batch(batch_items):
-                                async with semaphore:
-                                    return await process_batch(batch_items)
-
-                            batch_results_raw = await asyncio.gather(
-                                *[sem_batch(b) for b in batches], return_exceptions=True
-                            )
+            await self._run_pipeline(
+                [
+                    discover_stage(),
+                    parse_stage(),
+                    lookup_stage(),
+                    translate_stage(),
+                    validate_stage(),
+                    write_stage(),
+                ]
+            )
 
-                            batch_results = []
-                            for res in batch_results_raw:
-                                if isinstance(res, Exception):
-                                    print(f"Batch execution failed: {res}")
-                                    error_log.append(
-                                        f"BATCH_EXECUTION_ERROR: {file} - {str(res)}"
-                                    )
-                                else:
-                                    data, errors = res
-                                    batch_results.append(data)
-                                    if errors:
-                                        error_log.extend(errors)
-
-                            for batch_res in batch_results:
-                                for idx, val in batch_res:
-                                    translate_map[idx] = val
-
-                            # Rebuild file
-                            for idx, line in enumerate(original_lines):
-                                if idx == 0:
-                                    continue
-                                if idx in translate_map:
-                                    match = self.yml_manager.entry_pattern.match(line)
-                                    if match:
-                                        indent = line[: line.find(match.group(1))]
-                                        key = match.group(1)
-                                        ver = match.group(2) if match.group(2) else ":0"
-                                        suffix = (
-                                            match.group(4) if match.group(4) else ""
-                                        )
-
-                                        # Fix: Check if value is None
-                                        raw_val = translate_map.get(idx)
-                                        if raw_val is None:
-                                            raw_val = ""
-
-                                        val = raw_val.replace('"', '\\"')
-                                        final_lines.append(
-                                            f'{indent}{key}{ver} "{val}"{suffix}\n'
-                                        )
-                                        val = translate_map[idx].replace('"', '\\"')
-                                        final_lines.append(
-                                            f'{indent}{key}{ver} "{val}"{suffix}\n'
-                                        )
-                                    else:
-                                        final_lines.append(line)
-                                else:
-                                    final_lines.append(line)
-
-                            try:
-                                self.yml_manager.write_file(
-                                    target_file_path, final_lines
-                                )
-                                files_processed += 1
-                            except Exception as e:
-                                print(f"Error writing file {target_file_path}: {e}")
-                                error_log.append(
-                                    f"FILE_WRITE_ERROR: {target_file_path} - {str(e)}"
-                                )
+            # Safety net: never leave a file unwritten
+            if value_refs:
+                print(f"  [Task {task_id}] {len(value_refs)} values left unresolved")
+                # Drop the end marker the write workers left behind
+                while not write_queue.empty():
+                    write_queue.get_nowait()
+                for value in list(value_refs):
+                    resolve(value, value)
+                write_queue.put_nowait(None)
+                await write_stage()
+
+            total_entries = progress.total
+            duplicate_entries = stats["entries_to_translate"] - stats["unique_entries"]
+            summary = {
+                "total_entries": total_entries,
+                "cache_hits": stats["cache_hits"],
+                "cache_misses": stats["cache_misses"],
+                "unique_entries": stats["unique_entries"],
+                "duplicate_entries": duplicate_entries,
+                # Share of provider work saved by deduplication (0.0 - 1.0)
+                "dedup_ratio": (
+                    round(duplicate_entries / stats["entries_to_translate"], 3)
+                    if stats["entries_to_translate"] > 0
+                    else 0
+                ),
+            }
+            if previous_manifest:
+                print(
+                    f"  [Task {task_id}] Update mode: {stats['carried_forward']} entries unchanged, {total_entries - stats['carried_forward']} new or changed"
+                )
+                summary["carried_forward"] = stats["carried_forward"]
+                summary["changed_entries"] = total_entries - stats["carried_forward"]
+            task_manager.update_task(task_id, summary)
+            print(
+                f"  [Task {task_id}] {stats['entries_to_translate']} entries -> {stats['unique_entries']} unique strings translated"
+            )
 
-                            task_manager.update_task(
-                                task_id,
-                                {
-                                    "processed_files": files_processed,
-                                    "percent": int(
-                                        (files_processed / total_files) * 100
-                                    )
-                                    if total_files > 0
-                                    else 0,
-                                },
-                            )
+            # 5f. Manifest of key -> source hash, used by the next update run
+            manifest_files = {}
+            for job in parsed_files:
+                manifest_files[job["rel_source"]] = {
+                    "target": job["rel_target"],
+                    "entries": job["manifest_entries"],
+                }
+            if previous_manifest:
+                # A file that failed to parse this time keeps its previous translation
+                for rel_source, file_info in previous_manifest.get("files", {}).items():
+                    if rel_source not in manifest_files and os.path.exists(
+                        os.path.join(source_loc_path, *rel_source.split("/"))
+                    ):
+                        manifest_files[rel_source] = file_info
+            span_start = trace.now()
+            translation_manifest.write_manifest(
+                target_dir,
+                {
+                    "source_mod_id": mod_id,
+                    "target_lang": target_lang,
+                    "service": service,
+                    "model": cache_model,
+                },
+                manifest_files,
+            )
+            trace.add("manifest", "write", span_start, trace.now())
+
+            # Remove files the source mod no longer has (everything else is in
+            # manifest_files by now)
+            if previous_manifest:
+                for rel_source, file_info in previous_manifest.get("files", {}).items():
+                    if rel_source in manifest_files:
+                        continue
+                    stale_path = os.path.join(
+                        target_dir, *file_info["target"].split("/")
+                    )
+                    try:
+                        if os.path.exists(stale_path):
+                            os.remove(stale_path)
+                            print(f"Removed stale file: {stale_path}")
+                    except Exception as e:
+                        print(f"Failed to remove stale file {stale_path}: {e}")
 
         except Exception as e:
             print(f"Critical Error in generate_translation_mod: {e}")
@@ -599,6 +1007,13 @@ class ModGenerator:
         finally:
             # Disable Keep-Awake regardless of success/fail
             self.set_keep_awake(False)
+            journal.close()
+            metrics.untrack_queues(task_id)
+            if cassette is not None:
+                close_cassette(cassette)
+
+        # Every entry is written, the journal is no longer needed
+        journal.remove()
 
         # Final Verification: Only mark complete if we actually processed files
         # The loop finishes when all files are done.
@@ -642,6 +1057,418 @@ class ModGenerator:
             "zip_name": new_dir_name,
         }
 
+    async def generate_translation_mods(
+        self,
+        source_mod: dict,
+        output_root: str,
+        task_id: str,
+        target_langs: list,
+        shutdown_when_complete: bool = False,
+        **options,
+    ) -> dict:
+        """
+        Translates the mod into several languages in one job.
+        The source is parsed and preprocessed once (SharedSource), then one pipeline per
+        language runs in parallel and writes its own mod folder. Every language is a
+        sub task with its own status and journal (resumable on its own), listed in the
+        "languages" field of this task.
+        options: the other arguments of generate_translation_mod
+        """
+        target_langs = list(dict.fromkeys(target_langs))
+        source = SharedSource(len(target_langs))
+        task_manager.update_task(task_id, {"target_langs": target_langs})
+
+        def job(lang, sub_task_id):
+            return self.generate_translation_mod(
+                source_mod,
+                output_root,
+                sub_task_id,
+                target_lang=lang,
+                shared_source=source,
+                control_task_id=task_id,
+                **options,
+            )
+
+        result = await self._run_sub_tasks(
+            task_id,
+            "languages",
+            target_langs,
+            job,
+            shutdown_when_complete=shutdown_when_complete,
+        )
+        print(
+            f"  [Task {task_id}] {len(target_langs)} languages from {source.parse_calls} parsed files"
+        )
+        return result
+
+    async def generate_collection(
+        self,
+        mods: list,
+        output_root: str,
+        task_id: str,
+        parallel_mods: int = 1,
+        shutdown_when_complete: bool = False,
+        **options,
+    ) -> dict:
+        """
+        Translates several mods (e.g. a workshop collection) as one job.
+        Every mod is a sub task listed in the "mods" field of this task. The mods share
+        one dedup table, so a string translated for one mod is reused by the others
+        (submods and patches repeat most of their parent's text), as well as the
+        persistent cache and the vanilla memory.
+        Parents run before the mods that depend on them.
+        mods: mod dicts from ModScanner
+        parallel_mods: mods translated at the same time, they share the provider limits
+        options: the other arguments of generate_translation_mod
+        """
+        mods = self._order_by_dependencies(mods)
+        by_id = {str(mod["id"]): mod for mod in mods}
+        dedup_table = {}
+        task_manager.update_task(task_id, {"mod_ids": list(by_id)})
+
+        def job(mod_id, sub_task_id):
+            return self.generate_translation_mod(
+                by_id[mod_id],
+                output_root,
+                sub_task_id,
+                dedup_table=dedup_table,
+                control_task_id=task_id,
+                **options,
+            )
+
+        result = await self._run_sub_tasks(
+            task_id,
+            "mods",
+            list(by_id),
+            job,
+            parallel=parallel_mods,
+            shutdown_when_complete=shutdown_when_complete,
+        )
+        print(
+            f"  [Task {task_id}] {len(mods)} mods, {len(dedup_table)} unique strings in the shared dedup table"
+        )
+        return result
+
+    @staticmethod
+    def _order_by_dependencies(mods: list) -> list:
+        """Orders mods so every mod comes after the mods of the list it depends on."""
+        by_name = {mod.get("name"): mod for mod in mods}
+        depth = {}
+
+        def depth_of(mod, seen=()):
+            key = id(mod)
+            if key not in depth:
+                parents = [
+                    by_name[name]
+                    for name in mod.get("dependencies") or []
+                    if name in by_name and id(by_name[name]) not in seen
+                ]
+                depth[key] = 1 + max(
+                    (depth_of(parent, seen + (key,)) for parent in parents), default=-1
+                )
+            return depth[key]
+
+        return sorted(mods, key=depth_of)
+
+    async def _run_sub_tasks(
+        self,
+        task_id: str,
+        field: str,
+        names: list,
+        job,
+        parallel: int = None,
+        shutdown_when_complete: bool = False,
+    ) -> dict:
+        """
+        Runs job(name, sub_task_id) for every name as sub tasks of task_id.
+        The status of task_id aggregates their progress and lists them under field.
+        parallel: sub tasks running at the same time (default: all of them)
+        """
+        sub_tasks = {name: task_manager.create_task() for name in names}
+        slots = asyncio.Semaphore(parallel or len(sub_tasks) or 1)
+
+        def sub_task_states():
+            result = {}
+            for name, sub_task_id in sub_tasks.items():
+                sub_task = task_manager.get_task(sub_task_id) or {}
+                result[name] = {
+                    "task_id": sub_task_id,
+                    "status": sub_task.get("status"),
+                    "percent": sub_task.get("percent", 0),
+                    "entries_translated": sub_task.get("entries_translated", 0),
+                    "total_entries": sub_task.get("total_entries", 0),
+                    "path": sub_task.get("path"),
+                    "error": sub_task.get("error"),
+                }
+            return result
+
+        def total(key):
+            return lambda: sum(state[key] for state in sub_task_states().values())
+
+        task_manager.update_task(
+            task_id,
+            {
+                "status": (
+                    "paused" if get_job_scheduler().is_paused(task_id) else "running"
+                ),
+                "start_time": time.time(),
+            },
+        )
+        # Aggregate progress, computed from the sub tasks when the status is read
+        progress = task_manager.start_counters(
+            task_id, 0, task_manager.get_task(task_id).get("start_time")
+        )
+        progress.probes[field] = sub_task_states
+        progress.probes["entries_translated"] = total("entries_translated")
+        progress.probes["current_entry"] = total("entries_translated")
+        progress.probes["total_entries"] = total("total_entries")
+        progress.probes["percent"] = lambda: min(
+            99, total("percent")() // max(1, len(sub_tasks))
+        )
+
+        async def run(name, sub_task_id):
+            async with slots:
+                return await job(name, sub_task_id)
+
+        try:
+            results = await asyncio.gather(
+                *[run(name, sub_task_id) for name, sub_task_id in sub_tasks.items()]
+            )
+        except asyncio.CancelledError:
+            for sub_task_id in sub_tasks.values():
+                sub_task = task_manager.get_task(sub_task_id)
+                if sub_task["status"] not in task_manager.TERMINAL_STATUSES:
+                    task_manager.update_task(
+                        sub_task_id,
+                        {"status": "cancelled", "error": "Cancelled by user"},
+                    )
+            raise
+
+        results = dict(zip(sub_tasks, results))
+        failed = [
+            name
+            for name, result in results.items()
+            if result.get("status") != "success"
+        ]
+        final = {
+            "percent": 100,
+            field: sub_task_states(),
+            "paths": {
+                name: result.get("path")
+                for name, result in results.items()
+                if result.get("status") == "success"
+            },
+        }
+        if failed:
+            final["status"] = "error"
+            final["error"] = f"Translation failed for: {', '.join(failed)}"
+        else:
+            final["status"] = "completed"
+        task_manager.update_task(task_id, final)
+
+        if shutdown_when_complete:
+            print("Translation complete. Shutting down system in 60 seconds...")
+            if os.name == "nt":
+                os.system("shutdown /s /t 60")
+            else:
+                os.system("shutdown -h now")
+
+        return {"status": "error" if failed else "success", field: results}
+
+    async def resume_translation_mod(self, task_id: str) -> dict:
+        """
+        Restarts an interrupted task from its journal.
+        Entries that were already journaled are not sent to the translator again.
+        """
+        state = load_journal(task_id)
+        if not state:
+            raise ValueError(f"No journal found for task {task_id}")
+
+        return await self.generate_translation_mod(
+            **state["params"], task_id=task_id, resume_state=state
+        )
+
+    @staticmethod
+    def _create_translator(service: str, service_config: dict, glossary: dict = None):
+        """Creates the translator service selected in the request."""
+        if service == "google":
+            translator = GoogleTranslatorService()
+        elif service == "ollama":
+            translator = OllamaTranslatorService(
+                model=service_config.get("ollama_model", "gemma2"),
+                base_url=service_config.get("ollama_url", "http://localhost:11434"),
+                glossary=glossary,
+            )
+        elif service == "openai":
+            translator = OpenAITranslatorService(
+                model=service_config.get("openai_model", "gpt-4o-mini"),
+                api_key=service_config.get("openai_key", ""),
+                glossary=glossary,
+                base_url=service_config.get("openai_url"),
+            )
+        elif service == "claude":
+            translator = ClaudeTranslatorService(
+                model=service_config.get("claude_model", "claude-3-5-sonnet-20241022"),
+                api_key=service_config.get("claude_key", ""),
+                glossary=glossary,
+                base_url=service_config.get("claude_url"),
+            )
+        elif service == "gemini":
+            translator = GeminiTranslatorService(
+                model=service_config.get("gemini_model", "gemini-1.5-flash"),
+                api_key=service_config.get("gemini_key", ""),
+                glossary=glossary,
+                base_url=service_config.get("gemini_url"),
+            )
+        else:
+            translator = GoogleTranslatorService()
+        return translator
+
+    @staticmethod
+    def _rate_limit_key(service: str, service_config: dict) -> str:
+        """The credential a provider quota belongs to (API key, or the server URL for Ollama)."""
+        if service == "ollama":
+            return service_config.get("ollama_url", "http://localhost:11434")
+        return service_config.get(f"{service}_key", "")
+
+    @staticmethod
+    async def _run_pipeline(stages: list):
+        """
+        Runs pipeline stage coroutines together.
+        The first stage to fail cancels the others so no stage waits forever on a queue.
+        """
+        tasks = [asyncio.create_task(stage) for stage in stages]
+        try:
+            done, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_EXCEPTION
+            )
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _iter_localisation_files(
+        self,
+        source_loc_path: str,
+        target_dir: str,
+        paradox_lang: str,
+        create_dirs: bool = True,
+    ):
+        """
+        Finds every *l_english.yml file in the source mod and works out its output path.
+        Yields { file, source_path, target_path, rel_source, rel_target } dicts.
+        create_dirs: If False, output folders are not created (dry run).
+        """
+        if not os.path.exists(source_loc_path):
+            return
+
+        print(f"DEBUG: Found source localisation at: {source_loc_path}")
+        for root, dirs, files in os.walk(source_loc_path):
+            for file in files:
+                if not file.endswith("l_english.yml"):
+                    continue
+
+                # Handle subdirectory structure
+                rel_path = os.path.relpath(root, source_loc_path)
+                if rel_path == ".":
+                    target_subdir = os.path.join(
+                        target_dir, "localisation", paradox_lang
+                    )
+                else:
+                    rel_path_parts = rel_path.split(os.sep)
+                    new_rel_path_parts = []
+                    for part in rel_path_parts:
+                        if part.lower() == "english":
+                            new_rel_path_parts.append(paradox_lang)
+                        else:
+                            new_rel_path_parts.append(part)
+                    rel_path_target = os.path.join(*new_rel_path_parts)
+                    target_subdir = os.path.join(
+                        target_dir, "localisation", rel_path_target
+                    )
+
+                if create_dirs:
+                    os.makedirs(target_subdir, exist_ok=True)
+
+                new_filename = file.replace("l_english.yml", f"l_{paradox_lang}.yml")
+                source_path = os.path.join(root, file)
+                target_path = os.path.join(target_subdir, new_filename)
+
+                # Relative paths with "/" for the manifest
+                rel_source = os.path.relpath(source_path, source_loc_path)
+                rel_target = os.path.relpath(target_path, target_dir)
+
+                yield {
+                    "file": file,
+                    "source_path": source_path,
+                    "target_path": target_path,
+                    "rel_source": rel_source.replace(os.sep, "/"),
+                    "rel_target": rel_target.replace(os.sep, "/"),
+                }
+
+    def _write_localisation_file(self, job: dict, paradox_lang: str) -> tuple:
+        """
+        Rebuilds and writes one finished file.
+        job needs entries, original_lines, translate_map and target_path.
+        Runs in a CPU pool worker. Returns (error log line or None, { key: source_hash }).
+        Keys that kept their English value (a failed translation) are left out of the
+        manifest, so the next update run translates them again.
+        """
+        translate_map = job["translate_map"]
+        final_lines = self._rebuild_lines(
+            job["original_lines"], translate_map, paradox_lang
+        )
+        manifest_entries = {
+            key: translation_manifest.source_hash(value)
+            for idx, key, ver, value, suffix in job["entries"]
+            if not value.strip() or translate_map.get(idx, value) != value
+        }
+
+        try:
+            self.yml_manager.write_file(job["target_path"], final_lines)
+            print(f"  Wrote {job['target_path']}")
+            return None, manifest_entries
+        except Exception as e:
+            print(f"Error writing file {job['target_path']}: {e}")
+            # Nothing of this file is on disk to carry forward
+            return f"FILE_WRITE_ERROR: {job['target_path']} - {str(e)}", {}
+
+    def _rebuild_lines(
+        self, original_lines: list, translate_map: dict, paradox_lang: str
+    ) -> list:
+        """
+        Rebuilds a localisation file from the source lines and { line_idx: translation }.
+        """
+        final_lines = [f"l_{paradox_lang}:\n"]
+
+        for idx, line in enumerate(original_lines):
+            if idx == 0:
+                continue
+            if idx in translate_map:
+                match = self.yml_manager.entry_pattern.match(line)
+                if match:
+                    indent = line[: line.find(match.group(1))]
+                    key = match.group(1)
+                    ver = match.group(2) if match.group(2) else ":0"
+                    suffix = match.group(4) if match.group(4) else ""
+
+                    # Fix: Check if value is None
+                    raw_val = translate_map.get(idx)
+                    if raw_val is None:
+                        raw_val = ""
+
+                    val = raw_val.replace('"', '\\"')
+                    final_lines.append(f'{indent}{key}{ver} "{val}"{suffix}\n')
+                else:
+                    final_lines.append(line)
+            else:
+                final_lines.append(line)
+
+        return final_lines
+
     def create_zip(self, folder_path: str, zip_name: str) -> str:
         """
         Zips the folder and returns the absolute path to the zip file.
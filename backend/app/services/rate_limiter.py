@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import time
+
+# Default budgets per provider: (requests per minute, tokens per minute).
+# None means unlimited; the adaptive concurrency controller still applies.
+# Gemini defaults to the free tier (15 RPM). Override with TranslateRequest.settings.rate_limits.
+DEFAULT_RATE_LIMITS = {
+    "gemini": (15, 1_000_000),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer: ~4 ASCII characters per token,
+    ~1 token per non-ASCII character (Korean, Chinese, Japanese...).
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at rate_per_minute.
+    Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = rate_per_minute  # allow one minute worth of burst
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.rate_per_minute / 60.0,
+        )
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """Waits until `amount` tokens are available. Returns the time waited."""
+        # A request larger than the whole bucket waits for a full bucket
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._get_lock():
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) * 60.0 / self.rate_per_minute
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def drain(self):
+        """Empties the bucket (used after the provider told us to slow down)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0)
+
+
+class ProviderRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget for one provider + API key.
+    Shared by every task using that key, so parallel jobs split one quota.
+    """
+
+    def __init__(self, name: str, rpm: float = None, tpm: float = None):
+        self.name = name
+        self.request_bucket = None
+        self.token_bucket = None
+        self.paused_until = 0.0
+        self.total_wait = 0.0
+        self.requests = 0
+        self.configure(rpm, tpm)
+
+    def configure(self, rpm: float = None, tpm: float = None):
+        """(Re)sets the budgets. Unchanged budgets keep their current bucket state."""
+        if not rpm:
+            self.request_bucket = None
+        elif not self.request_bucket or self.request_bucket.rate_per_minute != rpm:
+            self.request_bucket = TokenBucket(rpm)
+
+        if not tpm:
+            self.token_bucket = None
+        elif not self.token_bucket or self.token_bucket.rate_per_minute != tpm:
+            self.token_bucket = TokenBucket(tpm)
+
+    async def acquire(self, tokens: int = 0):
+        """Call before every provider request."""
+        start = time.monotonic()
+
+        pause = self.paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+        if self.request_bucket:
+            await self.request_bucket.acquire(1)
+        if self.token_bucket and tokens:
+            await self.token_bucket.acquire(tokens)
+
+        self.requests += 1
+        self.total_wait += time.monotonic() - start
+
+    def penalize(self, retry_after: float = None):
+        """
+        The provider still answered 429: pause everyone sharing this key
+        and empty the request bucket so we restart slowly.
+        """
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        if self.request_bucket:
+            self.request_bucket.drain()
+
+    def state(self) -> dict:
+        return {
+            "name": self.name,
+            "rpm": self.request_bucket.rate_per_minute if self.request_bucket else None,
+            "tpm": self.token_bucket.rate_per_minute if self.token_bucket else None,
+            "requests": self.requests,
+            "total_wait": round(self.total_wait, 2),
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 2),
+        }
+
+
+# Process-wide registry: { "provider:key_hash": ProviderRateLimiter }
+_limiters = {}
+
+
+def get_rate_limiter(
+    provider: str, api_key: str = "", rpm: float = None, tpm: float = None
+) -> ProviderRateLimiter:
+    """
+    Returns the shared limiter for provider + API key.
+    rpm/tpm override DEFAULT_RATE_LIMITS; the last configuration wins.
+    """
+    key_hash = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+    registry_key = f"{provider}:{key_hash}"
+
+    default_rpm, default_tpm = DEFAULT_RATE_LIMITS.get(provider, (None, None))
+    rpm = rpm if rpm is not None else default_rpm
+    tpm = tpm if tpm is not None else default_tpm
+
+    limiter = _limiters.get(registry_key)
+    if limiter is None:
+        limiter = ProviderRateLimiter(registry_key, rpm, tpm)
+        _limiters[registry_key] = limiter
+    else:
+        limiter.configure(rpm, tpm)
+    return limiter
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from . import cpu_pool, metrics
+from .translation_cache import glossary_hash
+
+
+class SharedSource:
+    """
+    Parsed files and prepared texts of one source mod, shared by the pipelines of a
+    multi-language run so every file is parsed and every string preprocessed once.
+
+    consumers: number of pipelines reading the mod. A parsed file is dropped as soon
+    as the last of them took it, so memory stays bounded like a single run.
+    Prepared texts are only kept when there is more than one consumer, per translator
+    class and glossary.
+    """
+
+    def __init__(self, consumers: int = 1):
+        self.consumers = max(1, consumers)
+        self._parsed = {}  # source_path -> [future, consumers still to come]
+        # (translator class, glossary hash, text) -> (future of its chunk, index in it)
+        self._prepared = {}
+        self.parse_calls = 0
+        self.prepare_calls = 0
+
+    async def parse(self, source_path: str):
+        """Returns (entries, original_lines) like cpu_pool.parse_localisation_file."""
+        entry = self._parsed.get(source_path)
+        if entry is None:
+            self.parse_calls += 1
+            future = asyncio.ensure_future(self._parse(source_path))
+            entry = self._parsed[source_path] = [future, self.consumers]
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._parsed[source_path]
+        # Shielded: a cancelled pipeline must not cancel the parse for the others
+        return await asyncio.shield(entry[0])
+
+    @staticmethod
+    async def _parse(source_path: str):
+        started = time.monotonic()
+        result = await cpu_pool.run_cpu(
+            cpu_pool.parse_localisation_file, source_path, "l_english"
+        )
+        metrics.FILE_PARSE_SECONDS.observe(time.monotonic() - started)
+        return result
+
+    async def prepare(self, translator_cls, texts: list, glossary: dict = None) -> list:
+        """Returns translator_cls.prepare_text of every text, computed on the CPU pool."""
+        prepared = self._prepared if self.consumers > 1 else {}
+        context = (translator_cls, glossary_hash(glossary))
+        keys = [(*context, text) for text in texts]
+        missing = [key for key in dict.fromkeys(keys) if key not in prepared]
+        for i in range(0, len(missing), cpu_pool.PREPARE_CHUNK_SIZE):
+            chunk = missing[i : i + cpu_pool.PREPARE_CHUNK_SIZE]
+            self.prepare_calls += 1
+            future = asyncio.ensure_future(
+                cpu_pool.run_cpu(
+                    cpu_pool.prepare_texts,
+                    translator_cls,
+                    [text for _, _, text in chunk],
+                    glossary,
+                )
+            )
+            for index, key in enumerate(chunk):
+                prepared[key] = (future, index)
+
+        futures = {id(future): future for future, _ in map(prepared.get, keys)}
+        await asyncio.shield(asyncio.gather(*futures.values()))
+        return [prepared[key][0].result()[prepared[key][1]] for key in keys]
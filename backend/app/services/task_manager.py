@@ -2,17 +2,61 @@ import uuid
 import time
 from typing import Dict, Any
 
+from . import metrics
+
 # Global task storage
 # Structure: { "task_id": { ...status... } }
 _tasks: Dict[str, Dict[str, Any]] = {}
 
+# Live counters of running tasks, merged into the status on read
+_counters: Dict[str, "ProgressCounters"] = {}
+
+TERMINAL_STATUSES = ("completed", "error", "cancelled")
+
+
+class ProgressCounters:
+    """
+    Progress of a running translation.
+    The hot loop only bumps these attributes; percent, speed and the
+    provider states are computed when somebody reads the status.
+    """
+
+    __slots__ = ("done", "total", "current_file", "start_time", "probes")
+
+    def __init__(self, total: int = 0, start_time: float = None):
+        self.done = 0
+        self.total = total
+        self.current_file = None
+        self.start_time = start_time or time.time()
+        # { status_field: callable returning its current value }
+        self.probes = {}
+
+    def fields(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.start_time
+        fields = {
+            "entries_translated": self.done,
+            "current_entry": self.done,
+            "total_entries": self.total,
+            "avg_speed": round(self.done / elapsed, 2) if elapsed > 0 else 0,
+            # Entry based, files finish in parallel
+            "percent": min(99, int(self.done / self.total * 100)) if self.total else 0,
+        }
+        if self.current_file:
+            fields["current_file"] = self.current_file
+        for name, probe in self.probes.items():
+            try:
+                fields[name] = probe()
+            except Exception as e:
+                print(f"Progress probe {name} failed: {e}")
+        return fields
 
-def create_task() -> str:
-    """Creates a new task and returns its ID."""
-    task_id = str(uuid.uuid4())
+
+def create_task(task_id: str = None) -> str:
+    """Creates a new task and returns its ID. Pass task_id to re-register a resumed task."""
+    task_id = task_id or str(uuid.uuid4())
     _tasks[task_id] = {
         "id": task_id,
-        "status": "pending",  # pending, running, completed, error
+        "status": "pending",  # queued, pending, running, paused, completed, error, cancelled
         "created_at": time.time(),
         "percent": 0,
         "current_file": "",
@@ -22,6 +66,8 @@ def create_task() -> str:
         "total_entries": 0,
         "entries_translated": 0,
         "avg_speed": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
         "start_time": 0,
         "error": None,
         "path": None,
@@ -31,14 +77,48 @@ def create_task() -> str:
 
 
 def get_task(task_id: str) -> Dict[str, Any]:
-    """Returns task status or None if not found."""
-    return _tasks.get(task_id)
+    """Returns a snapshot of the task status or None if not found."""
+    task = _tasks.get(task_id)
+    if task is None:
+        return None
+    counters = _counters.get(task_id)
+    if counters is None:
+        return dict(task)
+    return {**task, **counters.fields()}
 
 
 def update_task(task_id: str, updates: Dict[str, Any]):
-    """Updates task fields."""
-    if task_id in _tasks:
-        _tasks[task_id].update(updates)
+    """Updates task fields. A terminal status folds the live counters into the task."""
+    if task_id not in _tasks:
+        return
+    if updates.get("status") in TERMINAL_STATUSES:
+        counters = _counters.pop(task_id, None)
+        if counters is not None:
+            _tasks[task_id].update(counters.fields())
+    _tasks[task_id].update(updates)
+
+
+def start_counters(task_id: str, total: int, start_time: float = None):
+    """Registers live counters for a running task and returns them."""
+    counters = ProgressCounters(total, start_time)
+    _counters[task_id] = counters
+    return counters
+
+
+def _entries_per_second() -> float:
+    now = time.time()
+    return sum(
+        counters.done / (now - counters.start_time)
+        for counters in list(_counters.values())
+        if now > counters.start_time
+    )
+
+
+metrics.Gauge(
+    "translation_entries_per_second",
+    "Average entries per second of the running tasks, summed.",
+    _entries_per_second,
+)
 
 
 def get_all_tasks():
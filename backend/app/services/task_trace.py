@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+
+# Spans kept per task, later ones are counted but dropped
+MAX_SPANS = 100_000
+# Finished traces kept in memory (oldest are dropped first)
+MAX_TRACES = 50
+
+_traces = OrderedDict()
+
+
+class TaskTrace:
+    """
+    Timing spans of one task: discovery, vanilla load, per-file parse and write,
+    every provider call, validation... Times are seconds since the trace started.
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.spans = []  # (name, category, start, duration, args)
+        self.dropped = 0
+
+    def now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def add(self, name: str, category: str, start: float, end: float, **args):
+        """Records a span. start/end as returned by now()."""
+        if len(self.spans) >= MAX_SPANS:
+            self.dropped += 1
+            return
+        self.spans.append((name, category, start, end - start, args))
+
+    def summary(self) -> dict:
+        """Total seconds and count per category (spans of a category may overlap)."""
+        totals = {}
+        for name, category, start, duration, args in self.spans:
+            total = totals.setdefault(category, {"count": 0, "seconds": 0.0})
+            total["count"] += 1
+            total["seconds"] += duration
+        for total in totals.values():
+            total["seconds"] = round(total["seconds"], 3)
+        return totals
+
+    def to_json(self) -> dict:
+        return {
+            "task_id": self.task_id,
+            "started_at": self.started_at,
+            "dropped_spans": self.dropped,
+            "summary": self.summary(),
+            "spans": [
+                {
+                    "name": name,
+                    "category": category,
+                    "start": round(start, 6),
+                    "duration": round(duration, 6),
+                    "args": args,
+                }
+                for name, category, start, duration, args in self.spans
+            ],
+        }
+
+    def to_chrome_events(self, pid: int = 1, offset: float = 0.0) -> list:
+        """
+        Complete ("X") events for chrome://tracing / Perfetto. Every category gets
+        its own rows, overlapping spans (parallel provider calls) go to separate rows.
+        offset: seconds added to every timestamp, to line up several traces.
+        """
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"task {self.task_id}"},
+            }
+        ]
+        rows = {}  # category -> [[tid, end of its last span], ...]
+        next_tid = 1
+        for name, category, start, duration, args in sorted(
+            self.spans, key=lambda span: span[2]
+        ):
+            category_rows = rows.setdefault(category, [])
+            row = next((row for row in category_rows if row[1] <= start), None)
+            if row is None:
+                row = [next_tid, 0.0]
+                next_tid += 1
+                category_rows.append(row)
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": row[0],
+                        "args": {"name": f"{category} {len(category_rows)}"},
+                    }
+                )
+            row[1] = start + duration
+            events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": round((start + offset) * 1e6, 1),
+                    "dur": round(duration * 1e6, 1),
+                    "pid": pid,
+                    "tid": row[0],
+                    "args": args,
+                }
+            )
+        return events
+
+
+def start_trace(task_id: str) -> TaskTrace:
+    """Starts a new trace for the task (replacing an older one) and returns it."""
+    trace = TaskTrace(task_id)
+    _traces.pop(task_id, None)
+    _traces[task_id] = trace
+    while len(_traces) > MAX_TRACES:
+        _traces.popitem(last=False)
+    return trace
+
+
+def get_trace(task_id: str) -> TaskTrace:
+    return _traces.get(task_id)
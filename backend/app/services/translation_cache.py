@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# Stored next to paradox_manager.db (see database.py), but in its own file so the
+# settings database stays small and can be deleted/reset independently.
+CACHE_DB_PATH = "./translation_cache.db"
+DEFAULT_MAX_ENTRIES = 500_000
+
+
+def normalize_source(text: str) -> str:
+    """
+    Normalizes a source value before hashing (NFC only). Outer whitespace is part of
+    the key: " and " and "and" have different translations.
+    """
+    if text is None:
+        return ""
+    return unicodedata.normalize("NFC", text)
+
+
+def glossary_hash(glossary: dict) -> str:
+    """Stable hash of a glossary dict. Empty/None glossaries share one hash."""
+    if not glossary:
+        return ""
+    raw = json.dumps(glossary, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class TranslationCache:
+    """
+    Disk-backed translation cache (SQLite).
+    Key: normalized source text + target_lang + service + model + glossary hash.
+    Least recently used entries are evicted once max_entries is exceeded.
+    """
+
+    # Eviction is checked every N writes instead of on every put
+    EVICT_CHECK_INTERVAL = 500
+
+    def __init__(self, db_path: str = CACHE_DB_PATH, max_entries: int = None):
+        self.db_path = db_path
+        self.max_entries = max_entries or int(
+            os.environ.get("TRANSLATION_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+        )
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translation_cache (
+                cache_key TEXT PRIMARY KEY,
+                service TEXT NOT NULL,
+                model TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                glossary_hash TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_used ON translation_cache (last_used)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_service_model ON translation_cache (service, model)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        source: str, target_lang: str, service: str, model: str, gls_hash: str
+    ) -> str:
+        raw = "\x1f".join(
+            [normalize_source(source), target_lang, service, model or "", gls_hash]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self,
+        sources: list,
+        target_lang: str,
+        service: str,
+        model: str = "",
+        glossary: dict = None,
+        touch: bool = True,
+    ) -> dict:
+        """
+        Looks up several source values at once.
+        Returns { source: translation } for the hits only.
+        touch: If False, hits don't count as use for LRU eviction (estimates).
+        """
+        gls_hash = glossary_hash(glossary)
+        keys = {}  # cache key -> sources with that key (NFC variants)
+        for source in sources:
+            keys.setdefault(
+                self.make_key(source, target_lang, service, model, gls_hash), []
+            ).append(source)
+
+        if not keys:
+            return {}
+
+        found = {}
+        key_list = list(keys.keys())
+        now = time.time()
+
+        with self._lock:
+            # SQLite limits the number of bound parameters, query in chunks
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT cache_key, translation FROM translation_cache WHERE cache_key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for cache_key, translation in rows:
+                    for source in keys[cache_key]:
+                        found[source] = translation
+
+                if rows and touch:
+                    # Touch for LRU
+                    self._conn.executemany(
+                        "UPDATE translation_cache SET last_used = ? WHERE cache_key = ?",
+                        [(now, row[0]) for row in rows],
+                    )
+            self._conn.commit()
+
+        return found
+
+    def put_many(
+        self,
+        pairs: list,
+        target_lang: str,
+        service: str,
+        model: str = "",
+        glossary: dict = None,
+    ):
+        """
+        Stores translations.
+        pairs: list of (source, translation)
+        """
+        if not pairs:
+            return
+
+        gls_hash = glossary_hash(glossary)
+        now = time.time()
+        rows = [
+            (
+                self.make_key(source, target_lang, service, model, gls_hash),
+                service,
+                model or "",
+                target_lang,
+                gls_hash,
+                source,
+                translation,
+                now,
+                now,
+            )
+            for source, translation in pairs
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+            self._writes_since_evict += len(rows)
+            if self._writes_since_evict >= self.EVICT_CHECK_INTERVAL:
+                self._writes_since_evict = 0
+                self._evict()
+
+    def _evict(self):
+        """Deletes the least recently used entries above max_entries. Caller holds the lock."""
+        row = self._conn.execute("SELECT COUNT(*) FROM translation_cache").fetchone()
+        count = row[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            """
+            DELETE FROM translation_cache WHERE cache_key IN (
+                SELECT cache_key FROM translation_cache ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (overflow,),
+        )
+        self._conn.commit()
+        print(f"Translation cache: evicted {overflow} least recently used entries")
+
+    def purge(self, service: str = None, model: str = None) -> int:
+        """
+        Deletes cached entries. Filters are optional; no filter clears the whole cache.
+        Returns the number of deleted rows.
+        """
+        query = "DELETE FROM translation_cache"
+        conditions = []
+        params = []
+        if service:
+            conditions.append("service = ?")
+            params.append(service)
+        if model:
+            conditions.append("model = ?")
+            params.append(model)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        """Returns entry counts per service/model."""
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM translation_cache"
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT service, model, COUNT(*) FROM translation_cache GROUP BY service, model"
+            ).fetchall()
+
+        return {
+            "total_entries": total,
+            "max_entries": self.max_entries,
+            "by_service": [
+                {"service": service, "model": model, "entries": count}
+                for service, model, count in rows
+            ],
+        }
+
+
+_cache = None
+
+
+def get_translation_cache() -> TranslationCache:
+    """Returns the process-wide cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = TranslationCache()
+    return _cache
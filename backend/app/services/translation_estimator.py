@@ -0,0 +1,270 @@
+import asyncio
+import os
+import time
+
+from . import cpu_pool, translation_lookup, translation_manifest
+from .concurrency import PROVIDER_LIMITS, DEFAULT_LIMITS, peek_concurrency_controller
+from .batch_packer import (
+    BatchPacker,
+    BATCH_SIZES,
+    DEFAULT_BATCH_SIZE,
+    estimate_output_tokens,
+    get_token_budget,
+)
+from .glossary_matcher import get_glossary_matcher
+from .mod_generator import ModGenerator, LANG_FOLDER_MAP
+from .shared_source import SharedSource
+from .rate_limiter import DEFAULT_RATE_LIMITS, estimate_tokens
+from .translation_cache import get_translation_cache
+from .vanilla_manager import get_vanilla_manager
+
+# Providers listed in every estimate
+ESTIMATE_SERVICES = ("google", "openai", "claude", "gemini", "ollama")
+LLM_SERVICES = ("openai", "claude", "gemini", "ollama")
+
+# Seconds per provider request until real latencies have been observed (rough
+# figures). Google has no batch requests, its figure is for a single text.
+DEFAULT_BATCH_LATENCY = {
+    "google": 0.3,
+    "gemini": 8.0,
+    "ollama": 20.0,
+}
+DEFAULT_BATCH_LATENCY_FALLBACK = 6.0
+
+
+async def estimate_translation(
+    source_mod_path: str,
+    target_lang: str = "ko",
+    service: str = "google",
+    service_config: dict = None,
+    vanilla_path: str = None,
+    glossary: dict = None,
+    use_cache: bool = True,
+    previous_output_path: str = None,
+) -> dict:
+    """
+    Dry run of generate_translation_mod: parses the mod the same way (CPU pool,
+    YmlManager) and reports how much of it would reach the provider, without
+    writing anything or calling any API.
+    """
+    started = time.monotonic()
+    service_config = service_config or {}
+    paradox_lang = LANG_FOLDER_MAP.get(target_lang, target_lang)
+    generator = ModGenerator()
+
+    # Parse
+    files = list(
+        generator._iter_localisation_files(
+            os.path.join(source_mod_path, "localisation"),
+            "",
+            paradox_lang,
+            create_dirs=False,
+        )
+    )
+    results = await asyncio.gather(
+        *[
+            cpu_pool.run_cpu(
+                cpu_pool.parse_localisation_file,
+                job["source_path"],
+                f"l_{paradox_lang}",
+            )
+            for job in files
+        ],
+        return_exceptions=True,
+    )
+
+    # Update mode
+    previous_index = {}
+    if previous_output_path:
+        manifest = translation_manifest.load_manifest(previous_output_path)
+        if manifest and manifest.get("target_lang") == target_lang:
+            previous_index = translation_manifest.build_previous_index(
+                previous_output_path, manifest, generator.yml_manager.entry_pattern
+            )
+
+    total_entries = 0
+    carried_forward = 0
+    parse_errors = 0
+    value_counts = {}  # { value: number of entries }
+    for result in results:
+        if result is None or isinstance(result, Exception):
+            parse_errors += 1
+            continue
+        entries, original_lines = result
+        for idx, key, ver, value, suffix in entries:
+            total_entries += 1
+            if (
+                translation_manifest.carried_translation(previous_index, key, value)
+                is not None
+            ):
+                carried_forward += 1
+                continue
+            value_counts[value] = value_counts.get(value, 0) + 1
+
+    def entries_of(values):
+        return sum(value_counts[value] for value in values)
+
+    # Same lookup order as the real run: empty values, vanilla memory, cache
+    vanilla_db = None
+    if vanilla_path:
+        try:
+            vanilla_db = await asyncio.to_thread(
+                get_vanilla_manager, vanilla_path, paradox_lang
+            )
+        except Exception as e:
+            print(f"Estimate: vanilla memory not available: {e}")
+    found, remaining = translation_lookup.local_lookup(
+        value_counts, vanilla_db=vanilla_db
+    )
+    empty_entries = entries_of(found["empty"])
+    vanilla_hits = entries_of(found["vanilla"])
+
+    # Persistent cache, for the selected service/model only
+    translator = ModGenerator._create_translator(service, service_config, glossary)
+    cache = None
+    if use_cache and remaining:
+        try:
+            cache = get_translation_cache()
+        except Exception as e:
+            print(f"Estimate: cache not available: {e}")
+    cached = await translation_lookup.cache_lookup(
+        cache,
+        remaining,
+        target_lang,
+        service,
+        getattr(translator, "model", ""),
+        glossary,
+        touch=False,
+    )
+    cache_hits = entries_of(cached)
+    remaining = [value for value in remaining if value not in cached]
+
+    # Strings the provider would actually see, after placeholder dedup
+    prepared = await SharedSource().prepare(type(translator), remaining, glossary)
+    unique_texts = list(dict.fromkeys(cleaned for cleaned, _, _ in prepared))
+
+    providers = []
+    for name in ESTIMATE_SERVICES:
+        provider_translator = (
+            translator
+            if name == service
+            else ModGenerator._create_translator(name, service_config, glossary)
+        )
+        providers.append(
+            _estimate_provider(
+                name,
+                provider_translator,
+                unique_texts,
+                target_lang,
+                service_config,
+            )
+        )
+    # Unknown services fall back to Google, like the real run
+    selected = next((p for p in providers if p["service"] == service), providers[0])
+
+    return {
+        "files": len(files),
+        "parse_errors": parse_errors,
+        "total_entries": total_entries,
+        "unique_entries": len(value_counts),
+        "carried_forward": carried_forward,
+        "empty_entries": empty_entries,
+        "vanilla_hits": vanilla_hits,
+        "cache_hits": cache_hits,
+        "entries_to_translate": entries_of(remaining),
+        "unique_to_translate": len(unique_texts),
+        "service": service,
+        "projected_seconds": selected["projected_seconds"],
+        "providers": providers,
+        "estimate_seconds": round(time.monotonic() - started, 2),
+    }
+
+
+def _estimate_provider(
+    name: str,
+    translator,
+    unique_texts: list,
+    target_lang: str,
+    service_config: dict,
+) -> dict:
+    """Packs the texts like the real run, then estimates tokens and wall time."""
+    input_budget, output_budget = get_token_budget(
+        name, getattr(translator, "model", ""), service_config.get("batch_budgets")
+    )
+    packer = BatchPacker(
+        BATCH_SIZES.get(name, DEFAULT_BATCH_SIZE),
+        input_budget,
+        output_budget,
+        target_lang,
+    )
+    batches = []
+    for text in unique_texts:
+        batches.extend(packer.add(text))
+    last_batch = packer.flush()
+    if last_batch:
+        batches.append(last_batch)
+    if getattr(translator, "SUPPORTS_BATCH", False):
+        requests = packer.batches
+    else:
+        # A batch is still dispatched together, but each text is its own request
+        requests = len(unique_texts)
+
+    input_tokens = 0
+    output_tokens = 0
+    if name in LLM_SERVICES and unique_texts:
+        # Prompts carry only the glossary terms found in their batch
+        glossary = getattr(translator, "glossary", None)
+        matcher = get_glossary_matcher(glossary, inflected=True) if glossary else None
+        prompt_tokens = sum(
+            estimate_tokens(
+                translator.build_system_prompt(
+                    target_lang, matcher.subset(batch) if matcher else None, batch=True
+                )
+            )
+            for batch in batches
+        )
+        input_tokens = packer.total_input + prompt_tokens
+        output_tokens = sum(
+            estimate_output_tokens(text, target_lang) for text in unique_texts
+        )
+
+    # Current concurrency settings: the live AIMD limit/latency if a task already ran
+    controller = peek_concurrency_controller(
+        name,
+        ModGenerator._rate_limit_key(name, service_config),
+        getattr(translator, "model", ""),
+    )
+    if controller is not None:
+        concurrency = controller.limit
+        latency = controller.long_latency
+    else:
+        concurrency = PROVIDER_LIMITS.get(name, DEFAULT_LIMITS)[0]
+        latency = None
+    if not latency:
+        latency = DEFAULT_BATCH_LATENCY.get(name, DEFAULT_BATCH_LATENCY_FALLBACK)
+
+    limits = (service_config.get("rate_limits") or {}).get(name) or {}
+    default_rpm, default_tpm = DEFAULT_RATE_LIMITS.get(name, (None, None))
+    rpm = limits.get("rpm") or default_rpm
+    tpm = limits.get("tpm") or default_tpm
+
+    bounds = {"latency": requests * latency / max(1, concurrency)}
+    if rpm:
+        bounds["rpm"] = requests / rpm * 60
+    if tpm and input_tokens:
+        bounds["tpm"] = input_tokens / tpm * 60
+    bottleneck = max(bounds, key=bounds.get)
+
+    return {
+        "service": name,
+        "model": getattr(translator, "model", ""),
+        "requests": requests,
+        "packing": packer.stats(),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "characters": sum(len(text) for text in unique_texts),
+        "concurrency": concurrency,
+        "batch_latency": round(latency, 2),
+        "projected_seconds": round(bounds[bottleneck], 1),
+        "bottleneck": bottleneck,
+    }
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+import time
+
+# One append-only JSON-lines file per task, relative to the working directory
+# like paradox_manager.db
+JOURNAL_DIR = "./translation_journals"
+
+
+def journal_path(task_id: str) -> str:
+    return os.path.join(JOURNAL_DIR, f"{task_id}.jsonl")
+
+
+class TranslationJournal:
+    """
+    Append-only journal of a translation task.
+    Line 1 is a header with the job parameters, followed by one line per finished
+    translation ({"v": source, "t": translation}). Each write is flushed and fsynced,
+    so a crash loses at most the batch that was in flight.
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.path = journal_path(task_id)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(JOURNAL_DIR, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, records: list):
+        with self._lock:
+            self._open()
+            for record in records:
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def write_header(self, params: dict, output_root: str, dir_name: str):
+        """Records everything needed to restart the job."""
+        self._append(
+            [
+                {
+                    "type": "header",
+                    "created_at": time.time(),
+                    "params": params,
+                    "output_root": output_root,
+                    "dir_name": dir_name,
+                }
+            ]
+        )
+
+    def record(self, pairs: list):
+        """pairs: list of (source_value, translation)"""
+        if pairs:
+            self._append([{"v": source, "t": trans} for source, trans in pairs])
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Deletes the journal once the job finished successfully."""
+        self.close()
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            print(f"Failed to remove journal {self.path}: {e}")
+
+
+def load_journal(task_id: str) -> dict:
+    """
+    Rebuilds the state of an interrupted task.
+    Returns { header, params, output_root, dir_name, translations } or None.
+    """
+    path = journal_path(task_id)
+    if not os.path.exists(path):
+        return None
+
+    header = None
+    translations = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn last line from a crash mid-write
+                continue
+            if record.get("type") == "header":
+                if header is None:
+                    header = record
+            elif "v" in record and "t" in record:
+                translations[record["v"]] = record["t"]
+
+    if header is None:
+        return None
+
+    return {
+        "header": header,
+        "params": header["params"],
+        "output_root": header["output_root"],
+        "dir_name": header["dir_name"],
+        "translations": translations,
+    }
+
+
+def list_journals() -> list:
+    """Returns a summary of every resumable (unfinished) task on disk."""
+    if not os.path.exists(JOURNAL_DIR):
+        return []
+
+    summaries = []
+    for name in os.listdir(JOURNAL_DIR):
+        if not name.endswith(".jsonl"):
+            continue
+        task_id = name[: -len(".jsonl")]
+        try:
+            state = load_journal(task_id)
+        except Exception as e:
+            print(f"Failed to read journal {name}: {e}")
+            continue
+        if not state:
+            continue
+        summaries.append(
+            {
+                "task_id": task_id,
+                "mod_name": state["params"].get("source_mod", {}).get("name"),
+                "service": state["params"].get("service"),
+                "target_lang": state["params"].get("target_lang"),
+                "created_at": state["header"].get("created_at"),
+                "journaled_entries": len(state["translations"]),
+            }
+        )
+    return summaries
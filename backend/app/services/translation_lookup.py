@@ -0,0 +1,47 @@
+import asyncio
+
+# Sources checked before the persistent cache, in lookup order
+LOCAL_SOURCES = ("journal", "empty", "vanilla")
+
+
+def local_lookup(values, journaled: dict = None, vanilla_db=None) -> tuple:
+    """
+    First lookup step of a run, shared by the pipeline and the estimate: translations
+    journaled by an interrupted run, empty values, then the vanilla memory.
+    Returns ({ source: { value: translation } }, values still to look up).
+    """
+    found = {source: {} for source in LOCAL_SOURCES}
+    remaining = []
+    for value in values:
+        if journaled and value in journaled:
+            found["journal"][value] = journaled[value]
+        elif not value or value.strip() == "":
+            found["empty"][value] = value
+        else:
+            translation = vanilla_db.get_translation(value) if vanilla_db else None
+            if translation:
+                found["vanilla"][value] = translation
+            else:
+                remaining.append(value)
+    return found, remaining
+
+
+async def cache_lookup(
+    cache,
+    values: list,
+    target_lang: str,
+    service: str,
+    model: str,
+    glossary: dict = None,
+    touch: bool = True,
+) -> dict:
+    """Second lookup step: the persistent cache. Returns { value: translation } of the hits."""
+    if not cache or not values:
+        return {}
+    try:
+        return await asyncio.to_thread(
+            cache.get_many, values, target_lang, service, model, glossary, touch
+        )
+    except Exception as e:
+        print(f"Cache lookup failed: {e}")
+        return {}
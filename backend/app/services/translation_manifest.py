@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import time
+
+# Written into every generated translation mod
+MANIFEST_FILENAME = "_translation_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def source_hash(value: str) -> str:
+    """Short hash of a source (English) value."""
+    return hashlib.sha1((value or "").encode("utf-8")).hexdigest()[:16]
+
+
+def write_manifest(target_dir: str, info: dict, files: dict) -> bool:
+    """
+    Writes the manifest into a generated mod.
+    info: run metadata (source mod id, target_lang, service, model)
+    files: { rel_source_path: { "target": rel_target_path, "entries": { key: source_hash } } }
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated_at": time.time(),
+        **info,
+        "files": files,
+    }
+    path = os.path.join(target_dir, MANIFEST_FILENAME)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        return True
+    except Exception as e:
+        print(f"Failed to write translation manifest: {e}")
+        return False
+
+
+def load_manifest(mod_dir: str) -> dict:
+    """Returns the manifest of a previously generated mod, or None."""
+    path = os.path.join(mod_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        print(f"No translation manifest found in {mod_dir}")
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"Failed to read translation manifest: {e}")
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        print(f"Unsupported manifest version: {manifest.get('version')}")
+        return None
+    return manifest
+
+
+def build_previous_index(mod_dir: str, manifest: dict, entry_pattern) -> dict:
+    """
+    Reads the translated files of a previous run.
+    Returns { key: (source_hash, translated_value) } for every key listed in the manifest
+    whose translation could still be found on disk.
+    """
+    index = {}
+    for rel_source, file_info in manifest.get("files", {}).items():
+        target_path = os.path.join(mod_dir, *file_info["target"].split("/"))
+        hashes = file_info.get("entries", {})
+
+        try:
+            with open(target_path, "r", encoding="utf-8-sig") as f:
+                lines = f.readlines()
+        except Exception as e:
+            print(f"Previous translation not readable ({rel_source}): {e}")
+            continue
+
+        for line in lines:
+            match = entry_pattern.match(line)
+            if not match:
+                continue
+            key = match.group(1)
+            if key in hashes:
+                # Undo the quote escaping done when the file was written
+                index[key] = (hashes[key], match.group(3).replace('\\"', '"'))
+
+    return index
+
+
+def carried_translation(previous_index: dict, key: str, value: str):
+    """Previous translation of a key if its source value is unchanged, else None."""
+    previous = previous_index.get(key)
+    if previous and previous[0] == source_hash(value):
+        return previous[1]
+    return None
@@ -1,5 +1,139 @@
 from abc import ABC, abstractmethod
+import json
 import re
+import time
+
+import aiohttp
+
+from .. import metrics
+from ..glossary_matcher import get_glossary_matcher
+from ..rate_limiter import estimate_tokens
+from .markup import (
+    MARKUP_PATTERNS,
+    PLACEHOLDER_PATTERN,
+    compile_markup,
+    extract_markup,
+    restore_markup,
+)
+
+# Shared system prompt for the LLM services (OpenAI, Claude, Gemini, Ollama)
+HOI4_STYLE_GUIDE = (
+    "You are the Lead Korean Localizer for Paradox Interactive's 'Hearts of Iron IV'.\\n"
+    "Your mandate is to translate game text from English to Korean, STRICTLY following the official localization standards found in the game's `localisation/korean` folder.\\n\\n"
+    "***OFFICIAL HOI4 KOREAN STYLE GUIDE***\\n\\n"
+    "1. **Tone & Grammar (CRITICAL)**:\\n"
+    "   - **Narrative/Descriptions (Events, Lore)**: Use formal 'Hapsho-che' (합쇼체, ~습니다). It must sound like a 1940s military report, diplomatic cable, or historical record. Dry, serious, and professional.\\n"
+    "   - **Tooltips/Effects/Modifiers**: Use concise Noun Endings (~함, ~임, ~증가, ~감소). NEVER use full sentences here. (e.g., 'Gain 50 PP' -> '정치력 50 획득', not '획득합니다')\\n"
+    "   - **Interface/Buttons/Options**: Use concise Plain Form (해라체, ~다) or Noun Phrases.\\n\\n"
+    "2. **Mandatory Terminology (Do NOT deviate)**:\\n"
+    "   - Manpower -> 인력\\n"
+    "   - Stability -> 안정도\\n"
+    "   - War Support -> 전쟁 지지도\\n"
+    "   - Organization -> 조직력\\n"
+    "   - Division -> 사단 (Military Unit)\\n"
+    "   - Infrastructure -> 기반시설\\n"
+    "   - Factory -> 공장\\n"
+    "   - Equipment -> 장비\\n"
+    "   - Civilian Industry -> 민간 산업\\n"
+    "   - Army -> 육군 (Specific branch), 군 (General)\\n"
+    "   - Navy -> 해군\\n"
+    "   - Air force -> 공군\\n"
+    "   - Cheat -> 치트\\n"
+    "   - Buff -> 버프\\n"
+    "   - Debuff -> 디버프\\n"
+    "   - National Focus -> 국가 중점\\n\\n"
+    "3. **Formatting & Safety**:\\n"
+    "   - **PRESERVE** all special codes: §Y, §R, §G, §!, $VAR$, [Root.GetName], £icon£, \\n.\\n"
+    "   - **NO CHINESE CHARACTERS (Hanja)**: Use Korean Hangul ONLY unless the source is explicitly Chinese.\\n"
+    "   - **NO THINKING**: Do not output your thought process. Output ONLY the final translated text.\\n"
+    "   - **Keys**: If the input looks like a code key (e.g., `political_power_gain`), return it unchanged.\\n"
+)
+
+# Used for the target languages without a dedicated guide above
+GENERIC_STYLE_GUIDE = (
+    "You are the Lead {language} Localizer for Paradox Interactive's 'Hearts of Iron IV'.\\n"
+    "Your mandate is to translate game text from English to {language}, following the style and terminology of the game's official {language} localization.\\n\\n"
+    "***HOI4 {language_upper} STYLE GUIDE***\\n\\n"
+    "1. **Tone & Grammar**:\\n"
+    "   - **Narrative/Descriptions (Events, Lore)**: Formal and serious, like a 1940s military report, diplomatic cable, or historical record.\\n"
+    "   - **Tooltips/Effects/Modifiers**: Concise noun phrases, NEVER full sentences.\\n"
+    "   - **Interface/Buttons/Options**: Short and plain.\\n\\n"
+    "2. **Terminology**: Use the game's official {language} terms for its concepts (Manpower, Stability, War Support, Division, National Focus, ...).\\n\\n"
+    "3. **Formatting & Safety**:\\n"
+    "   - **PRESERVE** all special codes: §Y, §R, §G, §!, $VAR$, [Root.GetName], £icon£, \\n.\\n"
+    "   - **NO THINKING**: Do not output your thought process. Output ONLY the final translated text.\\n"
+    "   - **Keys**: If the input looks like a code key (e.g., `political_power_gain`), return it unchanged.\\n"
+)
+# Target language -> style guide written for it
+STYLE_GUIDES = {"ko": HOI4_STYLE_GUIDE}
+
+# Appended to the system prompt when several entries are sent in one request
+BATCH_INSTRUCTION = (
+    "5. **Batch Mode**:\\n"
+    '   - The input is a JSON array of objects: [{"id": 0, "text": "..."}, ...].\\n'
+    '   - Translate every "text" independently and return ONLY a JSON array with the same "id" values: [{"id": 0, "text": "<translation>"}, ...].\\n'
+    "   - Do NOT merge, split, reorder or skip items. Keep placeholders like __VAR0__ and __GLS0__ exactly as they are.\\n"
+    "   - No markdown, no code fences, no commentary.\\n"
+)
+
+LANGUAGE_NAMES = {
+    "ko": "Korean",
+    "en": "English",
+    "ja": "Japanese",
+    "zh": "Chinese",
+    "zh-CN": "Chinese Simplified",
+    "zh-TW": "Chinese Traditional",
+}
+
+
+def style_guide(target_lang: str) -> str:
+    """The style guide section of the LLM system prompt for a target language."""
+    guide = STYLE_GUIDES.get(target_lang)
+    if guide is None:
+        language = LANGUAGE_NAMES.get(target_lang, target_lang)
+        guide = GENERIC_STYLE_GUIDE.format(
+            language=language, language_upper=language.upper()
+        )
+    return guide
+
+
+def format_glossary(glossary: dict) -> str:
+    """The glossary section of the LLM system prompt."""
+    if not glossary:
+        return ""
+    lines = "".join(f"- {k}: {v}\n" for k, v in glossary.items())
+    return f"\nGLOSSARY (Use these exact translations):\n{lines}"
+
+
+class ProviderError(Exception):
+    """
+    Non-200 response (or connection failure, status 0) from a translation provider.
+    retry_after: seconds the provider asked us to wait, if it said so.
+    """
+
+    def __init__(self, provider: str, status: int, message: str, retry_after=None):
+        super().__init__(f"{provider} error: {status} - {message}")
+        self.provider = provider
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(headers, body: str = ""):
+    """
+    Reads the wait time from a Retry-After header or a Gemini style
+    "Please retry in 14.046314639s." message. Returns seconds or None.
+    """
+    value = headers.get("Retry-After") if headers else None
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    if body:
+        retry_match = re.search(r"retry in (\d+(\.\d+)?)s", body)
+        if retry_match:
+            return float(retry_match.group(1))
+    return None
 
 
 class BaseTranslator(ABC):
@@ -9,41 +143,40 @@ class BaseTranslator(ABC):
     """
 
     # HOI4 Localization patterns to preserve
-    # [ScopeCommand] - e.g., [GetName], [Root.GetName], [From.Owner.GetName]
-    # $VAR$ - variables
+    # [ScopeCommand] - e.g., [GetName], [Root.GetName], [?var|%G0], nested brackets
+    # $VAR$ - variables, also with a format: $VALUE|%+0$
     # §X - color codes (§Y yellow, §R red, §! reset, etc.)
     # \n - newlines (literal)
-    # £icon - icon references
+    # £icon - icon references, also £icon£
+
+    # Name used in errors/metrics, set by subclasses
+    PROVIDER_NAME = "base"
+
+    # Optional callback(status, latency, retry_after) for every provider response.
+    # ModGenerator points this at the provider's AdaptiveConcurrencyController.
+    response_listener = None
+
+    # Optional shared ProviderRateLimiter, acquired before every request
+    rate_limiter = None
+
+    # Optional TaskTrace, every provider call is recorded as a span
+    trace = None
+
+    # Optional Cassette: records every post_json response, or answers from the file
+    cassette = None
 
-    PRESERVE_PATTERNS = [
-        (r"\[([A-Za-z0-9_.]+)\]", "SCOPECMD"),  # [GetName], [Root.GetName]
-        (r"\$([A-Za-z0-9_]+)\$", "VARIABLE"),  # $variable$
-        (r"§([A-Za-z!])", "COLOR"),  # §Y, §!, §R
-        (r"£([A-Za-z0-9_]+)", "ICON"),  # £icon_name
-        (r"\\n", "NEWLINE"),  # \n literal
-    ]
+    # Glossary tokens sent vs. left out of the prompts by glossary_for, per translator
+    glossary_usage = None
+
+    # (pattern, type) pairs, compiled into a single tokenizer (see markup.py)
+    PRESERVE_PATTERNS = MARKUP_PATTERNS
 
     def extract_variables(self, text: str) -> tuple[str, list]:
         """
         Extracts variables from text and replaces with placeholders.
         Returns (modified_text, list_of_extractions)
         """
-        extractions = []
-        modified = text
-        placeholder_idx = 0
-
-        for pattern, var_type in self.PRESERVE_PATTERNS:
-            matches = list(re.finditer(pattern, modified))
-            for match in reversed(matches):  # Reverse to not mess up indices
-                original = match.group(0)
-                placeholder = f"__VAR{placeholder_idx}__"
-                extractions.append((placeholder, original, var_type))
-                modified = (
-                    modified[: match.start()] + placeholder + modified[match.end() :]
-                )
-                placeholder_idx += 1
-
-        return modified, extractions
+        return extract_markup(text, compile_markup(tuple(self.PRESERVE_PATTERNS)))
 
     def restore_variables(self, text: str, extractions: list) -> str:
         """
@@ -51,10 +184,84 @@ class BaseTranslator(ABC):
         """
         if text is None:
             return ""
-        result = text
-        for placeholder, original, _ in extractions:
-            result = result.replace(placeholder, original)
-        return result
+        return restore_markup(text, extractions)
+
+    def report_response(self, status: int, latency: float, retry_after=None):
+        """Forwards the outcome of one provider call to response_listener and the metrics."""
+        metrics.PROVIDER_REQUESTS.inc(self.PROVIDER_NAME, status)
+        metrics.PROVIDER_LATENCY.observe(latency, self.PROVIDER_NAME)
+        if status == 429:
+            metrics.PROVIDER_RATE_LIMITED.inc(self.PROVIDER_NAME)
+        if self.trace is not None:
+            end = self.trace.now()
+            self.trace.add(
+                "provider_call",
+                "network",
+                end - latency,
+                end,
+                provider=self.PROVIDER_NAME,
+                status=status,
+            )
+        if self.response_listener is not None:
+            try:
+                self.response_listener(status, latency, retry_after)
+            except Exception as e:
+                print(f"response_listener failed: {e}")
+
+    async def post_json(
+        self, url: str, payload: dict, headers: dict = None, timeout: float = None
+    ):
+        """
+        POSTs a JSON payload to the provider and returns the parsed JSON body.
+        Waits for rate_limiter first. Every call is reported to response_listener;
+        non-200 responses and connection errors raise ProviderError.
+        With a replaying cassette the response comes from the file instead.
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            # No network and no rate limits, the recorded response comes back
+            return await self.cassette.replay(self, url, payload)
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(
+                estimate_tokens(json.dumps(payload, ensure_ascii=False))
+            )
+
+        client_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        start = time.monotonic()
+        try:
+            async with aiohttp.ClientSession(timeout=client_timeout) as session:
+                async with session.post(url, json=payload, headers=headers) as resp:
+                    if resp.status == 200:
+                        # Skip content-type check because Ollama sometimes returns text/plain for JSON
+                        data = await resp.json(content_type=None)
+                        latency = time.monotonic() - start
+                        self.report_response(200, latency)
+                        if self.cassette is not None:
+                            self.cassette.record(url, payload, 200, data, latency)
+                        return data
+
+                    error = await resp.text()
+                    latency = time.monotonic() - start
+                    retry_after = parse_retry_after(resp.headers, error)
+                    self.report_response(resp.status, latency, retry_after)
+                    if self.cassette is not None:
+                        self.cassette.record(
+                            url, payload, resp.status, error, latency, retry_after
+                        )
+                    if resp.status == 429 and self.rate_limiter is not None:
+                        self.rate_limiter.penalize(retry_after)
+                    raise ProviderError(
+                        self.PROVIDER_NAME, resp.status, error, retry_after
+                    )
+        except ProviderError:
+            raise
+        except Exception as e:
+            # Connection refused, timeout, broken JSON...
+            latency = time.monotonic() - start
+            self.report_response(0, latency)
+            if self.cassette is not None:
+                self.cassette.record(url, payload, 0, str(e), latency)
+            raise ProviderError(self.PROVIDER_NAME, 0, str(e)) from e
 
     def clean_thinking_content(self, text: str) -> str:
         """
@@ -70,6 +277,66 @@ class BaseTranslator(ABC):
 
         return text.strip()
 
+    def glossary_for(self, texts: list) -> dict:
+        """
+        The part of self.glossary whose terms occur in texts, plural forms included
+        ("Divisions" brings in "Division"). The LLM services put only that into the
+        prompt instead of the whole glossary; the estimated savings are counted in
+        glossary_usage and the metrics.
+        """
+        glossary = getattr(self, "glossary", None)
+        if not glossary:
+            return glossary
+        subset = get_glossary_matcher(glossary, inflected=True).subset(texts)
+
+        if self.glossary_usage is None:
+            self.glossary_usage = {
+                "terms": len(glossary),
+                "requests": 0,
+                "terms_sent": 0,
+                "tokens_full": 0,
+                "tokens_sent": 0,
+                "tokens_saved": 0,
+            }
+            self._glossary_tokens = estimate_tokens(format_glossary(glossary))
+        full_tokens = self._glossary_tokens
+        sent_tokens = estimate_tokens(format_glossary(subset)) if subset else 0
+        usage = self.glossary_usage
+        usage["requests"] += 1
+        usage["terms_sent"] += len(subset)
+        usage["tokens_full"] += full_tokens
+        usage["tokens_sent"] += sent_tokens
+        usage["tokens_saved"] += full_tokens - sent_tokens
+        metrics.GLOSSARY_PROMPT_TOKENS.inc(
+            self.PROVIDER_NAME, "sent", amount=sent_tokens
+        )
+        metrics.GLOSSARY_PROMPT_TOKENS.inc(
+            self.PROVIDER_NAME, "saved", amount=full_tokens - sent_tokens
+        )
+        return subset
+
+    def build_system_prompt(
+        self, target_lang: str, glossary: dict = None, batch: bool = False
+    ) -> str:
+        """
+        Builds the system prompt shared by the LLM services.
+        batch: If True, appends the JSON array instructions used by translate_batch.
+        """
+        target = LANGUAGE_NAMES.get(target_lang, target_lang)
+
+        glossary_text = format_glossary(glossary)
+
+        prompt = (
+            f"{style_guide(target_lang)}\\n"
+            f"4. **Glossary (User Provided)**:\\n{glossary_text}\\n\\n"
+        )
+        if batch:
+            prompt += f"{BATCH_INSTRUCTION}\\n"
+            prompt += f"Translate every item of the following JSON array to {target}:"
+        else:
+            prompt += f"Translate the following text to {target}:"
+        return prompt
+
     @abstractmethod
     async def translate(self, text: str, target_lang: str) -> str:
         """
@@ -77,6 +344,84 @@ class BaseTranslator(ABC):
         """
         pass
 
+    async def translate_batch(self, items: list, target_lang: str) -> dict:
+        """
+        Translates several texts at once.
+        items: list of (item_id, text)
+        Returns { item_id: translated_text }. Items missing from the result were not translated.
+        Default: one request per item. Services with SUPPORTS_BATCH override this with a single request.
+        """
+        results = {}
+        for item_id, text in items:
+            results[item_id] = await self.translate_with_retry(text, target_lang)
+        return results
+
+    def build_batch_payload(self, texts: list) -> str:
+        """
+        Serializes texts as the numbered JSON array expected by BATCH_INSTRUCTION.
+        """
+        return json.dumps(
+            [{"id": i, "text": text} for i, text in enumerate(texts)],
+            ensure_ascii=False,
+        )
+
+    def parse_batch_response(self, raw_text: str, count: int) -> dict:
+        """
+        Parses the JSON array returned for a batch prompt.
+        Returns { index: text } for every well-formed item; anything else is dropped
+        so the caller can retry it individually.
+        """
+        results = {}
+        if not raw_text:
+            return results
+
+        text = self.clean_thinking_content(raw_text)
+
+        # Models like to wrap JSON in ```json fences or add a sentence around it
+        start = text.find("[")
+        end = text.rfind("]")
+        if start == -1 or end <= start:
+            return results
+
+        try:
+            data = json.loads(text[start : end + 1])
+        except (ValueError, TypeError):
+            return results
+
+        if not isinstance(data, list):
+            return results
+
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            try:
+                idx = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            value = item.get("text")
+            if 0 <= idx < count and isinstance(value, str):
+                results[idx] = value
+
+        return results
+
+    async def _translate_batch_via_prompt(
+        self, items: list, target_lang: str, send_func
+    ) -> dict:
+        """
+        Shared translate_batch implementation for the LLM services.
+        send_func: async function(system_prompt, user_content) -> raw response text
+        """
+        texts = [text for _, text in items]
+        system_prompt = self.build_system_prompt(
+            target_lang, glossary=self.glossary_for(texts), batch=True
+        )
+        payload = self.build_batch_payload(texts)
+
+        raw_text = await send_func(system_prompt, payload)
+        parsed = self.parse_batch_response(raw_text, len(items))
+
+        return {items[idx][0]: value for idx, value in parsed.items()}
+
     async def translate_with_retry(
         self, text: str, target_lang: str, retries: int = 3
     ) -> str:
@@ -96,6 +441,7 @@ class BaseTranslator(ABC):
                 last_exception = e
                 print(f"Translation attempt {attempt + 1} failed: {e}")
                 if attempt < retries - 1:
+                    metrics.PROVIDER_RETRIES.inc(self.PROVIDER_NAME)
                     sleep_time = delay * (1 + random.random())  # Jitter
                     print(f"Retrying in {sleep_time:.2f}s...")
                     await asyncio.sleep(sleep_time)
@@ -110,35 +456,140 @@ class BaseTranslator(ABC):
         Replaces glossary keys in text with placeholders.
         Returns (modified_text, list_of_extractions)
         """
+        matches = get_glossary_matcher(glossary).find(text)
+        if not matches:
+            return text, []
+
         extractions = []
-        modified = text
-        placeholder_idx = 0
+        parts = []
+        position = 0
+        for start, end, key in matches:
+            # Use a placeholder that AI is likely to preserve but distinct from VAR
+            placeholder = f"__GLS{len(extractions)}__"
+            extractions.append((placeholder, glossary[key], "GLOSSARY"))
+            parts.append(text[position:start])
+            parts.append(placeholder)
+            position = end
+        parts.append(text[position:])
+        return "".join(parts), extractions
+
+    def is_valid_translation(self, source: str, translated: str) -> bool:
+        """
+        Checks a batch result: it must be non-empty and keep every placeholder of the source.
+        """
+        if not isinstance(translated, str):
+            return False
+        if source.strip() and not translated.strip():
+            return False
+        for placeholder in PLACEHOLDER_PATTERN.findall(source):
+            if placeholder not in translated:
+                return False
+        return True
+
+    def prepare_text(self, text: str, glossary: dict = None) -> tuple[str, list, list]:
+        """
+        Steps 1-2 of translate_with_preservation.
+        Returns (cleaned_text, var_extractions, glossary_extractions)
+        """
+        cleaned_text, var_extractions = self.extract_variables(text)
 
-        # Sort keys by length (descending) to avoid partial matching issues
-        sorted_keys = sorted(glossary.keys(), key=len, reverse=True)
+        glossary_extractions = []
+        supports_native_glossary = getattr(self, "SUPPORTS_NATIVE_GLOSSARY", False)
 
-        for key in sorted_keys:
-            if not key or not key.strip():
-                continue
+        if glossary and not supports_native_glossary:
+            cleaned_text, glossary_extractions = self.apply_glossary_as_variables(
+                cleaned_text, glossary
+            )
 
-            # Case-insensitive search
-            pattern = re.escape(key)
-            matches = list(re.finditer(pattern, modified, re.IGNORECASE))
+        return cleaned_text, var_extractions, glossary_extractions
 
-            for match in reversed(matches):
-                original_text_in_source = match.group(0)
-                target_val = glossary[key]
+    def finalize_text(
+        self, translated: str, var_extractions: list, glossary_extractions: list
+    ) -> str:
+        """
+        Steps 4-5 of translate_with_preservation.
+        """
+        if glossary_extractions:
+            # Both kinds of placeholders in a single pass
+            return self.restore_variables(
+                translated, var_extractions + glossary_extractions
+            )
+        return self.restore_variables(translated, var_extractions)
 
-                # Use a placeholder that AI is likely to preserve but distinct from VAR
-                placeholder = f"__GLS{placeholder_idx}__"
-                extractions.append((placeholder, target_val, "GLOSSARY"))
+    async def translate_preserved_batch(self, items: list, target_lang: str) -> dict:
+        """
+        Translates texts that already went through prepare_text (placeholders in place).
+        items: list of (item_id, cleaned_text)
+        Returns { item_id: translated_cleaned_text }. Items that failed completely are missing.
 
-                modified = (
-                    modified[: match.start()] + placeholder + modified[match.end() :]
+        Services with SUPPORTS_BATCH send all items in one request; entries that come back
+        missing or malformed (e.g. a lost placeholder) are re-translated one by one.
+        """
+        sources = dict(items)
+        batch_results = {}
+        if getattr(self, "SUPPORTS_BATCH", False) and len(items) > 1:
+            try:
+                batch_results = await self.translate_batch(items, target_lang)
+            except Exception as e:
+                print(f"Batch translation failed, falling back to single entries: {e}")
+
+        results = {}
+        fallback = []
+        for item_id, cleaned in sources.items():
+            translated = batch_results.get(item_id)
+            if translated is not None and self.is_valid_translation(
+                cleaned, translated
+            ):
+                results[item_id] = translated
+            else:
+                fallback.append((item_id, cleaned))
+
+        if fallback and batch_results:
+            print(f"Batch: re-translating {len(fallback)} missing/malformed entries")
+
+        for item_id, cleaned in fallback:
+            try:
+                results[item_id] = await self.translate_with_retry(cleaned, target_lang)
+            except Exception:
+                pass  # Caller falls back to the original text
+
+        return results
+
+    async def translate_batch_with_preservation(
+        self, items: list, target_lang: str, glossary: dict = None
+    ) -> dict:
+        """
+        Batch version of translate_with_preservation.
+        items: list of (item_id, text)
+        Returns { item_id: translated_text } for every item (original text on total failure).
+        """
+        results = {}
+        # item_id -> (source, cleaned, var_extractions, glossary_extractions)
+        prepared = {}
+
+        for item_id, text in items:
+            if not text or text.strip() == "":
+                results[item_id] = text
+                continue
+            cleaned, var_ext, gls_ext = self.prepare_text(text, glossary)
+            prepared[item_id] = (text, cleaned, var_ext, gls_ext)
+
+        if not prepared:
+            return results
+
+        translated = await self.translate_preserved_batch(
+            [(item_id, p[1]) for item_id, p in prepared.items()], target_lang
+        )
+
+        for item_id, (text, cleaned, var_ext, gls_ext) in prepared.items():
+            if item_id in translated:
+                results[item_id] = self.finalize_text(
+                    translated[item_id], var_ext, gls_ext
                 )
-                placeholder_idx += 1
+            else:
+                results[item_id] = text
 
-        return modified, extractions
+        return results
 
     async def translate_with_preservation(
         self, text: str, target_lang: str, glossary: dict = None
@@ -150,17 +601,11 @@ class BaseTranslator(ABC):
             return text
 
         # 1. Extract HOI4 Variables (Code preservation)
-        cleaned_text, var_extractions = self.extract_variables(text)
-
         # 2. Extract Glossary Terms (Term enforcement)
         # Only apply strict variable replacement if the translator DOES NOT support native glossary context
-        glossary_extractions = []
-        supports_native_glossary = getattr(self, "SUPPORTS_NATIVE_GLOSSARY", False)
-
-        if glossary and not supports_native_glossary:
-            cleaned_text, glossary_extractions = self.apply_glossary_as_variables(
-                cleaned_text, glossary
-            )
+        cleaned_text, var_extractions, glossary_extractions = self.prepare_text(
+            text, glossary
+        )
 
         # 3. Translate with Retry
         try:
@@ -169,11 +614,5 @@ class BaseTranslator(ABC):
             return text  # Fallback to original on total failure
 
         # 4. Restore Glossary Terms (Inject Target Value)
-        # Note: We use restore_variables logic but with glossary list
-        if glossary_extractions:
-            translated = self.restore_variables(translated, glossary_extractions)
-
         # 5. Restore HOI4 Variables (Inject Original Code)
-        restored = self.restore_variables(translated, var_extractions)
-
-        return restored
+        return self.finalize_text(translated, var_extractions, glossary_extractions)
@@ -0,0 +1,178 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from .base import ProviderError
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = (MODE_RECORD, MODE_REPLAY)
+
+# Open cassettes by absolute path, shared by the runs of a multi-language/collection job
+_open_cassettes = {}
+
+
+def request_key(url: str, payload: dict) -> str:
+    """
+    Identifies a provider request by URL path and payload.
+    Host and query string are left out: the query carries the Gemini API key and
+    a recording made against the mock server replays for the real URL.
+    """
+    raw = urlsplit(url).path + "\n" + json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """
+    Provider traffic of a run in a gzip JSON lines file, one request/response pair
+    per line. Record mode appends every response BaseTranslator.post_json (and the
+    Google service) gets, errors included; replay mode answers those calls from the
+    file without any network, so a real job can be re-run offline and bad outputs
+    reproduced exactly.
+    Headers are never stored (API keys).
+    """
+
+    def __init__(self, path: str, mode: str = MODE_REPLAY, timing: bool = False):
+        """
+        timing: replay waits the recorded latency of every call, otherwise
+            answers immediately
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self.users = 0
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._file = None
+        self._responses = {}  # key -> deque of recorded interactions
+
+        if mode == MODE_RECORD:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # Appending keeps the earlier members of a resumed job readable
+            self._file = gzip.open(path, "at", encoding="utf-8")
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                self._responses.setdefault(interaction["key"], deque()).append(
+                    interaction
+                )
+
+    def record(
+        self,
+        url: str,
+        payload: dict,
+        status: int,
+        body,
+        latency: float,
+        retry_after: float = None,
+    ):
+        """body: parsed JSON of a 200 response, the error text otherwise."""
+        if self._file is None:
+            return
+        interaction = {
+            "key": request_key(url, payload),
+            "path": urlsplit(url).path,
+            "status": status,
+            "latency": round(latency, 4),
+            "retry_after": retry_after,
+            "request": payload,
+            "body": body,
+        }
+        self._file.write(json.dumps(interaction, ensure_ascii=False) + "\n")
+        self.recorded += 1
+
+    def next_response(self, url: str, payload: dict):
+        """
+        The recorded interaction for this request, or None if it was never recorded.
+        Repeated requests get the recorded responses in order, then the last one again.
+        """
+        responses = self._responses.get(request_key(url, payload))
+        if not responses:
+            self.misses += 1
+            return None
+        self.replayed += 1
+        return responses.popleft() if len(responses) > 1 else responses[0]
+
+    async def replay(self, translator, url: str, payload: dict):
+        """
+        Answers a post_json call from the cassette: reports the recorded status to
+        the translator's listeners, returns the recorded JSON or raises ProviderError.
+        """
+        interaction = self.next_response(url, payload)
+        if interaction is None:
+            raise ProviderError(
+                translator.PROVIDER_NAME,
+                0,
+                f"No recorded response in cassette {self.path}",
+            )
+
+        start = time.monotonic()
+        status = interaction["status"]
+        retry_after = interaction.get("retry_after")
+        if self.timing:
+            await asyncio.sleep(interaction["latency"])
+            translator.report_response(status, time.monotonic() - start, retry_after)
+        else:
+            # Still yield like a network call would, but don't let a recorded
+            # Retry-After block the concurrency controller
+            await asyncio.sleep(0)
+            translator.report_response(status, time.monotonic() - start)
+        if status == 200:
+            return interaction["body"]
+        raise ProviderError(
+            translator.PROVIDER_NAME, status, interaction["body"], retry_after
+        )
+
+    def state(self) -> dict:
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def open_cassette(path: str, mode: str = MODE_REPLAY, timing: bool = False):
+    """
+    Opens the cassette at path, or returns the one already open for it (the languages
+    of one run share it). Every call needs a matching close_cassette.
+    """
+    key = os.path.abspath(path)
+    cassette = _open_cassettes.get(key)
+    if cassette is None:
+        cassette = _open_cassettes[key] = Cassette(path, mode, timing)
+    elif cassette.mode != mode:
+        raise ValueError(f"Cassette {path} is already open for {cassette.mode}")
+    cassette.users += 1
+    return cassette
+
+
+def close_cassette(cassette: Cassette):
+    cassette.users -= 1
+    if cassette.users <= 0:
+        cassette.close()
+        _open_cassettes.pop(os.path.abspath(cassette.path), None)
@@ -9,11 +9,18 @@ except AttributeError:
 
 from deep_translator import GoogleTranslator as DeepGoogle
 from .base import BaseTranslator
+from ..rate_limiter import estimate_tokens
 import asyncio
 import random
+import time
+
+# Request URL of Google translations in cassettes (deep-translator's endpoint)
+CASSETTE_URL = "https://translate.google.com/m"
 
 
 class GoogleTranslatorService(BaseTranslator):
+    PROVIDER_NAME = "Google"
+
     def __init__(self):
         # We don't maintain a persistent connection anymore to avoid state issues
         pass
@@ -23,7 +30,19 @@ class GoogleTranslatorService(BaseTranslator):
         if not text or text.strip() == "":
             return text
 
+        # Google has no JSON API here, the cassette stores {"text": ...} per request
+        payload = {"q": text, "target": target_lang}
+        if self.cassette is not None and self.cassette.replaying:
+            # No network and no rate limits, the recorded response comes back
+            data = await self.cassette.replay(self, CASSETTE_URL, payload)
+            return data["text"]
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(estimate_tokens(text))
+
         loop = asyncio.get_event_loop()
+        start = time.monotonic()
+        deep_error = None
 
         # Strategy 1: Try deep-translator first (more reliable recently)
         try:
@@ -34,10 +53,11 @@ class GoogleTranslatorService(BaseTranslator):
             result = await asyncio.wait_for(
                 loop.run_in_executor(None, _deep_translate), timeout=10.0
             )
+            self._report(payload, 200, start, {"text": result})
             return result
         except Exception as e1:
             # print(f"DeepTranslator failed: {e1}, falling back to googletrans...")
-            pass
+            deep_error = e1
 
         # Strategy 2: Fallback to googletrans (legacy)
         try:
@@ -49,10 +69,22 @@ class GoogleTranslatorService(BaseTranslator):
             result = await asyncio.wait_for(
                 loop.run_in_executor(None, _googletrans_translate), timeout=10.0
             )
+            self._report(payload, 200, start, {"text": result})
             return result
         except asyncio.TimeoutError:
+            self._report(payload, 0, start, "timed out")
             raise Exception("Google Translate API timed out (both strategies)")
         except Exception as e:
+            # deep-translator raises TooManyRequests when Google throttles us
+            status = 429 if "TooManyRequests" in type(deep_error).__name__ else 0
+            self._report(payload, status, start, str(e))
             # googletrans sometimes raises weird errors or SSL errors
             # We want to re-raise them so the retry logic catches them
             raise Exception(f"Google Translate API Error: {str(e)}")
+
+    def _report(self, payload: dict, status: int, start: float, body):
+        """Reports a call to the listeners and records it if a cassette is recording."""
+        latency = time.monotonic() - start
+        self.report_response(status, latency)
+        if self.cassette is not None:
+            self.cassette.record(CASSETTE_URL, payload, status, body, latency)
@@ -0,0 +1,109 @@
+import re
+from functools import lru_cache
+
+# HOI4 localisation markup that must reach the translator untouched. Every kind
+# starts with its own character ([ $ § £ \), so the patterns are joined into one
+# plain alternation: re then only stops at those characters and a single split()
+# finds every span.
+
+# Characters of a scope command / scripted loc: [Root.GetName], [?var|%G0], [!concept]
+SCOPE_CHARS = r"[A-Za-z0-9_.?!|%@:^+\-]"
+# Brackets nested inside a scope command, e.g. [Root.GetFlag[THIS.Tag]]
+MAX_SCOPE_DEPTH = 3
+
+# Distinct spans whose type is remembered, the map is reset when it grows past this
+MAX_TYPE_CACHE = 10_000
+
+# Placeholder names built once, longer texts build the rest on the fly
+_VAR_PLACEHOLDERS = [f"__VAR{idx}__" for idx in range(256)]
+
+
+def _scope_pattern(depth: int) -> str:
+    body = f"{SCOPE_CHARS}+"
+    for _ in range(depth):
+        body = rf"(?:{SCOPE_CHARS}|\[{body}\])+"
+    return rf"\[{body}\]"
+
+
+# (pattern, type). Patterns must not contain capturing groups.
+MARKUP_PATTERNS = (
+    (_scope_pattern(MAX_SCOPE_DEPTH), "SCOPECMD"),  # [GetName], [Root.GetName]
+    (r"\$[A-Za-z0-9_]+(?:\|[^$\s]*)?\$", "VARIABLE"),  # $var$, $VALUE|%+0$
+    (r"§[A-Za-z!]", "COLOR"),  # §Y, §!, §R
+    (r"£[A-Za-z0-9_]+(?:\|[0-9]+)?£?", "ICON"),  # £icon, £icon£, £icon|2£
+    (r"\\n", "NEWLINE"),  # \n literal
+)
+
+# Placeholders produced by extract_markup / BaseTranslator.apply_glossary_as_variables
+PLACEHOLDER_PATTERN = re.compile(r"__(?:VAR|GLS)\d+__")
+_PLACEHOLDER_SPLIT = re.compile(r"(__(?:VAR|GLS)\d+__)")
+
+
+class MarkupTokenizer:
+    """Preserve patterns compiled into one regex, see compile_markup."""
+
+    def __init__(self, patterns: tuple):
+        self.patterns = [
+            (re.compile(pattern), var_type) for pattern, var_type in patterns
+        ]
+        # A group around the bare alternation: split() returns text, span, text, ...
+        self.regex = re.compile(
+            "(" + "|".join(pattern for pattern, _ in patterns) + ")"
+        )
+        self._types = {}  # span -> type
+
+    def type_of(self, span: str) -> str:
+        var_type = self._types.get(span)
+        if var_type is None:
+            var_type = next(
+                (t for pattern, t in self.patterns if pattern.fullmatch(span)), None
+            )
+            if len(self._types) >= MAX_TYPE_CACHE:
+                self._types.clear()
+            self._types[span] = var_type
+        return var_type
+
+    def extract(self, text: str) -> tuple[str, list]:
+        parts = self.regex.split(text)
+        if len(parts) == 1:
+            return text, []
+        spans = parts[1::2]
+        count = len(spans)
+        if count <= len(_VAR_PLACEHOLDERS):
+            placeholders = _VAR_PLACEHOLDERS[:count]
+        else:
+            placeholders = [f"__VAR{idx}__" for idx in range(count)]
+        parts[1::2] = placeholders
+
+        types = self._types
+        var_types = [types.get(span) for span in spans]
+        if None in var_types:
+            var_types = [self.type_of(span) for span in spans]
+        return "".join(parts), list(zip(placeholders, spans, var_types))
+
+
+@lru_cache(maxsize=None)
+def compile_markup(patterns: tuple = MARKUP_PATTERNS) -> MarkupTokenizer:
+    return MarkupTokenizer(patterns)
+
+
+def extract_markup(text: str, tokenizer: MarkupTokenizer = None) -> tuple[str, list]:
+    """
+    Replaces every markup span with __VAR{n}__ (numbered left to right) in one pass.
+    Returns (modified_text, [(placeholder, original, type), ...])
+    """
+    return (tokenizer or compile_markup()).extract(text)
+
+
+def restore_markup(text: str, extractions: list) -> str:
+    """Puts the originals back for every known placeholder, in one pass."""
+    if not extractions:
+        return text
+    parts = _PLACEHOLDER_SPLIT.split(text)
+    if len(parts) == 1:
+        return text
+    originals = {placeholder: original for placeholder, original, _ in extractions}
+    parts[1::2] = [
+        originals.get(placeholder, placeholder) for placeholder in parts[1::2]
+    ]
+    return "".join(parts)
@@ -1,5 +1,5 @@
 import aiohttp
-from .base import BaseTranslator
+from .base import BaseTranslator, ProviderError
 
 
 class OllamaTranslatorService(BaseTranslator):
@@ -10,6 +10,8 @@ class OllamaTranslatorService(BaseTranslator):
     """
 
     SUPPORTS_NATIVE_GLOSSARY = True
+    SUPPORTS_BATCH = True
+    PROVIDER_NAME = "Ollama"
 
     def __init__(
         self,
@@ -27,107 +29,67 @@ class OllamaTranslatorService(BaseTranslator):
         if not text or text.strip() == "":
             return text
 
-        lang_map = {
-            "ko": "Korean",
-            "en": "English",
-            "ja": "Japanese",
-            "zh": "Chinese",
-            "zh-CN": "Chinese Simplified",
-            "zh-TW": "Chinese Traditional",
-        }
-        target = lang_map.get(target_lang, target_lang)
-
-        glossary_text = ""
-        if self.glossary:
-            glossary_text = "\nGLOSSARY (Use these exact translations):\n"
-            for k, v in self.glossary.items():
-                glossary_text += f"- {k}: {v}\n"
-
-        ho4_official_guide = (
-            "You are the Lead Korean Localizer for Paradox Interactive's 'Hearts of Iron IV'.\\n"
-            "Your mandate is to translate game text from English to Korean, STRICTLY following the official localization standards found in the game's `localisation/korean` folder.\\n\\n"
-            "***OFFICIAL HOI4 KOREAN STYLE GUIDE***\\n\\n"
-            "1. **Tone & Grammar (CRITICAL)**:\\n"
-            "   - **Narrative/Descriptions (Events, Lore)**: Use formal 'Hapsho-che' (합쇼체, ~습니다). It must sound like a 1940s military report, diplomatic cable, or historical record. Dry, serious, and professional.\\n"
-            "   - **Tooltips/Effects/Modifiers**: Use concise Noun Endings (~함, ~임, ~증가, ~감소). NEVER use full sentences here. (e.g., 'Gain 50 PP' -> '정치력 50 획득', not '획득합니다')\\n"
-            "   - **Interface/Buttons/Options**: Use concise Plain Form (해라체, ~다) or Noun Phrases.\\n\\n"
-            "2. **Mandatory Terminology (Do NOT deviate)**:\\n"
-            "   - Manpower -> 인력\\n"
-            "   - Stability -> 안정도\\n"
-            "   - War Support -> 전쟁 지지도\\n"
-            "   - Organization -> 조직력\\n"
-            "   - Division -> 사단 (Military Unit)\\n"
-            "   - Infrastructure -> 기반시설\\n"
-            "   - Factory -> 공장\\n"
-            "   - Equipment -> 장비\\n"
-            "   - Civilian Industry -> 민간 산업\\n"
-            "   - Army -> 육군 (Specific branch), 군 (General)\\n"
-            "   - Navy -> 해군\\n"
-            "   - Air force -> 공군\\n"
-            "   - Cheat -> 치트\\n"
-            "   - Buff -> 버프\\n"
-            "   - Debuff -> 디버프\\n"
-            "   - National Focus -> 국가 중점\\n\\n"
-            "3. **Formatting & Safety**:\\n"
-            "   - **PRESERVE** all special codes: §Y, §R, §G, §!, $VAR$, [Root.GetName], £icon£, \\n.\\n"
-            "   - **NO CHINESE CHARACTERS (Hanja)**: Use Korean Hangul ONLY unless the source is explicitly Chinese.\\n"
-            "   - **NO THINKING**: Do not output your thought process. Output ONLY the final translated text.\\n"
-            "   - **Keys**: If the input looks like a code key (e.g., `political_power_gain`), return it unchanged.\\n"
+        system_content = self.build_system_prompt(
+            target_lang, glossary=self.glossary_for([text])
         )
 
-        system_content = (
-            f"{ho4_official_guide}\\n"
-            f"4. **Glossary (User Provided)**:\\n{glossary_text}\\n\\n"
-            f"Translate the following text to {target}:"
-        )
+        try:
+            result = await self._send(system_content, text)
+        except Exception as e:
+            print(f"Ollama translation error: {e}")
+            return text
+
+        return result if result is not None else text
+
+    async def translate_batch(self, items: list, target_lang: str) -> dict:
+        """Translates all items in a single chat request."""
+
+        async def send_batch(system_content, user_content):
+            # A batch answer is much longer than a single entry
+            return await self._send(system_content, user_content, num_predict=8192)
+
+        return await self._translate_batch_via_prompt(items, target_lang, send_batch)
 
+    async def _send(
+        self, system_content: str, user_content: str, num_predict: int = 2048
+    ) -> str:
+        """Sends one chat request. Raises ProviderError on failure."""
         messages = [
             {"role": "system", "content": system_content},
-            {"role": "user", "content": text},
+            {"role": "user", "content": user_content},
         ]
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": False,
+            "options": {
+                "temperature": 0.1,  # Lower temperature to prevent hallucinations
+                "num_predict": num_predict,
+            },
+        }
+        headers = {"Content-Type": "application/json"}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "model": self.model,
-                    "messages": messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,  # Lower temperature to prevent hallucinations
-                        "num_predict": 2048,
-                    },
-                }
-                headers = {"Content-Type": "application/json"}
-
-                async with session.post(
-                    self.api_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=120),
-                ) as resp:
-                    if resp.status == 200:
-                        # Skip content-type check because Ollama sometimes returns text/plain for JSON
-                        data = await resp.json(content_type=None)
+            data = await self.post_json(
+                self.api_url, payload, headers=headers, timeout=120
+            )
+        except ProviderError as e:
+            if e.status == 404:
+                print(
+                    f"Ollama error: 404 (Model '{self.model}' not found? Try 'ollama pull {self.model}')"
+                )
+            raise
 
-                        # Ollama chat API response format
-                        result_text = text
-                        if "message" in data:
-                            result_text = data["message"]["content"]
-                        elif "response" in data:
-                            result_text = data["response"]
-
-                        return self.clean_thinking_content(result_text)
-                    elif resp.status == 404:
-                        print(
-                            f"Ollama error: 404 (Model '{self.model}' not found? Try 'ollama pull {self.model}')"
-                        )
-                        return text
-                    else:
-                        print(f"Ollama error: {resp.status} - {await resp.text()}")
-                        return text
-        except Exception as e:
-            print(f"Ollama translation error: {e}")
-            return text
+        # Ollama chat API response format
+        result_text = None
+        if "message" in data:
+            result_text = data["message"]["content"]
+        elif "response" in data:
+            result_text = data["response"]
+
+        if result_text is None:
+            return None
+        return self.clean_thinking_content(result_text)
 
     async def get_available_models(self) -> list:
         """Fetch available models from Ollama API."""
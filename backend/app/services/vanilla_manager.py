@@ -101,3 +101,19 @@ class VanillaManager:
 
     def get_translation(self, english_text: str) -> str:
         return self.translation_memory.get(english_text)
+
+
+# Loaded databases, { (vanilla_path, target_lang): VanillaManager }.
+# Reading the whole game takes a while, so every task and estimate reuses them.
+_managers = {}
+
+
+def get_vanilla_manager(vanilla_path: str, target_lang: str) -> VanillaManager:
+    """Returns a loaded VanillaManager for the game folder and HoI4 language folder name."""
+    key = (os.path.normpath(vanilla_path), target_lang)
+    manager = _managers.get(key)
+    if manager is None:
+        manager = VanillaManager(vanilla_path, target_lang)
+        manager.load_database()
+        _managers[key] = manager
+    return manager
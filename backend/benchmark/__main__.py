@@ -0,0 +1,302 @@
+"""
+End-to-end benchmark of ModGenerator.generate_translation_mod with a fake translator.
+
+    python -m backend.benchmark --size medium --latency 0.8 --output bench.json
+    python -m backend.benchmark --mod path/to/mod --failure-rate 0.05
+    python -m backend.benchmark --size small --compare bench.json
+    python -m backend.benchmark --profile gemini --provider-url http://127.0.0.1:8765
+
+    python -m backend.benchmark --profile openai --provider-url URL --record run.jsonl.gz
+    python -m backend.benchmark --profile openai --replay run.jsonl.gz
+
+With --provider-url the real translator service of --profile is used against that
+server (see backend.benchmark.mock_provider) instead of the in-process fake.
+--replay runs the real service from a recorded cassette, without any network.
+
+Runs in a temporary working folder (output, journal and cache stay out of the
+real ones) and writes entries/sec, wall time, peak RSS and event-loop lag to JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from backend.app.services import cpu_pool, metrics, task_manager
+from backend.app.services.latency_stats import percentile
+from backend.app.services.mod_generator import ModGenerator, SCHEDULES
+from backend.benchmark.fake_translator import FakeTranslatorService
+from backend.benchmark.synthetic_mod import SIZES, generate_mod
+
+# Event loop lag probe interval (seconds)
+LAG_PROBE_INTERVAL = 0.05
+
+
+class BenchmarkGenerator(ModGenerator):
+    """
+    ModGenerator whose translator is a FakeTranslatorService, or the real service
+    when a provider URL is given in the service config.
+    """
+
+    def __init__(self, fake_options: dict):
+        super().__init__()
+        self.fake_options = fake_options
+        self.translator = None
+
+    def _create_translator(self, service: str, service_config: dict, glossary=None):
+        if service_config:
+            self.translator = super()._create_translator(
+                service, service_config, glossary
+            )
+        else:
+            self.translator = FakeTranslatorService(
+                glossary=glossary, **self.fake_options
+            )
+        return self.translator
+
+
+def _mock_service_config(service: str, url: str) -> dict:
+    """Points the service at a mock provider, with a dummy API key."""
+    return {f"{service}_url": url, f"{service}_key": "benchmark"}
+
+
+def _service_config(args) -> dict:
+    """Empty (fake translator) unless a provider URL or a cassette is given."""
+    config = {}
+    if args.provider_url:
+        config.update(_mock_service_config(args.profile, args.provider_url))
+    cassette = args.record or args.replay
+    if cassette:
+        config.setdefault(f"{args.profile}_key", "benchmark")
+        config["cassette"] = {
+            "mode": "record" if args.record else "replay",
+            # The benchmark runs in a temporary working folder
+            "path": os.path.abspath(cassette),
+            "timing": args.replay_timing,
+        }
+    return config
+
+
+async def _measure_loop_lag(samples: list, stop: asyncio.Event):
+    """Records how late the loop wakes up a sleeping coroutine."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+def _peak_rss_mb() -> dict:
+    """Peak resident memory of this process and of the finished CPU pool workers."""
+    if resource is None:
+        return {"self": None, "children": None}
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1
+        ),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+async def run_benchmark(args) -> dict:
+    service_config = _service_config(args)
+    workdir = tempfile.mkdtemp(prefix="hoi4_bench_")
+    original_cwd = os.getcwd()
+    try:
+        if args.mod:
+            mod_path = os.path.abspath(args.mod)
+            mod_info = {"path": mod_path, "files": None, "entries": None}
+        else:
+            files, entries = SIZES[args.size]
+            mod_info = generate_mod(
+                os.path.join(workdir, "mod"),
+                args.files or files,
+                args.entries or entries,
+                duplicate_rate=args.duplicate_rate,
+                seed=args.seed,
+            )
+            mod_path = mod_info["path"]
+
+        # Journal and cache are relative to the working folder
+        os.chdir(workdir)
+        generator = BenchmarkGenerator(
+            {
+                "latency": args.latency,
+                "latency_jitter": args.latency_jitter,
+                "per_item_latency": args.per_item_latency,
+                "failure_rate": args.failure_rate,
+                "rate_limit_rate": args.rate_limit_rate,
+                "drop_rate": args.drop_rate,
+                "seed": args.seed,
+            }
+        )
+        task_id = task_manager.create_task()
+
+        lag_samples = []
+        stop = asyncio.Event()
+        lag_probe = asyncio.create_task(_measure_loop_lag(lag_samples, stop))
+
+        started = time.perf_counter()
+        result = await generator.generate_translation_mod(
+            {"path": mod_path, "name": "Benchmark Mod", "id": "bench"},
+            os.path.join(workdir, "out"),
+            task_id,
+            target_lang=args.target_lang,
+            service=args.profile,
+            service_config=service_config,
+            use_cache=args.cache,
+            schedule=args.schedule,
+        )
+        wall = time.perf_counter() - started
+
+        stop.set()
+        await lag_probe
+        # Reap the pool workers so their peak memory shows up in RUSAGE_CHILDREN
+        cpu_pool.shutdown_cpu_pool(wait=True)
+    finally:
+        os.chdir(original_cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    task = task_manager.get_task(task_id)
+    entries = task.get("total_entries", 0)
+    lag = sorted(lag_samples)
+    return {
+        "status": result.get("status"),
+        "error": result.get("error"),
+        "wall_seconds": round(wall, 3),
+        "entries": entries,
+        "files": task.get("total_files"),
+        "entries_per_second": round(entries / wall, 1) if wall > 0 else None,
+        "unique_entries": task.get("unique_entries"),
+        "provider_requests": int(
+            sum(
+                count
+                for (
+                    provider,
+                    status,
+                ), count in metrics.PROVIDER_REQUESTS.values.items()
+                if provider == generator.translator.PROVIDER_NAME
+            )
+        ),
+        "peak_rss_mb": _peak_rss_mb(),
+        "event_loop_lag_ms": {
+            "p50": round(percentile(lag, 0.5) * 1000, 2),
+            "p99": round(percentile(lag, 0.99) * 1000, 2),
+            "max": round(lag[-1] * 1000, 2) if lag else 0.0,
+        },
+        "batch_latency": task.get("batch_latency"),
+        "packing": task.get("packing"),
+        "concurrency_limit": (task.get("concurrency") or {}).get("limit"),
+        "cassette": task.get("cassette"),
+        "mod": {key: value for key, value in mod_info.items() if key != "path"},
+    }
+
+
+def _compare(current: dict, previous: dict):
+    """Prints the change of the headline numbers against an earlier result file."""
+    old = previous.get("results", {})
+    new = current["results"]
+    print(f"\nCompared with {previous.get('commit')} ({previous.get('timestamp')}):")
+    for key in ("wall_seconds", "entries_per_second"):
+        if old.get(key) and new.get(key):
+            change = (new[key] - old[key]) / old[key] * 100
+            print(f"  {key}: {old[key]} -> {new[key]} ({change:+.1f}%)")
+    old_rss = (old.get("peak_rss_mb") or {}).get("self")
+    new_rss = (new.get("peak_rss_mb") or {}).get("self")
+    if old_rss and new_rss:
+        print(f"  peak_rss_mb: {old_rss} -> {new_rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.benchmark",
+        description="End-to-end throughput benchmark of the translation pipeline.",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--size", choices=sorted(SIZES), default="small")
+    source.add_argument("--mod", help="Existing mod folder instead of a synthetic one")
+    parser.add_argument("--files", type=int, help="Synthetic mod: number of files")
+    parser.add_argument("--entries", type=int, help="Synthetic mod: number of entries")
+    parser.add_argument("--duplicate-rate", type=float, default=0.15)
+    parser.add_argument(
+        "--profile",
+        default="openai",
+        help="Provider whose batch budgets and concurrency limits are used",
+    )
+    parser.add_argument(
+        "--provider-url",
+        help="Use the real --profile service against this (mock) server",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", help="Record the provider traffic to this file")
+    cassette.add_argument("--replay", help="Replay a recorded cassette, no network")
+    parser.add_argument(
+        "--replay-timing",
+        action="store_true",
+        help="Replayed calls take as long as the recorded ones",
+    )
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--latency-jitter", type=float, default=0.5)
+    parser.add_argument("--per-item-latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--target-lang", default="ko")
+    parser.add_argument("--schedule", choices=SCHEDULES, default=SCHEDULES[0])
+    parser.add_argument("--cache", action="store_true", help="Use a fresh cache")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="benchmark_result.json")
+    parser.add_argument("--compare", help="Earlier result file to compare with")
+    parser.add_argument("--keep", action="store_true", help="Keep the working folder")
+    args = parser.parse_args()
+    if args.record and not args.provider_url:
+        parser.error("--record needs --provider-url")
+
+    results = asyncio.run(run_benchmark(args))
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            _compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import random
+
+from backend.app.services.rate_limiter import estimate_tokens
+from backend.app.services.translator.base import BaseTranslator, ProviderError
+
+
+class FakeTranslatorService(BaseTranslator):
+    """
+    Translator without a network, for benchmarks.
+    Every request sleeps for a simulated latency and goes through the same batch
+    prompt/parse path as the LLM services. Failures and rate limits are injected
+    at the configured rates and reported like real provider responses, so the
+    adaptive concurrency and retry logic see them.
+    """
+
+    SUPPORTS_NATIVE_GLOSSARY = True
+    SUPPORTS_BATCH = True
+    PROVIDER_NAME = "Fake"
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        latency_jitter: float = 0.5,
+        per_item_latency: float = 0.0,
+        failure_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        seed: int = None,
+        glossary: dict = None,
+    ):
+        """
+        latency: median seconds per request (log-normal, latency_jitter is sigma)
+        per_item_latency: extra seconds per batch item (output generation)
+        failure_rate: share of requests failing with HTTP 500
+        rate_limit_rate: share of requests answered with 429
+        drop_rate: share of batch items missing from the answer (re-sent one by one)
+        """
+        self.model = "fake"
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.per_item_latency = per_item_latency
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.drop_rate = drop_rate
+        self.glossary = glossary
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    async def translate(self, text: str, target_lang: str) -> str:
+        if not text or text.strip() == "":
+            return text
+        return await self._send("", text)
+
+    async def translate_batch(self, items: list, target_lang: str) -> dict:
+        return await self._translate_batch_via_prompt(items, target_lang, self._send)
+
+    async def _send(self, system_prompt: str, user_content: str) -> str:
+        """Simulates one provider request. Raises ProviderError on injected errors."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(
+                estimate_tokens(system_prompt + user_content)
+            )
+
+        self.requests += 1
+        items = None
+        if user_content.startswith("[{"):
+            items = json.loads(user_content)
+
+        latency = self.latency * self.random.lognormvariate(0, self.latency_jitter)
+        latency += self.per_item_latency * (len(items) if items else 1)
+        await asyncio.sleep(latency)
+
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            self.report_response(429, latency, 1.0)
+            raise ProviderError(self.PROVIDER_NAME, 429, "Rate limited", 1.0)
+        if roll < self.rate_limit_rate + self.failure_rate:
+            self.report_response(500, latency)
+            raise ProviderError(self.PROVIDER_NAME, 500, "Injected failure")
+        self.report_response(200, latency)
+
+        if items is None:
+            return f"[T] {user_content}"
+        return json.dumps(
+            [
+                {"id": item["id"], "text": f"[T] {item['text']}"}
+                for item in items
+                if self.random.random() >= self.drop_rate
+            ],
+            ensure_ascii=False,
+        )
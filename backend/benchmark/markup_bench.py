@@ -0,0 +1,132 @@
+"""
+Microbenchmark of the markup preservation (extract + restore) on realistic strings.
+
+    python -m backend.benchmark.markup_bench
+    python -m backend.benchmark.markup_bench --repeat 2000
+
+Compares the single-pass tokenizer (translator/markup.py) with the former
+per-pattern implementation, which is kept here as the reference.
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from backend.app.services.translator.markup import (
+    compile_markup,
+    extract_markup,
+    restore_markup,
+)
+from backend.benchmark.synthetic_mod import _sentence
+
+# The patterns and algorithm used before the tokenizer
+LEGACY_PATTERNS = [
+    (r"\[([A-Za-z0-9_.]+)\]", "SCOPECMD"),
+    (r"\$([A-Za-z0-9_]+)\$", "VARIABLE"),
+    (r"§([A-Za-z!])", "COLOR"),
+    (r"£([A-Za-z0-9_]+)", "ICON"),
+    (r"\\n", "NEWLINE"),
+]
+
+
+def legacy_extract(text: str) -> tuple[str, list]:
+    extractions = []
+    modified = text
+    placeholder_idx = 0
+    for pattern, var_type in LEGACY_PATTERNS:
+        matches = list(re.finditer(pattern, modified))
+        for match in reversed(matches):
+            placeholder = f"__VAR{placeholder_idx}__"
+            extractions.append((placeholder, match.group(0), var_type))
+            modified = modified[: match.start()] + placeholder + modified[match.end() :]
+            placeholder_idx += 1
+    return modified, extractions
+
+
+def legacy_restore(text: str, extractions: list) -> str:
+    for placeholder, original, _ in extractions:
+        text = text.replace(placeholder, original)
+    return text
+
+
+_CODES = (
+    "§Y{}§!",
+    "[Root.GetName]",
+    "[From.GetLeader]",
+    "[ROOT.Capital.GetName]",
+    "$COUNTRY$",
+    "£pol_power ",
+    "\\n",
+    "\\n\\n",
+)
+
+
+def _marked_up(rng: random.Random, words: int, codes: int) -> str:
+    """A sentence of the given length with codes spread through it."""
+    text = _sentence(rng, words)
+    for _ in range(codes):
+        code = rng.choice(_CODES)
+        if "{}" in code:
+            code = code.format(rng.choice(text.split()))
+        position = text.find(" ", rng.randint(0, len(text)))
+        if position == -1:
+            position = len(text)
+        text = f"{text[:position]} {code}{text[position:]}"
+    return text
+
+
+def sample_texts(seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    return {
+        "ui string (2 codes)": [_marked_up(rng, 3, 2) for _ in range(50)],
+        "tooltip (8 codes)": [_marked_up(rng, 25, 8) for _ in range(50)],
+        "event text (40 codes)": [_marked_up(rng, 150, 40) for _ in range(20)],
+        "long event text (120 codes)": [_marked_up(rng, 400, 120) for _ in range(10)],
+    }
+
+
+def _round_trip_new(texts, regex):
+    for text in texts:
+        cleaned, extractions = extract_markup(text, regex)
+        restore_markup(cleaned, extractions)
+
+
+def _round_trip_legacy(texts):
+    for text in texts:
+        cleaned, extractions = legacy_extract(text)
+        legacy_restore(cleaned, extractions)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmark.markup_bench")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    regex = compile_markup()
+    print(f"{'texts':<30}{'legacy us':>12}{'tokenizer us':>14}{'speedup':>10}")
+    for name, texts in sample_texts(args.seed).items():
+        for text in texts:
+            cleaned, extractions = extract_markup(text, regex)
+            assert restore_markup(cleaned, extractions) == text
+
+        legacy = min(
+            timeit.repeat(
+                lambda: _round_trip_legacy(texts), number=args.repeat, repeat=3
+            )
+        )
+        new = min(
+            timeit.repeat(
+                lambda: _round_trip_new(texts, regex), number=args.repeat, repeat=3
+            )
+        )
+        per_text = args.repeat * len(texts) / 1e6
+        print(
+            f"{name:<30}{legacy / per_text:>12.1f}{new / per_text:>14.1f}"
+            f"{legacy / new:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
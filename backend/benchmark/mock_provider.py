@@ -0,0 +1,508 @@
+"""
+Mock translation provider for offline load tests.
+
+    python -m backend.benchmark.mock_provider --port 8765 --latency 0.8 --rpm 60
+
+Speaks the wire formats the translator services use:
+    OpenAI     POST /v1/chat/completions, GET /v1/models
+    Anthropic  POST /v1/messages
+    Gemini     POST /v1beta/models/{model}:generateContent, GET /v1beta/models
+    Ollama     POST /api/chat, GET /api/tags
+and answers every text with "[T] <text>" (batch JSON arrays keep their ids).
+Point the app at it with the openai_url / claude_url / gemini_url / ollama_url
+service settings. GET /_mock/stats returns what the server has seen so far.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import deque
+
+from aiohttp import web
+
+from backend.app.services.rate_limiter import estimate_tokens
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "exponential")
+
+# Quota window of the per-key rpm/tpm limits (seconds)
+QUOTA_WINDOW = 60.0
+
+
+class MockProvider:
+    """Latency, error injection and per-key quotas shared by all endpoints."""
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        distribution: str = "lognormal",
+        jitter: float = 0.5,
+        per_item_latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        drop_rate: float = 0.0,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrent: int = 0,
+        seed: int = None,
+    ):
+        """
+        latency: typical seconds per request, shaped by distribution:
+            fixed (always latency), uniform (latency +- jitter share),
+            lognormal (median latency, sigma jitter), exponential (mean latency)
+        per_item_latency: extra seconds per batch item
+        error_rate / rate_limit_rate: share of requests answered with 500 / 429
+        drop_rate: share of batch items left out of the answer
+        rpm / tpm: per API key requests and tokens per minute (0: unlimited)
+        max_concurrent: requests in flight before answering 503/529 (0: unlimited)
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency = latency
+        self.distribution = distribution
+        self.jitter = jitter
+        self.per_item_latency = per_item_latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.drop_rate = drop_rate
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrent = max_concurrent
+        self.random = random.Random(seed)
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.windows = {}  # api key -> deque of (time, tokens)
+        self.stats = {}  # "provider status" -> count
+        self.keys = {}  # api key -> requests
+        self.items = 0
+
+    def sample_latency(self, items: int) -> float:
+        if self.distribution == "fixed":
+            latency = self.latency
+        elif self.distribution == "uniform":
+            spread = self.latency * self.jitter
+            latency = self.random.uniform(self.latency - spread, self.latency + spread)
+        elif self.distribution == "lognormal":
+            latency = self.latency * self.random.lognormvariate(0, self.jitter)
+        else:
+            latency = self.random.expovariate(1 / self.latency) if self.latency else 0
+        return max(0.0, latency) + self.per_item_latency * items
+
+    def check_quota(self, key: str, tokens: int):
+        """
+        Counts the request against the key's sliding window.
+        Returns None when allowed, otherwise the seconds until it would be.
+        """
+        if not self.rpm and not self.tpm:
+            return None
+        now = time.monotonic()
+        window = self.windows.setdefault(key, deque())
+        while window and window[0][0] <= now - QUOTA_WINDOW:
+            window.popleft()
+
+        if self.rpm and len(window) >= self.rpm:
+            return window[0][0] + QUOTA_WINDOW - now
+        if self.tpm:
+            used = sum(entry[1] for entry in window)
+            if used + tokens > self.tpm:
+                # Wait until enough of the window has expired
+                for entry_time, entry_tokens in window:
+                    used -= entry_tokens
+                    if used + tokens <= self.tpm:
+                        return entry_time + QUOTA_WINDOW - now
+                return QUOTA_WINDOW
+        window.append((now, tokens))
+        return None
+
+    def count(self, provider: str, status: int):
+        name = f"{provider} {status}"
+        self.stats[name] = self.stats.get(name, 0) + 1
+
+    def translate(self, content: str) -> str:
+        """[T] prefix for plain text, the same JSON array back for batch content."""
+        if not content.startswith("[{"):
+            return f"[T] {content}"
+        items = json.loads(content)
+        self.items += len(items)
+        return json.dumps(
+            [
+                {"id": item["id"], "text": f"[T] {item['text']}"}
+                for item in items
+                if self.random.random() >= self.drop_rate
+            ],
+            ensure_ascii=False,
+        )
+
+    async def handle(self, provider: str, key: str, prompt: str, content: str):
+        """
+        Runs one simulated request.
+        Returns (status, retry_after, answer text); answer is None on errors.
+        """
+        self.keys[key] = self.keys.get(key, 0) + 1
+
+        retry_after = self.check_quota(key, estimate_tokens(prompt + content))
+        if retry_after is not None:
+            self.count(provider, 429)
+            return 429, retry_after, None
+
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            status = 529 if provider == "anthropic" else 503
+            self.count(provider, status)
+            return status, None, None
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            items = content.count('{"id":') if content.startswith("[{") else 1
+            await asyncio.sleep(self.sample_latency(items))
+        finally:
+            self.in_flight -= 1
+
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            self.count(provider, 429)
+            return 429, self.retry_after, None
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.count(provider, 500)
+            return 500, None, None
+
+        self.count(provider, 200)
+        return 200, None, self.translate(content)
+
+    def snapshot(self) -> dict:
+        return {
+            "responses": dict(sorted(self.stats.items())),
+            "keys": self.keys,
+            "batch_items": self.items,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+def _bearer_key(request) -> str:
+    auth = request.headers.get("Authorization", "")
+    return auth[7:] if auth.startswith("Bearer ") else "anonymous"
+
+
+def _error_response(status: int, body: dict, retry_after=None) -> web.Response:
+    headers = {}
+    if retry_after is not None:
+        headers["Retry-After"] = str(max(1, round(retry_after)))
+    return web.json_response(body, status=status, headers=headers)
+
+
+# --- OpenAI --------------------------------------------------------------------
+
+
+async def openai_chat(request):
+    mock = request.app["mock"]
+    data = await request.json()
+    messages = data.get("messages", [])
+    prompt = "".join(m["content"] for m in messages if m["role"] == "system")
+    content = next(
+        (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+    )
+
+    status, retry_after, answer = await mock.handle(
+        "openai", _bearer_key(request), prompt, content
+    )
+    if status == 429:
+        return _error_response(
+            429,
+            {
+                "error": {
+                    "message": "Rate limit reached for requests. "
+                    f"Please try again in {retry_after:.3f}s.",
+                    "type": "requests",
+                    "code": "rate_limit_exceeded",
+                }
+            },
+            retry_after,
+        )
+    if status != 200:
+        return _error_response(
+            status,
+            {"error": {"message": "The server had an error", "type": "server_error"}},
+        )
+    return web.json_response(
+        {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": data.get("model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": estimate_tokens(prompt + content),
+                "completion_tokens": estimate_tokens(answer),
+            },
+        }
+    )
+
+
+async def openai_models(request):
+    return web.json_response(
+        {
+            "object": "list",
+            "data": [
+                {"id": "gpt-4o-mini", "object": "model"},
+                {"id": "gpt-4o", "object": "model"},
+            ],
+        }
+    )
+
+
+# --- Anthropic -----------------------------------------------------------------
+
+
+async def anthropic_messages(request):
+    mock = request.app["mock"]
+    data = await request.json()
+    prompt = data.get("system") or ""
+    if isinstance(prompt, list):
+        prompt = "".join(block.get("text", "") for block in prompt)
+    messages = data.get("messages", [])
+    content = messages[-1]["content"] if messages else ""
+    if isinstance(content, list):
+        content = "".join(block.get("text", "") for block in content)
+    key = request.headers.get("x-api-key", "anonymous")
+
+    status, retry_after, answer = await mock.handle("anthropic", key, prompt, content)
+    if status == 429:
+        return _error_response(
+            429,
+            {
+                "type": "error",
+                "error": {
+                    "type": "rate_limit_error",
+                    "message": "Number of requests has exceeded your rate limit.",
+                },
+            },
+            retry_after,
+        )
+    if status != 200:
+        error_type = "overloaded_error" if status == 529 else "api_error"
+        return _error_response(
+            status,
+            {"type": "error", "error": {"type": error_type, "message": "Mock error"}},
+        )
+    return web.json_response(
+        {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": data.get("model"),
+            "content": [{"type": "text", "text": answer}],
+            "stop_reason": "end_turn",
+            "usage": {
+                "input_tokens": estimate_tokens(prompt + content),
+                "output_tokens": estimate_tokens(answer),
+            },
+        }
+    )
+
+
+# --- Gemini --------------------------------------------------------------------
+
+
+def _split_gemini_prompt(text: str):
+    """GeminiService sends f"{prompt}\\n{user_content}" as a single part."""
+    batch_start = text.find('\\n[{"id"')
+    if batch_start != -1:
+        return text[:batch_start], text[batch_start + 2 :]
+    prompt, _, content = text.rpartition("\\n")
+    return prompt, content
+
+
+async def gemini_generate(request):
+    model, _, action = request.match_info["model_action"].partition(":")
+    if action != "generateContent":
+        return web.json_response(
+            {"error": {"code": 404, "message": f"Unknown method {action}"}},
+            status=404,
+        )
+    mock = request.app["mock"]
+    data = await request.json()
+    parts = data["contents"][-1]["parts"]
+    prompt, content = _split_gemini_prompt("".join(p.get("text", "") for p in parts))
+    key = request.query.get("key", "anonymous")
+
+    status, retry_after, answer = await mock.handle("gemini", key, prompt, content)
+    if status == 429:
+        # No Retry-After header, the wait is only in the message (like the real API)
+        return web.json_response(
+            {
+                "error": {
+                    "code": 429,
+                    "message": "You exceeded your current quota, please check your "
+                    "plan and billing details. "
+                    f"Please retry in {retry_after:.6f}s.",
+                    "status": "RESOURCE_EXHAUSTED",
+                }
+            },
+            status=429,
+        )
+    if status != 200:
+        return web.json_response(
+            {
+                "error": {
+                    "code": status,
+                    "message": "An internal error has occurred.",
+                    "status": "INTERNAL" if status == 500 else "UNAVAILABLE",
+                }
+            },
+            status=status,
+        )
+    return web.json_response(
+        {
+            "candidates": [
+                {
+                    "content": {"parts": [{"text": answer}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {
+                "promptTokenCount": estimate_tokens(prompt + content),
+                "candidatesTokenCount": estimate_tokens(answer),
+            },
+            "modelVersion": model,
+        }
+    )
+
+
+async def gemini_models(request):
+    return web.json_response(
+        {
+            "models": [
+                {
+                    "name": f"models/{name}",
+                    "displayName": name,
+                    "supportedGenerationMethods": ["generateContent", "countTokens"],
+                }
+                for name in ("gemini-1.5-flash", "gemini-1.5-pro", "gemini-2.0-flash")
+            ]
+        }
+    )
+
+
+# --- Ollama --------------------------------------------------------------------
+
+
+async def ollama_chat(request):
+    mock = request.app["mock"]
+    data = await request.json()
+    messages = data.get("messages", [])
+    prompt = "".join(m["content"] for m in messages if m["role"] == "system")
+    content = next(
+        (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+    )
+
+    # Ollama has no keys, quotas apply per client address
+    status, retry_after, answer = await mock.handle(
+        "ollama", request.remote or "local", prompt, content
+    )
+    if status != 200:
+        return _error_response(status, {"error": "mock error"}, retry_after)
+    return web.json_response(
+        {
+            "model": data.get("model"),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": answer},
+            "done_reason": "stop",
+            "done": True,
+            "prompt_eval_count": estimate_tokens(prompt + content),
+            "eval_count": estimate_tokens(answer),
+        }
+    )
+
+
+async def ollama_tags(request):
+    return web.json_response(
+        {
+            "models": [
+                {"name": name, "model": name, "size": 0}
+                for name in ("gemma2:latest", "qwen2.5:7b", "llama3.1:8b")
+            ]
+        }
+    )
+
+
+async def stats(request):
+    return web.json_response(request.app["mock"].snapshot())
+
+
+def create_app(mock: MockProvider) -> web.Application:
+    app = web.Application(client_max_size=32 * 1024 * 1024)
+    app["mock"] = mock
+    app.router.add_post("/v1/chat/completions", openai_chat)
+    app.router.add_get("/v1/models", openai_models)
+    app.router.add_post("/v1/messages", anthropic_messages)
+    app.router.add_post("/v1beta/models/{model_action}", gemini_generate)
+    app.router.add_get("/v1beta/models", gemini_models)
+    app.router.add_post("/api/chat", ollama_chat)
+    app.router.add_get("/api/tags", ollama_tags)
+    app.router.add_get("/_mock/stats", stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.benchmark.mock_provider",
+        description="Mock OpenAI/Anthropic/Gemini/Ollama server for load tests.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument(
+        "--distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal"
+    )
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--per-item-latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Wait announced by injected 429s (quota 429s announce the real wait)",
+    )
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0, help="Requests/minute per key")
+    parser.add_argument("--tpm", type=int, default=0, help="Tokens/minute per key")
+    parser.add_argument("--max-concurrent", type=int, default=0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    mock = MockProvider(
+        latency=args.latency,
+        distribution=args.distribution,
+        jitter=args.jitter,
+        per_item_latency=args.per_item_latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        drop_rate=args.drop_rate,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        max_concurrent=args.max_concurrent,
+        seed=args.seed,
+    )
+    base_url = f"http://{args.host}:{args.port}"
+    print(f"Mock provider on {base_url}")
+    print(f"  service settings: openai_url/claude_url/gemini_url/ollama_url={base_url}")
+    web.run_app(create_app(mock), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
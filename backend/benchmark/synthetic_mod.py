@@ -0,0 +1,89 @@
+import os
+import random
+
+# name: (files, entries)
+SIZES = {
+    "small": (10, 1_000),
+    "medium": (60, 20_000),
+    "large": (250, 100_000),
+}
+
+_WORDS = (
+    "army division front supply industry factory stability war support manpower "
+    "navy convoy fleet doctrine research focus national spirit political power "
+    "decision mission faction alliance puppet annex occupy resistance compliance "
+    "the of and to with for our their new old great people government reform"
+).split()
+
+_PLACEHOLDERS = (
+    "$COUNTRY$",
+    "[Root.GetName]",
+    "[From.GetLeader]",
+    "§Y{}§!",
+    "£pol_power ",
+    "\\n",
+)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+    for _ in range(rng.randint(0, 2)):
+        placeholder = rng.choice(_PLACEHOLDERS)
+        if "{}" in placeholder:
+            placeholder = placeholder.format(rng.choice(_WORDS))
+        position = rng.randint(0, len(text))
+        text = f"{text[:position]} {placeholder} {text[position:]}"
+    return text.strip() + "."
+
+
+def generate_mod(
+    path: str,
+    files: int,
+    entries: int,
+    duplicate_rate: float = 0.15,
+    seed: int = 1,
+) -> dict:
+    """
+    Writes a mod with localisation/english/*_l_english.yml files to path.
+    Entries are a mix of short UI strings, tooltips and long event descriptions;
+    duplicate_rate of them repeat an earlier value (like real mods do).
+    Returns { "path", "files", "entries" }.
+    """
+    rng = random.Random(seed)
+    loc_dir = os.path.join(path, "localisation", "english")
+    os.makedirs(loc_dir, exist_ok=True)
+    with open(os.path.join(path, "descriptor.mod"), "w", encoding="utf-8") as f:
+        f.write('name="Benchmark Mod"\nsupported_version="1.*"\n')
+
+    values = []
+    per_file = max(1, entries // files)
+    written = 0
+    for file_idx in range(files):
+        count = per_file if file_idx < files - 1 else entries - written
+        lines = ["l_english:\n"]
+        for entry_idx in range(count):
+            if values and rng.random() < duplicate_rate:
+                value = rng.choice(values)
+            else:
+                kind = rng.random()
+                if kind < 0.5:
+                    value = _sentence(rng, rng.randint(1, 4))  # buttons, names
+                elif kind < 0.85:
+                    value = _sentence(rng, rng.randint(8, 25))  # tooltips
+                else:
+                    value = " ".join(
+                        _sentence(rng, rng.randint(10, 30))
+                        for _ in range(rng.randint(3, 8))
+                    )  # event descriptions
+                values.append(value)
+            value = value.replace('"', "'")
+            lines.append(f' bench_{file_idx}_{entry_idx}:0 "{value}"\n')
+        written += count
+        with open(
+            os.path.join(loc_dir, f"bench_{file_idx}_l_english.yml"),
+            "w",
+            encoding="utf-8-sig",
+        ) as f:
+            f.writelines(lines)
+
+    return {"path": path, "files": files, "entries": written}
@@ -0,0 +1,16 @@
+import pytest
+
+from backend.app.services import cpu_pool
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Runs the test in tmp_path: journals and the cache are relative to it."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _cpu_pool():
+    yield
+    cpu_pool.shutdown_cpu_pool(wait=True)
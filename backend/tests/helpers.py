@@ -0,0 +1,87 @@
+import asyncio
+import os
+
+from backend.app.services.mod_generator import ModGenerator
+from backend.app.services.translator.base import BaseTranslator
+
+
+class EchoTranslator(BaseTranslator):
+    """
+    Offline batch translator: "[T] " + text.
+    Batches with an item containing one of slow_words take slow_latency seconds;
+    texts in fail_texts come back unchanged (a silent provider failure).
+    """
+
+    SUPPORTS_NATIVE_GLOSSARY = True
+    SUPPORTS_BATCH = True
+    PROVIDER_NAME = "Echo"
+
+    def __init__(self, latency=0.01, slow_latency=0.5, slow_words=(), fail_texts=()):
+        self.model = "echo"
+        self.glossary = None
+        self.latency = latency
+        self.slow_latency = slow_latency
+        self.slow_words = slow_words
+        self.fail_texts = set(fail_texts)
+        self.sent = []  # texts of every request, batch items one by one
+
+    async def translate(self, text: str, target_lang: str) -> str:
+        if not text or text.strip() == "":
+            return text
+        return (await self._answer([text]))[0]
+
+    async def translate_batch(self, items: list, target_lang: str) -> dict:
+        texts = [text for _, text in items]
+        answers = await self._answer(texts)
+        return {item_id: answer for (item_id, _), answer in zip(items, answers)}
+
+    async def _answer(self, texts: list) -> list:
+        self.sent.extend(texts)
+        slow = any(word in text for text in texts for word in self.slow_words)
+        await asyncio.sleep(self.slow_latency if slow else self.latency)
+        return [text if text in self.fail_texts else f"[T] {text}" for text in texts]
+
+
+class EchoGenerator(ModGenerator):
+    """ModGenerator that translates with one shared EchoTranslator."""
+
+    def __init__(self, **translator_options):
+        super().__init__()
+        self.translator = EchoTranslator(**translator_options)
+
+    def _create_translator(self, service: str, service_config: dict, glossary=None):
+        self.translator.glossary = glossary
+        return self.translator
+
+
+def write_mod(root: str, mod_id: str, files: dict) -> dict:
+    """
+    Writes a mod with localisation/english files.
+    files: { file name without suffix: { key: value } }
+    """
+    path = os.path.join(root, mod_id)
+    loc_dir = os.path.join(path, "localisation", "english")
+    os.makedirs(loc_dir, exist_ok=True)
+    for name, entries in files.items():
+        lines = ["l_english:"] + [
+            f' {key}:0 "{value}"' for key, value in entries.items()
+        ]
+        with open(
+            os.path.join(loc_dir, f"{name}_l_english.yml"), "w", encoding="utf-8-sig"
+        ) as f:
+            f.write("\n".join(lines) + "\n")
+    return {"path": path, "name": mod_id, "id": mod_id}
+
+
+def read_translations(path: str) -> dict:
+    """{ key: value } of every localisation file under a generated mod."""
+    values = {}
+    for root, _, files in os.walk(os.path.join(path, "localisation")):
+        for name in files:
+            with open(os.path.join(root, name), encoding="utf-8-sig") as f:
+                for line in f:
+                    line = line.strip()
+                    if ":0 " in line:
+                        key, value = line.split(":0 ", 1)
+                        values[key] = value.strip('"')
+    return values
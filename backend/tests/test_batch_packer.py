@@ -0,0 +1,73 @@
+from backend.app.services.batch_packer import (
+    BATCH_ITEM_OVERHEAD_TOKENS,
+    BatchPacker,
+    estimate_output_tokens,
+    get_token_budget,
+)
+from backend.app.services.rate_limiter import estimate_tokens
+
+TEXT = "x" * 40  # 11 tokens, 19 with the item overhead
+
+
+def _pack(packer, texts):
+    batches = []
+    for text in texts:
+        batches.extend(packer.add(text))
+    last = packer.flush()
+    if last:
+        batches.append(last)
+    return batches
+
+
+def test_max_items_closes_a_batch():
+    batches = _pack(BatchPacker(3), [TEXT] * 7)
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+
+
+def test_input_budget_closes_a_batch():
+    input_tokens = estimate_tokens(TEXT) + BATCH_ITEM_OVERHEAD_TOKENS
+    packer = BatchPacker(100, input_budget=input_tokens * 4)
+
+    batches = _pack(packer, [TEXT] * 10)
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert packer.max_input == input_tokens * 4
+    assert packer.stats()["batches"] == 3
+
+
+def test_output_budget_depends_on_the_target_language():
+    text = "x" * 400
+    budget = estimate_output_tokens(text, "ko") * 4
+    korean = _pack(BatchPacker(100, output_budget=budget, target_lang="ko"), [text] * 8)
+    chinese = _pack(
+        BatchPacker(100, output_budget=budget, target_lang="zh"), [text] * 10
+    )
+
+    assert [len(batch) for batch in korean] == [4, 4]
+    # Chinese output is estimated shorter, more entries fit
+    assert [len(batch) for batch in chinese] == [5, 5]
+
+
+def test_oversized_text_gets_its_own_request():
+    packer = BatchPacker(10, input_budget=50)
+
+    batches = _pack(packer, [TEXT, "y" * 400, TEXT])
+
+    assert batches == [["y" * 400], [TEXT, TEXT]]
+    assert packer.isolated == 1
+
+
+def test_flush_of_an_empty_packer():
+    packer = BatchPacker(10)
+    assert packer.flush() is None
+    assert len(packer) == 0
+
+
+def test_token_budget_by_service_model_and_override():
+    assert get_token_budget("claude", "claude-3-5-sonnet-20241022") == (4000, 5000)
+    assert get_token_budget("claude", "claude-3-haiku-20240307") == (4000, 3000)
+    assert get_token_budget("google") == (None, None)
+    assert get_token_budget("unknown") == (4000, 4000)
+    assert get_token_budget(
+        "openai", "gpt-4o", {"openai": {"output_tokens": 1000}}
+    ) == (4000, 1000)
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from backend.app.services.translator.base import BaseTranslator
+
+
+class ScriptedTranslator(BaseTranslator):
+    """Answers batch prompts with a fixed raw response, single texts with "[S] "."""
+
+    SUPPORTS_BATCH = True
+    PROVIDER_NAME = "Scripted"
+
+    def __init__(self, raw_response: str):
+        self.glossary = None
+        self.raw_response = raw_response
+        self.singles = []
+
+    async def translate(self, text: str, target_lang: str) -> str:
+        self.singles.append(text)
+        return f"[S] {text}"
+
+    async def translate_batch(self, items: list, target_lang: str) -> dict:
+        async def send(system_prompt, payload):
+            self.payload = json.loads(payload)
+            return self.raw_response
+
+        return await self._translate_batch_via_prompt(items, target_lang, send)
+
+
+def test_parse_batch_response_tolerates_wrapping():
+    translator = ScriptedTranslator("")
+    raw = (
+        "<think>plan</think>Here you go:\n```json\n"
+        '[{"id": 0, "text": "가"}, {"id": "1", "text": "나"}, {"id": 7, "text": "x"},'
+        ' {"id": 2, "text": null}, "junk"]\n```'
+    )
+
+    assert translator.parse_batch_response(raw, 3) == {0: "가", 1: "나"}
+    assert translator.parse_batch_response("not json [", 3) == {}
+    assert translator.parse_batch_response('{"id": 0}', 1) == {}
+
+
+def test_batch_items_missing_or_malformed_fall_back_to_single_requests():
+    # Item 1 is missing, item 2 lost its placeholder
+    translator = ScriptedTranslator(
+        json.dumps(
+            [
+                {"id": 0, "text": "[B] one"},
+                {"id": 2, "text": "[B] three"},
+            ]
+        )
+    )
+    items = [(10, "one"), (11, "two"), (12, "three __VAR0__")]
+
+    result = asyncio.run(translator.translate_preserved_batch(items, "ko"))
+
+    assert translator.payload == [
+        {"id": 0, "text": "one"},
+        {"id": 1, "text": "two"},
+        {"id": 2, "text": "three __VAR0__"},
+    ]
+    assert result == {
+        10: "[B] one",
+        11: "[S] two",
+        12: "[S] three __VAR0__",
+    }
+    assert translator.singles == ["two", "three __VAR0__"]
+
+
+def test_unparsable_batch_falls_back_for_every_item():
+    translator = ScriptedTranslator("Sorry, I can't help with that.")
+
+    result = asyncio.run(
+        translator.translate_preserved_batch([(0, "one"), (1, "two")], "ko")
+    )
+
+    assert result == {0: "[S] one", 1: "[S] two"}
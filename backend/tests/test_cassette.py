@@ -0,0 +1,47 @@
+import asyncio
+
+from backend.app.services.translator import google
+from backend.app.services.translator.cassette import (
+    MODE_RECORD,
+    MODE_REPLAY,
+    close_cassette,
+    open_cassette,
+)
+
+
+class FakeDeepGoogle:
+    def __init__(self, source, target):
+        self.target = target
+
+    def translate(self, text):
+        return f"[{self.target}] {text}"
+
+
+class OfflineDeepGoogle(FakeDeepGoogle):
+    def translate(self, text):
+        raise AssertionError("network call during replay")
+
+
+def _translate(path, mode, texts):
+    async def run():
+        cassette = open_cassette(path, mode)
+        translator = google.GoogleTranslatorService()
+        translator.cassette = cassette
+        try:
+            return [await translator.translate(text, "ko") for text in texts]
+        finally:
+            close_cassette(cassette)
+
+    return asyncio.run(run())
+
+
+def test_google_records_and_replays(tmp_path, monkeypatch):
+    path = str(tmp_path / "google.jsonl.gz")
+    monkeypatch.setattr(google, "DeepGoogle", FakeDeepGoogle)
+    recorded = _translate(path, MODE_RECORD, ["Hello", "Army"])
+
+    monkeypatch.setattr(google, "DeepGoogle", OfflineDeepGoogle)
+    replayed = _translate(path, MODE_REPLAY, ["Army", "Hello"])
+
+    assert recorded == ["[ko] Hello", "[ko] Army"]
+    assert replayed == ["[ko] Army", "[ko] Hello"]
@@ -0,0 +1,91 @@
+import asyncio
+
+from backend.app.services import task_manager
+from backend.app.services.shared_source import SharedSource
+from backend.app.services.translator.google import GoogleTranslatorService
+
+from backend.tests.helpers import EchoGenerator, read_translations, write_mod
+
+
+def _delay_parse(monkeypatch, file_name: str, seconds: float):
+    parse = SharedSource._parse
+
+    async def delayed(source_path):
+        if source_path.endswith(file_name):
+            await asyncio.sleep(seconds)
+        return await parse(source_path)
+
+    monkeypatch.setattr(SharedSource, "_parse", staticmethod(delayed))
+
+
+def test_parallel_mods_share_strings(workdir, monkeypatch):
+    # A's batch with "Hello __VAR0__" is still in flight when B has translated the
+    # same preserved text and A finds it again in a later file
+    mod_a = write_mod(
+        str(workdir),
+        "A",
+        {
+            "a1": {"a_hello": "Hello $A$", "a_slow": "Slow march"},
+            "a2": {"a_hello_again": "Hello $C$"},
+        },
+    )
+    mod_b = write_mod(str(workdir), "B", {"b1": {"b_hello": "Hello $B$"}})
+    _delay_parse(monkeypatch, "a2_l_english.yml", 0.2)
+    generator = EchoGenerator(slow_words=("Slow",), slow_latency=0.5)
+    task_id = task_manager.create_task()
+
+    result = asyncio.run(
+        generator.generate_collection(
+            [mod_a, mod_b],
+            str(workdir / "out"),
+            task_id,
+            parallel_mods=2,
+            service="openai",
+            use_cache=False,
+        )
+    )
+
+    assert result["status"] == "success"
+    translated_a = read_translations(result["mods"]["A"]["path"])
+    assert translated_a["a_hello"] == "[T] Hello $A$"
+    assert translated_a["a_hello_again"] == "[T] Hello $C$"
+    translated_b = read_translations(result["mods"]["B"]["path"])
+    assert translated_b["b_hello"] == "[T] Hello $B$"
+
+
+def test_failed_strings_are_not_shared(workdir):
+    mod_a = write_mod(str(workdir), "A", {"a1": {"a_lost": "Lost text"}})
+    mod_b = write_mod(str(workdir), "B", {"b1": {"b_lost": "Lost text"}})
+    generator = EchoGenerator(fail_texts=("Lost text",))
+
+    result = asyncio.run(
+        generator.generate_collection(
+            [mod_a, mod_b],
+            str(workdir / "out"),
+            task_manager.create_task(),
+            service="openai",
+            use_cache=False,
+        )
+    )
+
+    assert result["status"] == "success"
+    # Both mods asked the provider, B did not reuse A's echoed source
+    assert generator.translator.sent.count("Lost text") == 2
+
+
+def test_shared_prepare_is_kept_per_glossary():
+    source = SharedSource(2)
+
+    async def prepare_both():
+        plain = await source.prepare(GoogleTranslatorService, ["The Army"])
+        with_terms = await source.prepare(
+            GoogleTranslatorService, ["The Army"], {"Army": "육군"}
+        )
+        again = await source.prepare(GoogleTranslatorService, ["The Army"])
+        return plain, with_terms, again
+
+    plain, with_terms, again = asyncio.run(prepare_both())
+    assert plain[0][0] == "The Army"
+    assert with_terms[0][0] == "The __GLS0__"
+    assert again == plain
+    assert source.prepare_calls == 2
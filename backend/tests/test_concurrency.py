@@ -0,0 +1,106 @@
+import asyncio
+
+from backend.app.services import concurrency
+from backend.app.services.concurrency import (
+    AdaptiveConcurrencyController,
+    get_concurrency_controller,
+)
+
+
+def _reasons(controller):
+    return [entry["reason"] for entry in controller.history]
+
+
+def test_full_window_of_successes_increases_by_one():
+    controller = AdaptiveConcurrencyController("p", 2, 1, 4)
+
+    controller.record_response(200, 1.0)
+    assert controller.limit == 2
+    controller.record_response(200, 1.0)
+    assert controller.limit == 3
+
+    for _ in range(3 + 4):
+        controller.record_response(200, 1.0)
+    assert controller.limit == 4  # capped at max_limit
+    assert _reasons(controller) == ["init", "increase", "increase"]
+
+
+def test_rising_latency_holds_the_limit():
+    controller = AdaptiveConcurrencyController("p", 2, 1, 8)
+    controller.record_response(200, 1.0)
+    controller.record_response(200, 1.0)
+    assert controller.limit == 3
+
+    for _ in range(3):
+        controller.record_response(200, 10.0)
+    assert controller.limit == 3
+
+
+def test_backoff_halves_once_per_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(concurrency.time, "monotonic", lambda: now[0])
+    controller = AdaptiveConcurrencyController("p", 8, 1, 16)
+
+    controller.record_response(429, 1.0)
+    controller.record_response(503, 1.0)  # same cooldown, not counted twice
+    assert controller.limit == 4
+
+    now[0] += 2
+    controller.record_response(0, None)
+    assert controller.limit == 2
+    assert _reasons(controller) == [
+        "init",
+        "decrease (status 429)",
+        "decrease (status 0)",
+    ]
+
+
+def test_no_history_entry_at_the_minimum(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(concurrency.time, "monotonic", lambda: now[0])
+    controller = AdaptiveConcurrencyController("p", 1, 1, 4)
+
+    controller.record_response(429, 1.0)
+
+    assert controller.limit == 1
+    assert _reasons(controller) == ["init"]
+
+
+def test_client_errors_are_not_a_capacity_signal():
+    controller = AdaptiveConcurrencyController("p", 4, 1, 8)
+    controller.record_response(401, 1.0)
+    controller.record_response(404, 1.0)
+    assert controller.limit == 4
+
+
+def test_acquire_waits_for_a_free_slot():
+    async def scenario():
+        controller = AdaptiveConcurrencyController("p", 1, 1, 4)
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        controller.release()
+        await asyncio.wait_for(waiter, 1)
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_pauses_dispatching():
+    async def scenario():
+        controller = AdaptiveConcurrencyController("p", 4, 1, 8)
+        controller.record_response(429, 0.1, retry_after=0.2)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await controller.acquire()
+        return loop.time() - started
+
+    assert asyncio.run(scenario()) >= 0.15
+
+
+def test_controllers_are_shared_per_account_and_model():
+    first = get_concurrency_controller("test-provider", "key-a", "model-1")
+    assert get_concurrency_controller("test-provider", "key-a", "model-1") is first
+    assert get_concurrency_controller("test-provider", "key-b", "model-1") is not first
+    assert get_concurrency_controller("test-provider", "key-a", "model-2") is not first
@@ -0,0 +1,35 @@
+import asyncio
+
+from backend.app.services import task_manager
+from backend.app.services.translation_estimator import estimate_translation
+
+from backend.tests.helpers import EchoGenerator, write_mod
+
+
+def test_estimate_matches_the_real_run(workdir):
+    mod = write_mod(
+        str(workdir),
+        "M",
+        {
+            "ui": {"yes": "Yes", "cancel": "Cancel", "greet_a": "Hello $A$"},
+            "events": {"yes_again": "Yes", "greet_b": "Hello $B$", "empty": ""},
+        },
+    )
+
+    estimate = asyncio.run(
+        estimate_translation(mod["path"], service="openai", use_cache=False)
+    )
+
+    generator = EchoGenerator()
+    task_id = task_manager.create_task()
+    result = asyncio.run(
+        generator.generate_translation_mod(
+            mod, str(workdir / "out"), task_id, service="openai", use_cache=False
+        )
+    )
+
+    assert result["status"] == "success"
+    assert estimate["total_entries"] == 6
+    assert estimate["empty_entries"] == 1
+    assert estimate["unique_to_translate"] == len(generator.translator.sent) == 3
+    assert estimate["entries_to_translate"] == 5
@@ -0,0 +1,34 @@
+from backend.app.services.glossary_matcher import (
+    GlossaryMatcher,
+    get_glossary_matcher,
+)
+
+GLOSSARY = {"Division": "사단", "Factory": "공장", "Tank": "전차", "Army": "육군"}
+
+
+def test_strict_matches_whole_words_only():
+    matcher = GlossaryMatcher(GLOSSARY)
+    assert matcher.subset(["Divisions, Factories and Tanks"]) == {}
+    assert matcher.find("__VAR0__Army__VAR1__") == [(8, 12, "Army")]
+    assert matcher.find("Armyworks") == []
+
+
+def test_inflected_finds_plurals():
+    matcher = GlossaryMatcher(GLOSSARY, inflected=True)
+    assert list(matcher.subset(["Divisions, Factories and Tanks"])) == [
+        "Division",
+        "Factory",
+        "Tank",
+    ]
+    assert matcher.subset(["Tankette factorial Armyworks"]) == {}
+
+
+def test_registry_follows_in_place_edits():
+    glossary = dict(GLOSSARY)
+    assert get_glossary_matcher(glossary).find("Corps") == []
+    glossary["Corps"] = "군단"
+    assert get_glossary_matcher(glossary).find("Corps") == [(0, 5, "Corps")]
+    glossary["Corps"] = "군"
+    matcher = get_glossary_matcher(glossary, inflected=True)
+    assert matcher.subset(["Corps"]) == {"Corps": "군"}
+    assert get_glossary_matcher(dict(glossary), inflected=True) is matcher
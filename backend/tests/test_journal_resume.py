@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+import pytest
+
+from backend.app.services import task_manager
+from backend.app.services.translation_journal import journal_path, load_journal
+
+from backend.tests.helpers import EchoGenerator, read_translations, write_mod
+
+
+async def _interrupt(generator, mod, workdir, task_id):
+    run = asyncio.create_task(
+        generator.generate_translation_mod(
+            mod,
+            str(workdir / "out"),
+            task_id,
+            service="openai",
+            use_cache=False,
+            schedule="fifo",
+        )
+    )
+    # The fast batch finishes, the slow one is still in flight
+    await asyncio.sleep(0.5)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+
+def test_resume_sends_only_unjournaled_values(workdir):
+    mod = write_mod(
+        str(workdir),
+        "M",
+        {
+            "a_ui": {"yes": "Yes", "no": "No"},
+            "b_events": {"long": "Slow event text"},
+        },
+    )
+    task_id = task_manager.create_task()
+    first = EchoGenerator(slow_words=("Slow",), slow_latency=30)
+    asyncio.run(_interrupt(first, mod, workdir, task_id))
+
+    state = load_journal(task_id)
+    assert state["translations"] == {"Yes": "[T] Yes", "No": "[T] No"}
+
+    resumed = EchoGenerator()
+    result = asyncio.run(resumed.resume_translation_mod(task_id))
+
+    assert result["status"] == "success"
+    assert resumed.translator.sent == ["Slow event text"]
+    assert read_translations(result["path"]) == {
+        "yes": "[T] Yes",
+        "no": "[T] No",
+        "long": "[T] Slow event text",
+    }
+    # A finished job removes its journal
+    assert not os.path.exists(journal_path(task_id))
@@ -0,0 +1,63 @@
+import pytest
+
+from backend.app.services.translator import markup
+from backend.app.services.translator.markup import (
+    MARKUP_PATTERNS,
+    MarkupTokenizer,
+    extract_markup,
+    restore_markup,
+)
+
+SAMPLES = [
+    "Plain text without codes",
+    "§YArmy§! gains [Root.GetName] $COUNTRY$ £pol_power \\n done",
+    "[Root.GetFlag[THIS.Tag]] and [?var|%G0] and [!concept]",
+    "$VALUE|%+0$ £icon£ £icon|2£ §R!§!",
+    "__weird__ underscores $a$$b$",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_round_trip(text):
+    cleaned, extractions = extract_markup(text)
+    assert restore_markup(cleaned, extractions) == text
+
+
+def test_spans_are_numbered_left_to_right_with_types():
+    cleaned, extractions = extract_markup("§YHi§! [Root.GetName] $X$ £gold \\n")
+
+    assert cleaned == "__VAR0__Hi__VAR1__ __VAR2__ __VAR3__ __VAR4__ __VAR5__"
+    assert extractions == [
+        ("__VAR0__", "§Y", "COLOR"),
+        ("__VAR1__", "§!", "COLOR"),
+        ("__VAR2__", "[Root.GetName]", "SCOPECMD"),
+        ("__VAR3__", "$X$", "VARIABLE"),
+        ("__VAR4__", "£gold", "ICON"),
+        ("__VAR5__", "\\n", "NEWLINE"),
+    ]
+
+
+def test_restore_after_reordering_and_with_unknown_placeholders():
+    cleaned, extractions = extract_markup("$A$ before $B$")
+    assert cleaned == "__VAR0__ before __VAR1__"
+
+    translated = "__VAR1__ 앞에 __VAR0__ __VAR9__ __GLS0__"
+    assert restore_markup(translated, extractions) == "$B$ 앞에 $A$ __VAR9__ __GLS0__"
+
+
+def test_many_spans_beyond_the_prebuilt_placeholders():
+    text = " ".join(f"$V{i}$" for i in range(300))
+    cleaned, extractions = extract_markup(text)
+
+    assert extractions[299][0] == "__VAR299__"
+    assert restore_markup(cleaned, extractions) == text
+
+
+def test_type_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(markup, "MAX_TYPE_CACHE", 3)
+    tokenizer = MarkupTokenizer(MARKUP_PATTERNS)
+    for i in range(10):
+        tokenizer.extract(f"$V{i}$")
+
+    assert len(tokenizer._types) <= 3
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from backend.app.services import task_manager
+from backend.app.services.mod_generator import PIPELINE_FILE_BUFFER, ModGenerator
+
+from backend.tests.helpers import EchoGenerator, read_translations, write_mod
+
+
+@pytest.mark.parametrize("schedule", ["fifo", "longest_first", "shortest_first"])
+def test_more_files_than_the_queues_hold(workdir, monkeypatch, schedule):
+    # One parse and one write worker, in threads
+    monkeypatch.setenv("TRANSLATION_CPU_WORKERS", "0")
+    files = {
+        f"file_{n:02}": {f"key_{n}_{i}": f"Text {n} {i}" for i in range(n + 1)}
+        for n in range(PIPELINE_FILE_BUFFER * 3)
+    }
+    mod = write_mod(str(workdir), "M", files)
+    task_id = task_manager.create_task()
+
+    result = asyncio.run(
+        EchoGenerator().generate_translation_mod(
+            mod,
+            str(workdir / "out"),
+            task_id,
+            service="openai",
+            use_cache=False,
+            schedule=schedule,
+        )
+    )
+
+    assert result["status"] == "success"
+    assert result["processed_files"] == len(files)
+    expected = {
+        key: f"[T] {value}"
+        for entries in files.values()
+        for key, value in entries.items()
+    }
+    assert read_translations(result["path"]) == expected
+    assert task_manager.get_task(task_id)["total_files"] == len(files)
+
+
+def test_failing_stage_cancels_the_others():
+    cancelled = []
+
+    async def waits_forever():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fails():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("stage failed")
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        asyncio.run(ModGenerator._run_pipeline([waits_forever(), fails()]))
+    assert cancelled == [True]
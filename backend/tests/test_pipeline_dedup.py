@@ -0,0 +1,40 @@
+import asyncio
+
+from backend.app.services import task_manager
+
+from backend.tests.helpers import EchoGenerator, read_translations, write_mod
+
+
+def test_repeated_values_are_translated_once(workdir):
+    mod = write_mod(
+        str(workdir),
+        "M",
+        {
+            "ui": {"yes": "Yes", "cancel": "Cancel", "greet_a": "Hello $A$"},
+            "events": {"yes_again": "Yes", "greet_b": "Hello $B$", "empty": ""},
+        },
+    )
+    generator = EchoGenerator()
+    task_id = task_manager.create_task()
+
+    result = asyncio.run(
+        generator.generate_translation_mod(
+            mod, str(workdir / "out"), task_id, service="openai", use_cache=False
+        )
+    )
+
+    assert result["status"] == "success"
+    # "Hello $A$" and "Hello $B$" share the preserved form "Hello __VAR0__"
+    assert sorted(generator.translator.sent) == ["Cancel", "Hello __VAR0__", "Yes"]
+    assert read_translations(result["path"]) == {
+        "yes": "[T] Yes",
+        "cancel": "[T] Cancel",
+        "greet_a": "[T] Hello $A$",
+        "yes_again": "[T] Yes",
+        "greet_b": "[T] Hello $B$",
+        "empty": "",
+    }
+    task = task_manager.get_task(task_id)
+    assert task["total_entries"] == 6
+    assert task["unique_entries"] == 3
+    assert task["duplicate_entries"] == 2
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from backend.app.services.rate_limiter import (
+    ProviderRateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_rate_limiter,
+)
+
+
+def _timed(coroutine_factory) -> float:
+    async def scenario():
+        started = time.monotonic()
+        await coroutine_factory()
+        return time.monotonic() - started
+
+    return asyncio.run(scenario())
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 3
+    assert estimate_tokens("안녕") == 3
+
+
+def test_bucket_allows_a_burst_then_waits_for_the_refill():
+    bucket = TokenBucket(6000)  # 100 per second
+
+    async def drain_then_wait():
+        await bucket.acquire(6000)
+        return await bucket.acquire(10)
+
+    assert _timed(lambda: bucket.acquire(1)) < 0.05
+    waited = asyncio.run(drain_then_wait())
+    assert 0.05 <= waited < 0.5
+
+
+def test_acquire_counts_requests_and_tokens():
+    limiter = ProviderRateLimiter("p", rpm=600, tpm=6000)
+
+    asyncio.run(limiter.acquire(100))
+
+    assert limiter.requests == 1
+    assert limiter.token_bucket.tokens <= 5900
+    assert limiter.request_bucket.tokens <= 599
+
+
+def test_penalize_pauses_and_empties_the_request_bucket():
+    limiter = ProviderRateLimiter("p", rpm=6000)
+
+    limiter.penalize(retry_after=0.2)
+
+    assert limiter.request_bucket.tokens <= 0
+    assert _timed(lambda: limiter.acquire()) >= 0.15
+    assert limiter.total_wait >= 0.15
+
+
+def test_unlimited_provider_does_not_wait():
+    limiter = ProviderRateLimiter("p")
+    assert _timed(lambda: limiter.acquire(10_000)) < 0.05
+
+
+def test_limiters_are_shared_per_api_key():
+    first = get_rate_limiter("test-provider", "key-a", rpm=60)
+    assert get_rate_limiter("test-provider", "key-a", rpm=60) is first
+    assert get_rate_limiter("test-provider", "key-b", rpm=60) is not first
+
+    # The last configuration wins, an unchanged budget keeps its bucket
+    bucket = first.request_bucket
+    assert get_rate_limiter("test-provider", "key-a", rpm=60).request_bucket is bucket
+    get_rate_limiter("test-provider", "key-a", rpm=120)
+    assert first.request_bucket.rate_per_minute == 120
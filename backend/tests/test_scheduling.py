@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.app.services import task_manager
+from backend.app.services.latency_stats import BatchLatencyTracker, percentile
+
+from backend.tests.helpers import EchoGenerator, write_mod
+
+TEXTS = ["Mid sized text", "Short", "A much longer event description text"]
+
+
+@pytest.mark.parametrize(
+    "schedule, expected",
+    [
+        ("fifo", TEXTS),
+        ("longest_first", sorted(TEXTS, key=len, reverse=True)),
+        ("shortest_first", sorted(TEXTS, key=len)),
+    ],
+)
+def test_schedule_orders_the_work(workdir, schedule, expected):
+    mod = write_mod(
+        str(workdir), "M", {"events": {f"k{i}": text for i, text in enumerate(TEXTS)}}
+    )
+    generator = EchoGenerator()
+
+    asyncio.run(
+        generator.generate_translation_mod(
+            mod,
+            str(workdir / "out"),
+            task_manager.create_task(),
+            service="openai",
+            use_cache=False,
+            schedule=schedule,
+        )
+    )
+
+    assert generator.translator.sent == expected
+
+
+def test_percentile():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 0.5) == 3.0
+    assert percentile(values, 0.99) == 5.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_tracker_reports_the_tail():
+    tracker = BatchLatencyTracker()
+    for latency in (1.0, 2.0, 9.0):
+        tracker.record(latency)
+    assert tracker.stats()["tail_seconds"] is None
+
+    tracker.mark_drained()
+    time.sleep(0.05)
+    tracker.mark_finished()
+    stats = tracker.stats()
+
+    assert stats["batches"] == 3
+    assert stats["p50"] == 2.0
+    assert stats["max"] == 9.0
+    assert 0.05 <= stats["tail_seconds"] < 1
@@ -0,0 +1,70 @@
+import asyncio
+import glob
+import os
+
+from backend.app.services import task_manager
+from backend.app.services.mod_generator import ModGenerator
+
+from backend.tests.helpers import EchoGenerator, read_translations, write_mod
+
+
+def test_finished_files_are_written_while_others_translate(workdir):
+    mod = write_mod(
+        str(workdir),
+        "M",
+        {"a_ui": {"ok": "Fine"}, "b_events": {"long": "Slow event text"}},
+    )
+    generator = EchoGenerator(slow_words=("Slow",), slow_latency=0.6)
+    task_id = task_manager.create_task()
+
+    async def scenario():
+        run = asyncio.create_task(
+            generator.generate_translation_mod(
+                mod,
+                str(workdir / "out"),
+                task_id,
+                service="openai",
+                use_cache=False,
+                schedule="fifo",
+            )
+        )
+        await asyncio.sleep(0.3)
+        written = sorted(
+            os.path.basename(path)
+            for path in glob.glob(
+                str(workdir / "out" / "*" / "localisation" / "**" / "*.yml"),
+                recursive=True,
+            )
+        )
+        return written, await run
+
+    written, result = asyncio.run(scenario())
+
+    assert written == ["a_ui_l_korean.yml"]
+    assert result["processed_files"] == 2
+    assert read_translations(result["path"]) == {
+        "ok": "[T] Fine",
+        "long": "[T] Slow event text",
+    }
+
+
+def test_rebuild_keeps_layout_and_escapes_quotes():
+    original = [
+        "l_english:\n",
+        "  # a comment\n",
+        '  title:0 "Hello" # note\n',
+        '  desc:1 "Say hi"\n',
+        "\n",
+    ]
+
+    lines = ModGenerator()._rebuild_lines(
+        original, {2: 'Say "hi"', 3: "안녕"}, "korean"
+    )
+
+    assert lines == [
+        "l_korean:\n",
+        "  # a comment\n",
+        '  title:0 "Say \\"hi\\"" # note\n',
+        '  desc:1 "안녕"\n',
+        "\n",
+    ]
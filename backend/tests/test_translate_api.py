@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app.api import translate
+
+
+def test_jobs_reports_scheduler_state():
+    state = translate.get_jobs()
+    assert state["max_workers"] >= 1
+    assert state["running"] == []
+
+
+def test_set_job_workers():
+    previous = translate.get_jobs()["max_workers"]
+    try:
+        assert translate.set_job_workers(3)["max_workers"] == 3
+    finally:
+        translate.set_job_workers(previous)
+
+
+@pytest.mark.parametrize(
+    "endpoint", [translate.pause_translation, translate.cancel_translation]
+)
+def test_unknown_task_is_not_found(endpoint):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(endpoint("no-such-task"))
+    assert error.value.status_code == 404
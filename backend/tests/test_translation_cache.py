@@ -0,0 +1,18 @@
+from backend.app.services.translation_cache import TranslationCache
+
+
+def test_outer_whitespace_is_part_of_the_key(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    cache.put_many([(" and ", " 그리고 ")], "ko", "openai", "gpt-4o")
+
+    found = cache.get_many([" and ", "and"], "ko", "openai", "gpt-4o")
+    assert found == {" and ": " 그리고 "}
+
+
+def test_nfc_variants_share_a_translation(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    composed, decomposed = "Caf\u00e9", "Cafe\u0301"
+    cache.put_many([(composed, "카페")], "ko", "openai", "gpt-4o")
+
+    found = cache.get_many([composed, decomposed], "ko", "openai", "gpt-4o")
+    assert found == {composed: "카페", decomposed: "카페"}
@@ -0,0 +1,69 @@
+import asyncio
+
+from backend.app.services import task_manager
+from backend.app.services.mod_generator import ModGenerator
+from backend.app.services.translation_manifest import load_manifest
+
+from backend.tests.helpers import EchoGenerator, read_translations, write_mod
+
+
+def _run(generator, mod, workdir, previous=None):
+    return asyncio.run(
+        generator.generate_translation_mod(
+            mod,
+            str(workdir / "out"),
+            task_manager.create_task(),
+            service="openai",
+            use_cache=False,
+            previous_output_path=previous,
+        )
+    )
+
+
+def test_unchanged_entries_are_carried_forward(workdir):
+    mod = write_mod(str(workdir), "M", {"events": {"a": "Old text", "b": "Kept text"}})
+    first = _run(EchoGenerator(), mod, workdir)
+
+    mod = write_mod(str(workdir), "M", {"events": {"a": "New text", "b": "Kept text"}})
+    generator = EchoGenerator()
+    second = _run(generator, mod, workdir, previous=first["path"])
+
+    assert second["path"] == first["path"]
+    assert generator.translator.sent == ["New text"]
+    assert read_translations(second["path"]) == {
+        "a": "[T] New text",
+        "b": "[T] Kept text",
+    }
+
+
+def test_failed_entries_are_retried(workdir):
+    mod = write_mod(str(workdir), "M", {"events": {"a": "Lost text", "b": "Fine"}})
+    first = _run(EchoGenerator(fail_texts=("Lost text",)), mod, workdir)
+    manifest = load_manifest(first["path"])
+    assert list(manifest["files"]["english/events_l_english.yml"]["entries"]) == ["b"]
+
+    generator = EchoGenerator()
+    second = _run(generator, mod, workdir, previous=first["path"])
+
+    assert generator.translator.sent == ["Lost text"]
+    assert read_translations(second["path"])["a"] == "[T] Lost text"
+
+
+def test_write_error_records_no_entries(tmp_path, monkeypatch):
+    generator = ModGenerator()
+
+    def fail(path, lines):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(generator.yml_manager, "write_file", fail)
+    job = {
+        "entries": [(1, "a", 0, "Text", "")],
+        "original_lines": ["l_english:\n", ' a:0 "Text"\n'],
+        "translate_map": {1: "[T] Text"},
+        "target_path": str(tmp_path / "a_l_korean.yml"),
+    }
+
+    error, entries = generator._write_localisation_file(job, "korean")
+
+    assert error.startswith("FILE_WRITE_ERROR")
+    assert entries == {}
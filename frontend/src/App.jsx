@@ -213,86 +213,120 @@ function App() {
         
         console.log("Started translation task:", taskId);
 
-        // Poll for completion
-        const interval = setInterval(async () => {
-            try {
-                // Pass task_id in params
-                const statusRes = await api.get('/translate/status', { params: { task_id: taskId } });
-                const data = statusRes.data;
+        // Progress updates: server-pushed stream, polling only as a fallback
+        let finished = false;
+        let interval = null;
+        let events = null;
+
+        const stopUpdates = () => {
+            finished = true;
+            if (events) events.close();
+            if (interval) clearInterval(interval);
+        };
+
+        const handleStatus = async (data) => {
+            if (finished) return;
+            
+            setProgress({
+                percent: data.percent || 0,
+                currentFile: data.current_file || '',
+                status: data.status || 'idle',
+                processed_files: data.processed_files || 0,
+                total_files: data.total_files || 0,
+                current_entry: data.current_entry || 0,
+                total_entries: data.total_entries || 0,
+                entries_translated: data.entries_translated || 0,
+                avg_speed: data.avg_speed || 0
+            });
+
+            if (data.status === 'completed') {
+                // Double check if all files are actually processed (prevent premature trigger)
+                // Ensure processed_files equals total_files AND total_files is > 0
+                if (data.total_files > 0 && data.processed_files < data.total_files) {
+                    console.log(`Waiting for completion... ${data.processed_files}/${data.total_files}`);
+                    return;
+                }
+
+                stopUpdates();
+                setLoading(false);
                 
-                setProgress({
-                    percent: data.percent || 0,
-                    currentFile: data.current_file || '',
-                    status: data.status || 'idle',
-                    processed_files: data.processed_files || 0,
-                    total_files: data.total_files || 0,
-                    current_entry: data.current_entry || 0,
-                    total_entries: data.total_entries || 0,
-                    entries_translated: data.entries_translated || 0,
-                    avg_speed: data.avg_speed || 0
-                });
-
-                if (data.status === 'completed') {
-                    // Double check if all files are actually processed (prevent premature trigger)
-                    // Ensure processed_files equals total_files AND total_files is > 0
-                    if (data.total_files > 0 && data.processed_files < data.total_files) {
-                        console.log(`Waiting for completion... ${data.processed_files}/${data.total_files}`);
-                        return;
-                    }
-
-                    clearInterval(interval);
-                    setLoading(false);
-                    
-                    // Release Wake Lock
-                    if (wakeLock) {
-                        wakeLock.release().then(() => setWakeLock(null));
-                    }
+                // Release Wake Lock
+                if (wakeLock) {
+                    wakeLock.release().then(() => setWakeLock(null));
+                }
+                
+                // Workflow Branch: Check for Auto Upload to ParaTranz
+                if (settings.enableParaTranz && settings.paratranzToken && settings.autoUploadParaTranz) {
+                    const modWithTrans = { ...mod, translationPath: data.path };
+                    // Automatically start upload without prompt
+                    // We need project ID. If it's saved in settings backend-side, 
+                    // executeUpload can handle it if we pass null/undefined, 
+                    // BUT executeUpload expects a projectId or prompts selector.
                     
-                    // Workflow Branch: Check for Auto Upload to ParaTranz
-                    if (settings.enableParaTranz && settings.paratranzToken && settings.autoUploadParaTranz) {
-                        const modWithTrans = { ...mod, translationPath: data.path };
-                        // Automatically start upload without prompt
-                        // We need project ID. If it's saved in settings backend-side, 
-                        // executeUpload can handle it if we pass null/undefined, 
-                        // BUT executeUpload expects a projectId or prompts selector.
-                        
-                        // Strategy: Call upload directly. If backend handles ID, we don't need selector.
-                        // Ideally we should use the stored project ID from backend settings.
-                        // We pass the ID explicitly just in case, though backend has fallback.
-                        
-                        const projectId = settings.paratranzProjectId ? parseInt(settings.paratranzProjectId) : null;
-                        executeUpload(modWithTrans, projectId); 
-                        // Note: If project ID is missing in backend settings, executeUpload will fail (alert user).
-                        return;
-                    }
-
-                    // Default Flow: Generate Mod & Download (Only if NOT auto-uploading or upload finished?)
-                    // If auto-upload triggers, we usually stop there?
-                    // Or do we want both? User said "If failed, make mod".
-                    // For now, if auto-upload is OFF, we do standard behavior.
+                    // Strategy: Call upload directly. If backend handles ID, we don't need selector.
+                    // Ideally we should use the stored project ID from backend settings.
+                    // We pass the ID explicitly just in case, though backend has fallback.
                     
-                    if (data.path) {
-                         const zipRes = await api.post(`/translate/zip?path=${encodeURIComponent(data.path)}&name=${encodeURIComponent(data.zip_name)}`);
-                         setLastTranslation({
-                            modId: mod.id || mod.path,
-                            zipPath: zipRes.data.zip_path,
-                            path: data.path
-                        });
-                        alert(t('success_process').replace('{count}', data.processed_files) + '\n' + t('saved_at').replace('{path}', data.path) + '\n' + t('ready_download'));
-                    } else {
-                        alert(t('translation_complete'));
-                    }
-                } else if (data.status === 'error') {
-                    clearInterval(interval);
-                    setLoading(false);
-                    if (wakeLock) wakeLock.release(); // Release on error
-                    alert(t('error_translation'));
+                    const projectId = settings.paratranzProjectId ? parseInt(settings.paratranzProjectId) : null;
+                    executeUpload(modWithTrans, projectId); 
+                    // Note: If project ID is missing in backend settings, executeUpload will fail (alert user).
+                    return;
                 }
-            } catch (e) {
-                console.error("Polling error", e);
-                // If 404, maybe task lost?
+
+                // Default Flow: Generate Mod & Download (Only if NOT auto-uploading or upload finished?)
+                // If auto-upload triggers, we usually stop there?
+                // Or do we want both? User said "If failed, make mod".
+                // For now, if auto-upload is OFF, we do standard behavior.
+                
+                if (data.path) {
+                     const zipRes = await api.post(`/translate/zip?path=${encodeURIComponent(data.path)}&name=${encodeURIComponent(data.zip_name)}`);
+                     setLastTranslation({
+                        modId: mod.id || mod.path,
+                        zipPath: zipRes.data.zip_path,
+                        path: data.path
+                    });
+                    alert(t('success_process').replace('{count}', data.processed_files) + '\n' + t('saved_at').replace('{path}', data.path) + '\n' + t('ready_download'));
+                } else {
+                    alert(t('translation_complete'));
+                }
+            } else if (data.status === 'error') {
+                stopUpdates();
+                setLoading(false);
+                if (wakeLock) wakeLock.release(); // Release on error
+                alert(t('error_translation'));
+            } else if (data.status === 'cancelled') {
+                stopUpdates();
+                setLoading(false);
+                if (wakeLock) wakeLock.release();
             }
-        }, 1000);
+        };
+
+        const startPolling = () => {
+            interval = setInterval(async () => {
+                try {
+                    // Pass task_id in params
+                    const statusRes = await api.get('/translate/status', { params: { task_id: taskId } });
+                    await handleStatus(statusRes.data);
+                } catch (e) {
+                    console.error("Polling error", e);
+                }
+            }, 1000);
+        };
+
+        if (window.EventSource) {
+            events = new EventSource(`${api.defaults.baseURL}/translate/events/${encodeURIComponent(taskId)}`);
+            events.onmessage = (e) => handleStatus(JSON.parse(e.data));
+            events.onerror = () => {
+                // The server closes the stream once the task is done; otherwise fall back to polling
+                events.close();
+                if (!finished && !interval) {
+                    console.warn("Progress stream lost, falling back to polling");
+                    startPolling();
+                }
+            };
+        } else {
+            startPolling();
+        }
 
     } catch (err) {
         console.error(err);